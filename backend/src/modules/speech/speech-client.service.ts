@@ -8,6 +8,7 @@ export interface TTSGenerateRequest {
   language: 'en' | 'vi';
   vocab_id: number;
   voice?: string;
+  engine?: string; // TTS backend, e.g. 'gtts' or 'espeak' (see GET /tts/voices)
 }
 
 export interface TTSGenerateResponse {
@@ -24,12 +25,37 @@ export interface STTRecognizeRequest {
   user_id: number;
   vocab_id: number;
   save_recording?: boolean;
+  use_grammar?: boolean;
+  distractors?: string[];
+  lang?: string;
+}
+
+// Fields of /stt/recognize-binary; the audio itself is the raw request body
+export interface STTRecognizeBinaryParams {
+  target_word: string;
+  user_id: number;
+  vocab_id: number;
+  save_recording?: boolean;
+  use_grammar?: boolean;
+  distractors?: string[];
+  lang?: string;
+}
+
+export interface WordScore {
+  target: string | null;
+  recognized: string | null;
+  status: 'correct' | 'mispronounced' | 'missing' | 'extra';
+  accuracy: number;
+  confidence?: number | null;
+  start?: number | null;
+  end?: number | null;
 }
 
 export interface PronunciationScore {
   accuracy: number;
   fluency: number;
   completeness: number;
+  words?: WordScore[] | null;
 }
 
 export interface STTRecognizeResponse {
@@ -38,10 +64,39 @@ export interface STTRecognizeResponse {
   is_correct: boolean;
   confidence: number;
   accuracy: number;
+  speech_duration?: number | null;
+  model?: string | null;
   pronunciation_score?: PronunciationScore;
   audio_url?: string;
 }
 
+export interface STTBatchItem {
+  audio_base64: string;
+  target_word: string;
+  vocab_id: number;
+  use_grammar?: boolean;
+  distractors?: string[];
+  lang?: string;
+}
+
+export interface STTRecognizeBatchRequest {
+  user_id: number;
+  items: STTBatchItem[];
+  save_recording?: boolean;
+}
+
+export interface STTBatchItemResult {
+  index: number;
+  vocab_id: number;
+  success: boolean;
+  result?: STTRecognizeResponse;
+  error?: string;
+}
+
+export interface STTRecognizeBatchResponse {
+  results: STTBatchItemResult[];
+}
+
 @Injectable()
 export class SpeechClientService {
   private readonly logger = new Logger(SpeechClientService.name);
@@ -83,6 +138,7 @@ export class SpeechClientService {
           lang: request.language,
           vocab_id: request.vocab_id,
           slow: false,
+          engine: request.engine, // undefined → service default (TTS_ENGINE)
         },
       );
 
@@ -137,6 +193,84 @@ export class SpeechClientService {
     }
   }
 
+  /**
+   * ✅ Recognize speech from raw audio bytes
+   * Sends the clip as the request body (no base64 inflation)
+   */
+  async recognizeSpeechBinary(
+    audio: Buffer,
+    params: STTRecognizeBinaryParams,
+    contentType = 'application/octet-stream',
+  ): Promise<STTRecognizeResponse> {
+    try {
+      this.logger.log(
+        `🎤 Recognizing ${audio.length} bytes for vocab ${params.vocab_id}, target: "${params.target_word}"`,
+      );
+
+      const response = await this.httpClient.post<STTRecognizeResponse>(
+        '/stt/recognize-binary',
+        audio,
+        {
+          params: {
+            ...params,
+            distractors: params.distractors?.join(','),
+          },
+          headers: { 'Content-Type': contentType },
+        },
+      );
+
+      this.logger.log(
+        `✅ Speech recognized: "${response.data.recognized_text}" ` +
+          `(correct: ${response.data.is_correct}, ` +
+          `confidence: ${response.data.confidence.toFixed(2)})`,
+      );
+
+      return response.data;
+    } catch (error) {
+      this.logger.error(
+        `❌ Speech recognition failed: ${error.response?.data?.detail || error.message}`,
+      );
+      throw new HttpException(
+        `Speech recognition failed: ${error.response?.data?.detail || error.message}`,
+        error.response?.status || HttpStatus.INTERNAL_SERVER_ERROR,
+      );
+    }
+  }
+
+  /**
+   * ✅ Recognize many clips in a single request
+   * Results come back in request order; failed items have success = false
+   */
+  async recognizeSpeechBatch(
+    request: STTRecognizeBatchRequest,
+  ): Promise<STTRecognizeBatchResponse> {
+    try {
+      this.logger.log(
+        `🎤 Recognizing batch of ${request.items.length} clips for user ${request.user_id}`,
+      );
+
+      const response = await this.httpClient.post<STTRecognizeBatchResponse>(
+        '/stt/recognize-batch',
+        request,
+      );
+
+      const failed = response.data.results.filter((r) => !r.success).length;
+      this.logger.log(
+        `✅ Batch recognized: ${response.data.results.length - failed} ok, ${failed} failed`,
+      );
+
+      return response.data;
+    } catch (error) {
+      this.logger.error(
+        `❌ Batch speech recognition failed: ${error.response?.data?.detail || error.message}`,
+      );
+      throw new HttpException(
+        `Batch speech recognition failed: ${error.response?.data?.detail || error.message}`,
+        error.response?.status || HttpStatus.INTERNAL_SERVER_ERROR,
+      );
+    }
+  }
+
   /**
    * ✅ Get available TTS voices
    */
@@ -0,0 +1,181 @@
+"""
+🎵 Synthetic audio corpus
+
+Deterministic (seeded) clips covering what the service sees in practice:
+- silence: background noise only (exercises no-speech rejection)
+- tone: a steady tone with silence around it
+- speech: TTS-like signal (harmonics with syllable-rate envelope and
+  fricative noise bursts) with leading / trailing silence
+
+Each clip is encoded as 16 kHz mono WAV (recognizer format, no
+conversion), 44.1 kHz stereo WAV, MP3 and WebM/Opus. Everything but the
+16 kHz WAV needs ffmpeg (to encode here, and for the service to convert
+it) and is skipped without it.
+"""
+import io
+import os
+import wave
+import shutil
+import subprocess
+from typing import Dict, List, NamedTuple, Sequence
+import numpy as np
+from loguru import logger
+
+KINDS = ('silence', 'tone', 'speech')
+FORMATS = ('wav16k', 'wav44k', 'mp3', 'webm')
+DEFAULT_LENGTHS = (0.5, 1.0, 3.0, 8.0)
+
+# Target words cycled over the clips (the fake decoder echoes the grammar)
+WORDS = ('apple', 'banana', 'beautiful', 'vocabulary', 'pronunciation', 'through', 'weather', 'comfortable')
+
+
+class Clip(NamedTuple):
+    name: str
+    kind: str
+    format: str
+    seconds: float
+    target_word: str
+    content_type: str
+    data: bytes
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔊 SIGNALS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _noise(rng: np.random.Generator, samples: int, level: float = 40.0) -> np.ndarray:
+    return rng.normal(0, level, samples)
+
+
+def _tone(rng: np.random.Generator, seconds: float, rate: int) -> np.ndarray:
+    samples = int(seconds * rate)
+    signal = _noise(rng, samples)
+    pad = samples // 4
+    t = np.arange(samples - 2 * pad) / rate
+    signal[pad:samples - pad] += 6000 * np.sin(2 * np.pi * rng.uniform(200, 450) * t)
+    return signal
+
+
+def _speech(rng: np.random.Generator, seconds: float, rate: int) -> np.ndarray:
+    samples = int(seconds * rate)
+    signal = _noise(rng, samples)
+    pad = min(samples // 4, int(0.4 * rate))
+    voiced = samples - 2 * pad
+    t = np.arange(voiced) / rate
+
+    # Gliding pitch with a few harmonics, shaped like formants
+    pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    harmonics = sum(np.sin(k * phase) / k for k in range(1, 8))
+
+    # ~4 syllables per second, with fricative bursts between some of them
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, np.pi)), 0, None) ** 0.5
+    fricatives = (np.sin(2 * np.pi * 2 * t) > 0.9) * rng.normal(0, 1500, voiced)
+
+    signal[pad:pad + voiced] += 5000 * harmonics * envelope + fricatives
+    return signal
+
+
+_GENERATORS = {
+    'silence': lambda rng, seconds, rate: _noise(rng, int(seconds * rate)),
+    'tone': _tone,
+    'speech': _speech,
+}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📦 ENCODING
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _to_int16(signal: np.ndarray) -> np.ndarray:
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+def _wav(pcm: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def _ffmpeg_encode(pcm: np.ndarray, rate: int, args: Sequence[str]) -> bytes:
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+         '-f', 's16le', '-ar', str(rate), '-ac', '1', '-i', 'pipe:0', *args, 'pipe:1'],
+        input=pcm.tobytes(),
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _encode(pcm: np.ndarray, rate: int, fmt: str) -> bytes:
+    if fmt == 'wav16k':
+        return _wav(pcm, rate)
+    if fmt == 'wav44k':
+        upsampled = np.interp(np.arange(0, len(pcm), rate / 44100), np.arange(len(pcm)), pcm)
+        return _wav(_to_int16(upsampled), 44100, channels=2)
+    if fmt == 'mp3':
+        return _ffmpeg_encode(pcm, rate, ['-codec:a', 'libmp3lame', '-b:a', '64k', '-f', 'mp3'])
+    if fmt == 'webm':
+        return _ffmpeg_encode(pcm, rate, ['-codec:a', 'libopus', '-b:a', '32k', '-f', 'webm'])
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+_CONTENT_TYPES = {'wav16k': 'audio/wav', 'wav44k': 'audio/wav', 'mp3': 'audio/mpeg', 'webm': 'audio/webm'}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🏗️ CORPUS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def build_corpus(
+    lengths: Sequence[float] = DEFAULT_LENGTHS,
+    kinds: Sequence[str] = KINDS,
+    formats: Sequence[str] = FORMATS,
+    seed: int = 1234,
+    rate: int = 16000
+) -> List[Clip]:
+    """Generate every kind × length × format combination (same seed → same bytes)"""
+    if shutil.which('ffmpeg') is None:
+        skipped = [f for f in formats if f != 'wav16k']
+        if skipped:
+            logger.warning(f"⚠️ ffmpeg not found, skipping {', '.join(skipped)} clips")
+        formats = [f for f in formats if f == 'wav16k']
+
+    rng = np.random.default_rng(seed)
+    clips = []
+    for kind in kinds:
+        for seconds in lengths:
+            pcm = _to_int16(_GENERATORS[kind](rng, seconds, rate))
+            word = WORDS[len(clips) % len(WORDS)]
+            for fmt in formats:
+                clips.append(Clip(
+                    name=f"{kind}_{seconds:g}s.{fmt}",
+                    kind=kind,
+                    format=fmt,
+                    seconds=seconds,
+                    target_word=word,
+                    content_type=_CONTENT_TYPES[fmt],
+                    data=_encode(pcm, rate, fmt),
+                ))
+
+    logger.info(f"🎵 Built corpus: {len(clips)} clips ({', '.join(formats)})")
+    return clips
+
+
+def save_corpus(clips: List[Clip], directory: str) -> Dict[str, str]:
+    """Write clips to `directory` (for inspection or external load tools)"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for clip in clips:
+        path = os.path.join(directory, clip.name)
+        with open(path, 'wb') as f:
+            f.write(clip.data)
+        paths[clip.name] = path
+    return paths
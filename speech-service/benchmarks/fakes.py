@@ -0,0 +1,331 @@
+"""
+🧪 Offline stand-ins for the service's external dependencies
+
+- FakeMinio: in-memory object store with the subset of the Minio client
+  API the service uses (optionally with per-call latency)
+- FakeGTTS: writes a silent but well-formed MP3 instead of calling Google
+  (patched into the gtts engine)
+- FakeModel / FakeKaldiRecognizer: used only when no Vosk model is on
+  disk; burn CPU proportional to audio length so pipeline overhead is
+  still measurable
+
+`install()` patches them into the service modules before `main` is
+imported.
+"""
+import io
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import datetime
+from typing import Dict, Iterator, Optional
+import numpy as np
+from minio.datatypes import Object
+from minio.deleteobjects import DeleteError
+from minio.error import S3Error
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📦 MINIO
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class _StoredObject:
+    def __init__(self, data: bytes, content_type: str, metadata: Optional[Dict]):
+        self.data = data
+        self.content_type = content_type
+        self.metadata = {f"x-amz-meta-{k}": str(v) for k, v in (metadata or {}).items()}
+        self.last_modified = datetime.datetime.now(datetime.timezone.utc)
+        self.etag = hashlib.md5(data).hexdigest()
+
+
+class _FakeResponse:
+    """Mimics the urllib3 response returned by Minio.get_object"""
+
+    def __init__(self, data: bytes, content_type: str = 'application/octet-stream'):
+        self._buffer = io.BytesIO(data)
+        self.data = data
+        self.headers = {'Content-Type': content_type, 'Content-Length': str(len(data))}
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._buffer.read(amt)
+
+    def stream(self, amt: int = 64 * 1024) -> Iterator[bytes]:
+        while True:
+            chunk = self._buffer.read(amt)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeMinio:
+    """
+    ✅ In-memory MinIO client
+
+    All instances share one store, like clients of the same server.
+    `latency` (seconds) is slept on every call to approximate a network
+    round-trip to object storage.
+    """
+
+    latency = 0.0
+    _buckets: Dict[str, Dict[str, _StoredObject]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _missing(self, bucket_name: str, object_name: str) -> S3Error:
+        return S3Error(
+            "NoSuchKey", "Object does not exist", f"/{bucket_name}/{object_name}",
+            None, None, None, bucket_name, object_name
+        )
+
+    def _bucket(self, bucket_name: str) -> Dict[str, _StoredObject]:
+        with self._lock:
+            return self._buckets.setdefault(bucket_name, {})
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        self._wait()
+        return bucket_name in self._buckets
+
+    def make_bucket(self, bucket_name: str, *args, **kwargs) -> None:
+        self._wait()
+        self._bucket(bucket_name)
+
+    def put_object(self, bucket_name, object_name, data, length, content_type='application/octet-stream',
+                   metadata=None, part_size=0, **kwargs):
+        self._wait()
+        body = data.read() if length < 0 else data.read(length)
+        self._bucket(bucket_name)[object_name] = _StoredObject(body, content_type, metadata)
+        return None
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0, **kwargs):
+        self._wait()
+        stored = self._bucket(bucket_name).get(object_name)
+        if stored is None:
+            raise self._missing(bucket_name, object_name)
+        data = stored.data[offset:offset + length] if length else stored.data[offset:]
+        return _FakeResponse(data, stored.content_type)
+
+    def stat_object(self, bucket_name, object_name, **kwargs) -> Object:
+        self._wait()
+        stored = self._bucket(bucket_name).get(object_name)
+        if stored is None:
+            raise self._missing(bucket_name, object_name)
+        return self._object(bucket_name, object_name, stored, include_user_meta=True)
+
+    def remove_object(self, bucket_name, object_name, **kwargs) -> None:
+        self._wait()
+        self._bucket(bucket_name).pop(object_name, None)
+
+    def remove_objects(self, bucket_name, delete_object_list, **kwargs) -> Iterator[DeleteError]:
+        self._wait()
+        bucket = self._bucket(bucket_name)
+        for obj in delete_object_list:
+            bucket.pop(obj._name, None)
+        return iter(())
+
+    def list_objects(
+        self, bucket_name, prefix=None, recursive=False, include_user_meta=False, start_after=None, **kwargs
+    ):
+        self._wait()
+        prefix = prefix or ''
+        bucket = self._bucket(bucket_name)
+        with self._lock:
+            items = sorted(bucket.items())
+
+        seen_dirs = set()
+        for name, stored in items:
+            if not name.startswith(prefix) or (start_after and name <= start_after):
+                continue
+            rest = name[len(prefix):]
+            if not recursive and '/' in rest:
+                directory = prefix + rest.split('/', 1)[0] + '/'
+                if directory not in seen_dirs:
+                    seen_dirs.add(directory)
+                    yield Object(bucket_name, directory)
+                continue
+            yield self._object(bucket_name, name, stored, include_user_meta)
+
+    @staticmethod
+    def _object(bucket_name: str, name: str, stored: _StoredObject, include_user_meta: bool) -> Object:
+        return Object(
+            bucket_name,
+            name,
+            last_modified=stored.last_modified,
+            etag=stored.etag,
+            size=len(stored.data),
+            metadata=dict(stored.metadata) if include_user_meta else None,
+            content_type=stored.content_type,
+        )
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔊 GTTS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, mono: 417-byte frames of 1152 samples
+_MP3_HEADER = bytes([0xFF, 0xFB, 0x90, 0xC0])
+_MP3_FRAME = _MP3_HEADER + bytes(417 - 4)
+_MP3_FRAME_SECONDS = 1152 / 44100
+
+
+class FakeGTTS:
+    """
+    ✅ gTTS stand-in producing valid (silent) MP3 frames
+
+    Clip length grows with the text (~0.08s per character, min 0.5s);
+    `latency` seconds are slept to mimic the round-trip to Google.
+    """
+
+    latency = 0.0
+
+    def __init__(self, text: str, lang: str = 'en', slow: bool = False, **kwargs):
+        self.text = text
+        self.seconds = max(0.5, len(text) * 0.08) * (1.5 if slow else 1.0)
+
+    def write_to_fp(self, fp) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        frames = int(self.seconds / _MP3_FRAME_SECONDS) + 1
+        # gTTS writes the response in chunks as it streams from Google
+        for start in range(0, frames, 16):
+            fp.write(_MP3_FRAME * min(16, frames - start))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎤 VOSK
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class FakeModel:
+    """Stand-in for vosk.Model when no model is available offline"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def vosk_model_find_word(self, word: str) -> int:
+        return 0
+
+
+class FakeKaldiRecognizer:
+    """
+    ✅ Decoder stand-in with a cost proportional to the audio length
+
+    Runs a small FFT per 10ms frame so CPU time scales like a real decoder.
+    Always "recognizes" the first phrase of its grammar (or `hello`).
+    """
+
+    def __init__(self, model: FakeModel, sample_rate: int, grammar: Optional[str] = None):
+        self.sample_rate = sample_rate
+        self.text = 'hello'
+        if grammar:
+            self.text = json.loads(grammar)[0]
+        self.Reset()
+
+    def SetWords(self, enabled: bool) -> None:
+        pass
+
+    def Reset(self) -> None:
+        self.samples = 0
+
+    def AcceptWaveform(self, data: bytes) -> bool:
+        pcm = np.frombuffer(data, dtype=np.int16, count=len(data) // 2)
+        step = self.sample_rate // 100
+        frames = len(pcm) // step
+        if frames:
+            np.abs(np.fft.rfft(pcm[:frames * step].reshape(frames, step), axis=1))
+        self.samples += len(pcm)
+        return False
+
+    def PartialResult(self) -> str:
+        return json.dumps({'partial': self.text if self.samples else ''})
+
+    def Result(self) -> str:
+        return self.FinalResult()
+
+    def FinalResult(self) -> str:
+        duration = self.samples / self.sample_rate
+        words = self.text.split()
+        result = [
+            {
+                'word': word,
+                'conf': 0.95,
+                'start': round(duration * i / len(words), 2),
+                'end': round(duration * (i + 1) / len(words), 2),
+            }
+            for i, word in enumerate(words)
+        ]
+        self.Reset()
+        return json.dumps({'text': self.text, 'result': result})
+
+
+def fake_model_dir() -> str:
+    """Empty directory laid out like a Vosk model (passes the structure check)"""
+    path = tempfile.mkdtemp(prefix='fake-vosk-model-')
+    for name in ('am', 'conf', 'graph'):
+        os.makedirs(os.path.join(path, name))
+    return path
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔌 INSTALL
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def install(storage_latency: float = 0.0, tts_latency: float = 0.0, fake_decoder: Optional[bool] = None) -> bool:
+    """
+    Patch the fakes into the service modules. Call before importing `main`.
+
+    Args:
+        storage_latency: seconds slept per object storage call
+        tts_latency: seconds slept per gTTS call
+        fake_decoder: force (True) or forbid (False) the fake Vosk decoder;
+            by default it is used only when VOSK_MODEL_PATH does not exist
+
+    Returns:
+        True when the fake decoder is in use
+    """
+    import gtts
+    import vosk
+    from core import upload_queue
+    from speech_recognition import model_registry
+    from speech_synthesis import tts_service
+
+    FakeMinio.latency = storage_latency
+    FakeGTTS.latency = tts_latency
+    tts_service.Minio = FakeMinio
+    upload_queue.Minio = FakeMinio
+    # The service imports these lazily, so patch the libraries themselves
+    gtts.gTTS = FakeGTTS
+
+    if fake_decoder is None:
+        paths = model_registry.parse_model_specs(
+            os.getenv('VOSK_MODELS'),
+            os.getenv('VOSK_MODEL_PATH', model_registry.DEFAULT_MODEL_PATH)
+        )
+        fake_decoder = not all(os.path.exists(path) for path in paths.values())
+
+    if fake_decoder:
+        # One fake model serves every configured language / tier
+        model_dir = fake_model_dir()
+        os.environ['VOSK_MODEL_PATH'] = model_dir
+        if os.getenv('VOSK_MODELS'):
+            os.environ['VOSK_MODELS'] = ','.join(
+                f"{key}={model_dir}" for key in model_registry.parse_model_specs(os.environ['VOSK_MODELS'], model_dir)
+            )
+        vosk.Model = FakeModel
+        vosk.KaldiRecognizer = FakeKaldiRecognizer
+
+    return fake_decoder
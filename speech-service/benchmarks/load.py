@@ -0,0 +1,195 @@
+"""
+📈 Load generation and latency statistics
+
+Each scenario turns a request number into an httpx request for one
+endpoint. `run_level` drives a scenario with a fixed number of concurrent
+clients (closed loop: every client sends its next request as soon as the
+previous one returns) and reports throughput and latency percentiles.
+"""
+import time
+import base64
+import asyncio
+import itertools
+from typing import Callable, Dict, List, NamedTuple, Sequence
+import numpy as np
+import httpx
+
+from benchmarks.corpus import Clip, WORDS
+
+
+class Scenario(NamedTuple):
+    name: str                          # endpoint label in reports
+    build: Callable[[int], Dict]       # request number → httpx.request kwargs
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎬 SCENARIOS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def stt_base64_scenario(clips: Sequence[Clip], use_grammar: bool = False, save_recording: bool = False) -> Scenario:
+    """POST /stt/recognize-base64, cycling through the corpus"""
+    encoded = [base64.b64encode(clip.data).decode() for clip in clips]
+
+    def build(i: int) -> Dict:
+        clip = clips[i % len(clips)]
+        return {
+            'method': 'POST',
+            'url': '/stt/recognize-base64',
+            'json': {
+                'audio_base64': encoded[i % len(clips)],
+                'target_word': clip.target_word,
+                'user_id': 1,
+                'vocab_id': i % 1000,
+                'save_recording': save_recording,
+                'use_grammar': use_grammar,
+            },
+        }
+
+    return Scenario('/stt/recognize-base64', build)
+
+
+def stt_upload_scenario(clips: Sequence[Clip]) -> Scenario:
+    """POST /stt/recognize (multipart upload), cycling through the corpus"""
+
+    def build(i: int) -> Dict:
+        clip = clips[i % len(clips)]
+        return {
+            'method': 'POST',
+            'url': '/stt/recognize',
+            'files': {'file': (clip.name, clip.data, clip.content_type)},
+        }
+
+    return Scenario('/stt/recognize', build)
+
+
+def tts_scenario(hit_ratio: float = 0.8, seed: int = 1234) -> Scenario:
+    """
+    POST /tts/generate with a controlled cache hit ratio
+
+    Hits reuse a small set of words; misses use text never requested before
+    (the suffix is unique across levels and runs against the same storage).
+    """
+    rng = np.random.default_rng(seed)
+    run_tag = f"{time.time_ns():x}"
+    hits = rng.random(1 << 16) < hit_ratio
+    unique = itertools.count()
+
+    def build(i: int) -> Dict:
+        if hits[i % len(hits)]:
+            text = WORDS[i % len(WORDS)]
+        else:
+            text = f"{WORDS[i % len(WORDS)]} {run_tag} {next(unique)}"
+        return {
+            'method': 'POST',
+            'url': '/tts/generate',
+            'json': {'text': text, 'lang': 'en', 'vocab_id': i % 1000},
+        }
+
+    return Scenario('/tts/generate', build)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🚀 DRIVER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    warmup: int = 0
+) -> Dict:
+    """Send `requests` requests with `concurrency` clients, after `warmup` unmeasured ones"""
+    for i in range(warmup):
+        await client.request(**scenario.build(i))
+
+    counter = itertools.count(warmup)
+    last = warmup + requests
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= last:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(**scenario.build(i))
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'endpoint': scenario.name,
+        'concurrency': concurrency,
+        **summarize(latencies, errors, elapsed),
+    }
+
+
+def summarize(latencies: Sequence[float], errors: int, elapsed: float) -> Dict:
+    """Throughput and latency percentiles (milliseconds)"""
+    if not latencies:
+        return {'requests': 0, 'errors': errors, 'throughput': 0.0}
+
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'requests': len(ms),
+        'errors': errors,
+        'throughput': round(len(ms) / elapsed, 2),
+        'mean_ms': round(float(ms.mean()), 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(ms.max()), 2),
+    }
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📋 REPORTING
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def format_table(results: Sequence[Dict]) -> str:
+    header = f"{'endpoint':<24}{'conc':>6}{'reqs':>7}{'err':>5}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, '─' * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['endpoint']:<24}{r['concurrency']:>6}{r['requests']:>7}{r['errors']:>5}"
+            f"{r['throughput']:>10.1f}{r.get('p50_ms', 0):>10.1f}{r.get('p95_ms', 0):>10.1f}{r.get('p99_ms', 0):>10.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def compare(results: Sequence[Dict], baseline: Sequence[Dict], tolerance: float) -> List[str]:
+    """
+    Regressions against a previous report
+
+    A level regresses when its p95 grows, or its throughput drops, by more
+    than `tolerance` (fraction), or when it has errors the baseline did not.
+    """
+    previous = {(b['endpoint'], b['concurrency']): b for b in baseline}
+    regressions = []
+
+    for r in results:
+        base = previous.get((r['endpoint'], r['concurrency']))
+        if not base or not base.get('requests'):
+            continue
+        label = f"{r['endpoint']} @ {r['concurrency']}"
+
+        if r.get('p95_ms', 0) > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {base['p95_ms']:.1f} → {r['p95_ms']:.1f} ms")
+        if r['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {base['throughput']:.1f} → {r['throughput']:.1f} req/s")
+        if r['errors'] > base['errors']:
+            regressions.append(f"{label}: errors {base['errors']} → {r['errors']}")
+
+    return regressions
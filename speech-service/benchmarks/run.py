@@ -0,0 +1,179 @@
+"""
+⏱️ Speech service benchmark
+
+Drives the STT and TTS endpoints with a synthetic corpus at several
+concurrency levels and reports throughput and p50/p95/p99 latency.
+Runs fully offline: object storage and gTTS are replaced by local fakes,
+and a fake decoder is used when no Vosk model is on disk.
+
+Usage (from speech-service/):
+    # In-process (ASGI transport, no network)
+    python -m benchmarks.run
+    python -m benchmarks.run --concurrency 1,8,32 --requests 500 --output report.json
+
+    # Over HTTP against a server started with the same fakes
+    python -m benchmarks.serve --port 8100
+    python -m benchmarks.run --url http://localhost:8100
+
+    # Fail (exit 1) when p95 / throughput regress by more than 20%
+    python -m benchmarks.run --baseline report.json --tolerance 0.2
+"""
+import sys
+import json
+import asyncio
+import argparse
+import platform
+from contextlib import AsyncExitStack
+from typing import Dict, List
+import httpx
+from loguru import logger
+
+from benchmarks import fakes
+from benchmarks.corpus import DEFAULT_LENGTHS, FORMATS, KINDS, build_corpus, save_corpus
+from benchmarks.load import (
+    compare,
+    format_table,
+    run_level,
+    stt_base64_scenario,
+    stt_upload_scenario,
+    tts_scenario,
+)
+
+ENDPOINTS = ('stt-base64', 'stt-upload', 'tts')
+
+
+def _csv(cast):
+    return lambda value: [cast(v) for v in value.split(',') if v]
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the speech service")
+    parser.add_argument('--url', help="Benchmark a running server instead of the in-process app")
+    parser.add_argument('--endpoints', type=_csv(str), default=list(ENDPOINTS),
+                        help=f"Comma-separated subset of {','.join(ENDPOINTS)}")
+    parser.add_argument('--concurrency', type=_csv(int), default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per level")
+    parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per level")
+    parser.add_argument('--lengths', type=_csv(float), default=list(DEFAULT_LENGTHS), help="Clip lengths (s)")
+    parser.add_argument('--kinds', type=_csv(str), default=list(KINDS))
+    parser.add_argument('--formats', type=_csv(str), default=list(FORMATS))
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--use-grammar', action='store_true', help="Constrain STT decoding to the target word")
+    parser.add_argument('--save-recording', action='store_true', help="Upload recordings on /stt/recognize-base64")
+    parser.add_argument('--tts-hit-ratio', type=float, default=0.8)
+    parser.add_argument('--storage-latency', type=float, default=0.002, help="Fake MinIO latency per call (s)")
+    parser.add_argument('--tts-latency', type=float, default=0.15, help="Fake gTTS latency per call (s)")
+    parser.add_argument('--fake-decoder', action='store_true', default=None,
+                        help="Use the fake decoder even if a Vosk model exists")
+    parser.add_argument('--save-corpus', metavar='DIR', help="Also write the corpus to DIR")
+    parser.add_argument('--output', metavar='FILE', help="Write the JSON report to FILE")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare against a previous JSON report")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--log-level', default='WARNING', help="Log level of the service under test")
+    return parser.parse_args(argv)
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    clips = build_corpus(args.lengths, args.kinds, args.formats, seed=args.seed)
+    if args.save_corpus:
+        save_corpus(clips, args.save_corpus)
+
+    fake_decoder = None
+    lifespan = AsyncExitStack()
+    if args.url:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            timeout=120,
+            limits=httpx.Limits(max_connections=max(args.concurrency))
+        )
+    else:
+        fake_decoder = fakes.install(args.storage_latency, args.tts_latency, args.fake_decoder)
+        if fake_decoder:
+            logger.warning("⚠️ Using the fake decoder: STT latencies exclude real Kaldi decoding")
+        import main as app_module
+        # ASGITransport does not send lifespan events; run startup here and
+        # wait for it, so model loading is not measured as request latency
+        await lifespan.enter_async_context(app_module.app.router.lifespan_context(app_module.app))
+        if not await app_module.readiness.wait(timeout=300):
+            raise RuntimeError(f"Service did not become ready: {app_module.readiness.status()}")
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app_module.app),
+            base_url='http://speech-service',
+            timeout=120
+        )
+
+    scenarios = {
+        'stt-base64': stt_base64_scenario(clips, args.use_grammar, args.save_recording),
+        'stt-upload': stt_upload_scenario(clips),
+        'tts': tts_scenario(args.tts_hit_ratio, args.seed),
+    }
+
+    results = []
+    try:
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                logger.warning(f"🚀 {scenarios[endpoint].name} @ concurrency {concurrency}")
+                results.append(await run_level(
+                    client, scenarios[endpoint], concurrency, args.requests, args.warmup
+                ))
+    finally:
+        await client.aclose()
+        await lifespan.aclose()
+
+    return {
+        'target': args.url or 'in-process',
+        'python': platform.python_version(),
+        'fake_decoder': fake_decoder,
+        'corpus': {
+            'clips': len(clips),
+            'lengths': args.lengths,
+            'kinds': args.kinds,
+            'formats': sorted({clip.format for clip in clips}),
+            'seed': args.seed,
+        },
+        'settings': {
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'use_grammar': args.use_grammar,
+            'save_recording': args.save_recording,
+            'tts_hit_ratio': args.tts_hit_ratio,
+            'storage_latency': args.storage_latency,
+            'tts_latency': args.tts_latency,
+        },
+        'results': results,
+    }
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        logger.error(f"❌ Unknown endpoints: {', '.join(sorted(unknown))}")
+        return 2
+
+    report = asyncio.run(run_benchmark(args))
+    print(format_table(report['results']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"📝 Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report['results'], baseline['results'], args.tolerance)
+        if regressions:
+            for line in regressions:
+                print(f"📉 {line}")
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,34 @@
+"""
+🧪 Run the speech service with offline fakes (for HTTP benchmarks)
+
+Usage (from speech-service/):
+    python -m benchmarks.serve --port 8100
+    python -m benchmarks.run --url http://localhost:8100
+"""
+import sys
+import argparse
+import uvicorn
+from loguru import logger
+
+from benchmarks import fakes
+
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(description="Serve the speech API with local fakes")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--storage-latency', type=float, default=0.002)
+    parser.add_argument('--tts-latency', type=float, default=0.15)
+    parser.add_argument('--fake-decoder', action='store_true', default=None)
+    args = parser.parse_args(argv)
+
+    if fakes.install(args.storage_latency, args.tts_latency, args.fake_decoder):
+        logger.warning("⚠️ Using the fake decoder: STT latencies exclude real Kaldi decoding")
+
+    import main as app_module
+    uvicorn.run(app_module.app, host=args.host, port=args.port, log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,192 @@
+import os
+import math
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+from fastapi import HTTPException
+from loguru import logger
+
+from core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+
+
+class AdmissionRejected(HTTPException):
+    """Request refused before doing any work; carries a Retry-After header"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    ✅ Bounded admission queue for one class of endpoints (stt, tts, stream)
+
+    At most `concurrency` requests of the class run at once; up to
+    `queue_depth` more wait, for at most `max_wait` seconds. Beyond that
+    requests fail fast - before any decoding or synthesis is spent on them:
+    - 503 when the class queue is full or the wait timed out
+    - 429 when one user already has `per_user` requests queued
+
+    With fair queuing, waiting requests are kept in one lane per user and
+    lanes are served round-robin, so a user submitting a burst cannot delay
+    everyone else. Requests without a user share one lane.
+
+    Limits are per process; runs on the event loop (not thread-safe).
+
+    Env (CLASS = STT | TTS | STREAM):
+        ADMISSION_{CLASS}_CONCURRENCY, ADMISSION_{CLASS}_QUEUE,
+        ADMISSION_{CLASS}_MAX_WAIT, ADMISSION_{CLASS}_PER_USER (0 = no cap),
+        ADMISSION_FAIR_QUEUING
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        per_user: Optional[int] = None,
+        fair: Optional[bool] = None
+    ):
+        prefix = f"ADMISSION_{name.upper()}_"
+        self.name = name
+        self.concurrency = concurrency or int(os.getenv(prefix + 'CONCURRENCY', 8))
+        self.queue_depth = queue_depth if queue_depth is not None else int(os.getenv(prefix + 'QUEUE', 64))
+        self.max_wait = max_wait or float(os.getenv(prefix + 'MAX_WAIT', 10))
+        self.per_user = per_user if per_user is not None else int(os.getenv(prefix + 'PER_USER', 8))
+        self.fair = fair if fair is not None else os.getenv('ADMISSION_FAIR_QUEUING', 'true').lower() == 'true'
+
+        self._active = 0
+        self._queued = 0
+        # Waiting requests: lane -> (user, future); the lane is the user with fair queuing
+        self._lanes: 'OrderedDict[Optional[str], Deque[Tuple[Optional[str], asyncio.Future]]]' = OrderedDict()
+        self._queued_by_user: Dict[str, int] = {}
+        # Moving average of how long an admitted request holds its slot
+        self._service_seconds = 1.0
+        self.admitted = 0
+        self.rejected = 0
+
+        ADMISSION_QUEUE_DEPTH.labels(name).set(0)
+        ADMISSION_IN_FLIGHT.labels(name).set(0)
+
+    @asynccontextmanager
+    async def admit(self, user_id: Optional[object] = None) -> AsyncIterator[None]:
+        """Hold one slot of the class for the wrapped block. Raises AdmissionRejected"""
+        await self._acquire(user_id)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_seconds += 0.2 * (time.monotonic() - started - self._service_seconds)
+            self._release()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🚦 QUEUE
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    async def _acquire(self, user_id: Optional[object]) -> None:
+        if self._active < self.concurrency and not self._queued:
+            self._active += 1
+            self._admitted(0.0)
+            return
+
+        user = str(user_id) if user_id is not None else None
+        lane_key = user if self.fair else None
+
+        if self._queued >= self.queue_depth:
+            self._reject(503, 'queue_full', f"Server busy: {self.name} queue is full")
+        if self.per_user and user is not None and self._queued_by_user.get(user, 0) >= self.per_user:
+            self._reject(429, 'user_limit', f"Too many queued {self.name} requests for this user")
+
+        future = asyncio.get_running_loop().create_future()
+        self._lanes.setdefault(lane_key, deque()).append((user, future))
+        self._enqueued(user, 1)
+
+        waited = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Granted a slot just before giving up: hand it on
+                self._release()
+            else:
+                self._discard(lane_key, future)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(503, 'timeout', f"Server busy: waited {self.max_wait:.0f}s for a {self.name} slot")
+            raise
+
+        self._admitted(time.monotonic() - waited)
+
+    def _release(self) -> None:
+        """Pass the slot to the next waiter (round-robin over lanes) or free it"""
+        while self._lanes:
+            lane_key, lane = next(iter(self._lanes.items()))
+            user, future = lane.popleft()
+            if lane:
+                self._lanes.move_to_end(lane_key)
+            else:
+                del self._lanes[lane_key]
+            self._enqueued(user, -1)
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._active -= 1
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self._active)
+
+    def _discard(self, lane_key: Optional[str], future: asyncio.Future) -> None:
+        """Drop a waiter that gave up (timeout, client disconnect)"""
+        lane = self._lanes.get(lane_key, ())
+        for entry in lane:
+            if entry[1] is future:
+                lane.remove(entry)
+                if not lane:
+                    del self._lanes[lane_key]
+                self._enqueued(entry[0], -1)
+                return
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 BOOKKEEPING
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _admitted(self, waited: float) -> None:
+        self.admitted += 1
+        ADMISSION_QUEUE_WAIT.labels(self.name).observe(waited)
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self._active)
+
+    def _enqueued(self, user: Optional[str], delta: int) -> None:
+        self._queued += delta
+        if user is not None:
+            count = self._queued_by_user.get(user, 0) + delta
+            if count:
+                self._queued_by_user[user] = count
+            else:
+                self._queued_by_user.pop(user, None)
+        ADMISSION_QUEUE_DEPTH.labels(self.name).set(self._queued)
+
+    def _reject(self, status_code: int, reason: str, detail: str) -> None:
+        self.rejected += 1
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        retry_after = self.retry_after()
+        logger.warning(f"🚦 Rejected {self.name} request ({reason}), retry after {retry_after}s")
+        raise AdmissionRejected(status_code, detail, retry_after)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained"""
+        drain = (self._queued + 1) * self._service_seconds / self.concurrency
+        return max(1, min(60, math.ceil(drain)))
+
+    def stats(self) -> Dict:
+        return {
+            'concurrency': self.concurrency,
+            'in_flight': self._active,
+            'queued': self._queued,
+            'queue_depth': self.queue_depth,
+            'users_waiting': len(self._queued_by_user),
+            'avg_service_seconds': round(self._service_seconds, 3),
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+        }
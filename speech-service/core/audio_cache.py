@@ -0,0 +1,353 @@
+import os
+import json
+import hashlib
+import tempfile
+import mimetypes
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+from minio import Minio
+from minio.error import S3Error
+from loguru import logger
+
+from core.metrics import AUDIO_CACHE_REQUESTS
+from speech_synthesis.single_flight import SingleFlight
+
+
+class CachedAudio(NamedTuple):
+    data: bytes
+    etag: str           # Strong ETag (quoted sha256 of the content)
+    content_type: str
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class AudioCache:
+    """
+    ✅ Read-through cache of audio objects in MinIO
+
+    Lookups go memory → local disk → MinIO. Both tiers are LRU and bounded
+    in bytes (AUDIO_CACHE_MEMORY_MB, AUDIO_CACHE_DISK_MB); concurrent misses
+    for the same object share one MinIO download.
+
+    The disk tier lives in AUDIO_CACHE_DIR and may be shared by several
+    workers: files are written atomically, and a file evicted by another
+    process is simply treated as a miss. The directory is created and
+    scanned on first disk access, not on construction.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        memory_bytes: Optional[int] = None,
+        disk_bytes: Optional[int] = None,
+        directory: Optional[str] = None
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.memory_bytes = memory_bytes or int(os.getenv('AUDIO_CACHE_MEMORY_MB', 64)) * 1024 * 1024
+        self.disk_bytes = disk_bytes if disk_bytes is not None else int(os.getenv('AUDIO_CACHE_DISK_MB', 1024)) * 1024 * 1024
+        self.directory = directory or os.getenv(
+            'AUDIO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'speech-audio-cache')
+        )
+        # One huge object must not flush the whole memory tier
+        self.max_memory_item = self.memory_bytes // 8
+
+        self._memory: 'OrderedDict[str, CachedAudio]' = OrderedDict()
+        self._memory_used = 0
+        self._disk: 'OrderedDict[str, int]' = OrderedDict()  # key → file size
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_ready = False
+        self.single_flight = SingleFlight()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔍 LOOKUP
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def get_memory(self, object_name: str) -> Optional[CachedAudio]:
+        """Memory tier only (no I/O, safe to call on the event loop)"""
+        with self._lock:
+            audio = self._memory.get(object_name)
+            if audio is not None:
+                self._memory.move_to_end(object_name)
+        if audio is not None:
+            AUDIO_CACHE_REQUESTS.labels('memory').inc()
+        return audio
+
+    def get(self, object_name: str) -> Optional[CachedAudio]:
+        """
+        Fetch an object through the cache (blocking)
+
+        Returns:
+            CachedAudio, or None if the object does not exist
+        """
+        audio = self.get_memory(object_name)
+        if audio is not None:
+            return audio
+
+        audio = self._read_disk(object_name)
+        if audio is not None:
+            AUDIO_CACHE_REQUESTS.labels('disk').inc()
+            self._remember(object_name, audio)
+            return audio
+
+        audio, leader = self.single_flight.do(object_name, lambda: self._fetch(object_name))
+        if audio is not None and leader:
+            AUDIO_CACHE_REQUESTS.labels('storage').inc()
+            self._remember(object_name, audio)
+            self._write_disk(object_name, audio)
+        return audio
+
+    def invalidate(self, object_name: str) -> None:
+        """
+        Forget an object (e.g. after it was deleted from MinIO)
+
+        Removes it from this process's memory tier and from the shared disk
+        tier, including a copy another worker wrote
+        """
+        key = self._disk_key(object_name)
+        with self._lock:
+            audio = self._memory.pop(object_name, None)
+            if audio is not None:
+                self._memory_used -= audio.size
+            size = self._disk.pop(key, None)
+            if size is not None:
+                self._disk_used -= size
+        if self._ensure_disk():
+            self._remove_files(key)
+
+    def _fetch(self, object_name: str) -> Optional[CachedAudio]:
+        try:
+            response = self.client.get_object(self.bucket, object_name)
+        except S3Error as e:
+            if e.code in ('NoSuchKey', 'NoSuchObject'):
+                return None
+            raise
+
+        try:
+            data = response.read()
+            content_type = response.headers.get('Content-Type')
+        finally:
+            response.close()
+            response.release_conn()
+
+        if not content_type or content_type == 'application/octet-stream':
+            content_type = mimetypes.guess_type(object_name)[0] or 'application/octet-stream'
+
+        return CachedAudio(data, f'"{hashlib.sha256(data).hexdigest()}"', content_type)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🧠 MEMORY TIER
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _remember(self, object_name: str, audio: CachedAudio) -> None:
+        if audio.size > self.max_memory_item:
+            return
+        with self._lock:
+            previous = self._memory.pop(object_name, None)
+            if previous is not None:
+                self._memory_used -= previous.size
+            self._memory[object_name] = audio
+            self._memory_used += audio.size
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= evicted.size
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 💾 DISK TIER
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @staticmethod
+    def _disk_key(object_name: str) -> str:
+        return hashlib.sha256(object_name.encode()).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + '.bin', base + '.json'
+
+    def _ensure_disk(self) -> bool:
+        """Create and scan the disk tier on first use. Returns whether it is enabled"""
+        if not self.disk_bytes:
+            return False
+        if self._disk_ready:
+            return True
+        with self._disk_lock:
+            if not self._disk_ready:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._scan_disk()
+                except OSError as e:
+                    logger.warning(f"⚠️ Audio disk cache disabled, {self.directory} is unusable: {str(e)}")
+                    self.disk_bytes = 0
+                self._disk_ready = True
+        return bool(self.disk_bytes)
+
+    def _scan_disk(self) -> None:
+        """Rebuild the disk LRU from files left by earlier runs (oldest first)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.bin'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_used += size
+        self._evict_disk()
+
+        if entries:
+            logger.info(f"💾 Audio disk cache: {len(self._disk)} files, {self._disk_used / 1024 / 1024:.1f} MiB")
+
+    def _read_disk(self, object_name: str) -> Optional[CachedAudio]:
+        if not self._ensure_disk():
+            return None
+        key = self._disk_key(object_name)
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(data_path, 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError):
+            # Not cached (or evicted by another worker): a miss
+            with self._lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_used -= size
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            else:
+                # Written by another worker since our scan: adopt it
+                self._disk[key] = len(data)
+                self._disk_used += len(data)
+        return CachedAudio(data, meta['etag'], meta['content_type'])
+
+    def _write_disk(self, object_name: str, audio: CachedAudio) -> None:
+        if audio.size > self.disk_bytes or not self._ensure_disk():
+            return
+        key = self._disk_key(object_name)
+        data_path, meta_path = self._paths(key)
+        try:
+            self._atomic_write(meta_path, json.dumps({
+                'object_name': object_name,
+                'etag': audio.etag,
+                'content_type': audio.content_type,
+            }).encode())
+            self._atomic_write(data_path, audio.data)
+        except OSError as e:
+            logger.warning(f"⚠️ Audio disk cache write failed: {str(e)}")
+            return
+
+        with self._lock:
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_used -= previous
+            self._disk[key] = audio.size
+            self._disk_used += audio.size
+        self._evict_disk()
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _evict_disk(self) -> None:
+        evicted = []
+        with self._lock:
+            while self._disk_used > self.disk_bytes and self._disk:
+                key, size = self._disk.popitem(last=False)
+                self._disk_used -= size
+                evicted.append(key)
+        for key in evicted:
+            self._remove_files(key)
+
+    def _remove_files(self, key: str) -> None:
+        for path in self._paths(key):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'memory_items': len(self._memory),
+                'memory_bytes': self._memory_used,
+                'memory_limit': self.memory_bytes,
+                'disk_items': len(self._disk),
+                'disk_bytes': self._disk_used,
+                'disk_limit': self.disk_bytes,
+            }
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📐 HTTP RANGES
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range lies outside the object"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `Range: bytes=...` header into an inclusive (start, end).
+
+    Returns None when the header is absent, malformed or asks for several
+    ranges (the full object is served then, as RFC 9110 allows).
+    Raises RangeNotSatisfiable for ranges outside the object.
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec or '-' not in spec:
+        return None
+
+    first, last = (part.strip() for part in spec.split('-', 1))
+    if not (first or last).isdigit() or (first and last and not last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match / If-Range header lists `etag` (or `*`)"""
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    # Weak comparison for If-None-Match: W/"x" matches "x"
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
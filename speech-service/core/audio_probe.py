@@ -0,0 +1,370 @@
+import io
+import struct
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from loguru import logger
+
+from core.mp3 import Mp3DurationMeter, id3v2_size, parse_frame_header
+
+
+class AudioInfo(NamedTuple):
+    format: str                         # wav | mp3 | ogg | webm | decoded
+    codec: Optional[str] = None         # pcm | mp3 | opus | vorbis | ...
+    duration: Optional[float] = None    # seconds
+    channels: Optional[int] = None
+    sample_rate: Optional[int] = None
+    sample_width: Optional[int] = None  # bytes per sample (PCM only)
+    data_offset: Optional[int] = None   # WAV: start of the PCM payload
+    data_size: Optional[int] = None     # WAV: length of the PCM payload
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔍 PUBLIC API
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def detect_format(data: bytes) -> Optional[str]:
+    """Identify the container from its magic bytes."""
+    if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+        return 'wav'
+    if data[:4] == b'OggS':
+        return 'ogg'
+    if data[:4] == b'\x1a\x45\xdf\xa3':
+        return 'webm'
+    if data[:3] == b'ID3' or parse_frame_header(data[:4]) is not None:
+        return 'mp3'
+    return None
+
+
+def probe(data: bytes) -> Optional[AudioInfo]:
+    """
+    ✅ Read duration / channels / sample rate from container headers only
+
+    Nothing is decoded. Returns None for unknown or malformed containers.
+    """
+    fmt = detect_format(data)
+    parser = _PARSERS.get(fmt)
+    if parser is None:
+        return None
+
+    try:
+        return parser(data)
+    except (IndexError, struct.error, ValueError) as e:
+        logger.debug(f"Header probe failed for {fmt}: {e}")
+        return None
+
+
+def probe_or_decode(data: bytes) -> AudioInfo:
+    """
+    Probe headers, falling back to a full decode only when the container
+    is unknown or its headers do not carry a duration.
+    """
+    info = probe(data)
+    if info is not None and info.duration is not None:
+        return info
+
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(data))
+    return AudioInfo(
+        format=info.format if info else 'decoded',
+        codec=info.codec if info else None,
+        duration=round(len(audio) / 1000.0, 2),
+        channels=audio.channels,
+        sample_rate=audio.frame_rate,
+        sample_width=audio.sample_width,
+    )
+
+
+def probe_file(file_path: str) -> AudioInfo:
+    """`probe_or_decode` for a file on disk."""
+    with open(file_path, 'rb') as f:
+        return probe_or_decode(f.read())
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎵 WAV / RIFF
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+_WAVE_FORMATS = {1: 'pcm', 3: 'float', 6: 'alaw', 7: 'mulaw'}
+
+
+def _probe_wav(data: bytes) -> Optional[AudioInfo]:
+    pos = 12
+    fmt = None
+
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack_from('<I', data, pos + 4)[0]
+        body = pos + 8
+
+        if chunk_id == b'fmt ':
+            audio_format, channels, sample_rate, byte_rate, _, bits = struct.unpack_from('<HHIIHH', data, body)
+            if audio_format == 0xFFFE and chunk_size >= 26:  # WAVE_FORMAT_EXTENSIBLE
+                audio_format = struct.unpack_from('<H', data, body + 24)[0]
+            fmt = (audio_format, channels, sample_rate, byte_rate, bits)
+
+        elif chunk_id == b'data' and fmt:
+            audio_format, channels, sample_rate, byte_rate, bits = fmt
+            # Streamed WAVs may leave the size unset (0 or 0xFFFFFFFF)
+            available = len(data) - body
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            return AudioInfo(
+                format='wav',
+                codec=_WAVE_FORMATS.get(audio_format, f'0x{audio_format:04x}'),
+                duration=round(chunk_size / byte_rate, 3) if byte_rate else None,
+                channels=channels,
+                sample_rate=sample_rate,
+                sample_width=bits // 8,
+                data_offset=body,
+                data_size=chunk_size,
+            )
+
+        pos = body + chunk_size + (chunk_size & 1)  # Chunks are word-aligned
+
+    return None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎵 MP3
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _probe_mp3(data: bytes) -> Optional[AudioInfo]:
+    pos = id3v2_size(data) or 0
+
+    # Find the first frame whose successor is also a valid frame
+    header = None
+    while pos + 4 <= len(data):
+        header = parse_frame_header(data[pos:pos + 4])
+        if header:
+            following = parse_frame_header(data[pos + header.frame_length:pos + header.frame_length + 4])
+            if following or pos + header.frame_length >= len(data):
+                break
+        header = None
+        pos += 1
+
+    if header is None:
+        return None
+
+    frames = _vbr_frame_count(data, pos, header)
+    if frames is not None:
+        duration = round(frames * header.samples / header.sample_rate, 3)
+    else:
+        # No Xing/VBRI header: walk frame headers (still no decoding)
+        meter = Mp3DurationMeter()
+        meter.feed(data[pos:])
+        duration = meter.duration
+
+    return AudioInfo(
+        format='mp3',
+        codec='mp3',
+        duration=duration,
+        channels=header.channels,
+        sample_rate=header.sample_rate,
+    )
+
+
+def _vbr_frame_count(data: bytes, pos: int, header) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame."""
+    if header.mpeg1:
+        side_info = 17 if header.channels == 1 else 32
+    else:
+        side_info = 9 if header.channels == 1 else 17
+
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack_from('>I', data, xing + 4)[0]
+        if flags & 0x01:
+            return struct.unpack_from('>I', data, xing + 8)[0]
+
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b'VBRI':
+        return struct.unpack_from('>I', data, vbri + 14)[0]
+
+    return None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎵 OGG (OPUS / VORBIS)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _probe_ogg(data: bytes) -> Optional[AudioInfo]:
+    # First page: 27-byte header, segment table, then the codec ID packet
+    segments = data[26]
+    packet = data[27 + segments:27 + segments + 64]
+
+    if packet.startswith(b'OpusHead'):
+        codec = 'opus'
+        channels = packet[9]
+        pre_skip = struct.unpack_from('<H', packet, 10)[0]
+        sample_rate = struct.unpack_from('<I', packet, 12)[0] or 48000
+        granule_rate = 48000  # Opus granules always count 48 kHz samples
+    elif packet.startswith(b'\x01vorbis'):
+        codec = 'vorbis'
+        channels = packet[11]
+        sample_rate = struct.unpack_from('<I', packet, 12)[0]
+        pre_skip = 0
+        granule_rate = sample_rate
+    else:
+        return None
+
+    # Last page's granule position = total samples
+    last = data.rfind(b'OggS')
+    granule = struct.unpack_from('<q', data, last + 6)[0] if last >= 0 else -1
+    duration = None
+    if granule > 0 and granule_rate:
+        duration = round(max(0, granule - pre_skip) / granule_rate, 3)
+
+    return AudioInfo(
+        format='ogg',
+        codec=codec,
+        duration=duration,
+        channels=channels,
+        sample_rate=sample_rate,
+    )
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎵 WEBM / MATROSKA
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_TRACKS = 0x1654AE6B
+_EBML_TRACK_ENTRY = 0xAE
+_EBML_CODEC_ID = 0x86
+_EBML_AUDIO = 0xE1
+_EBML_SAMPLING_FREQUENCY = 0xB5
+_EBML_CHANNELS = 0x9F
+_EBML_BIT_DEPTH = 0x6264
+_EBML_CLUSTER = 0x1F43B675
+_EBML_CLUSTER_TIMECODE = 0xE7
+_EBML_SIMPLE_BLOCK = 0xA3
+_EBML_BLOCK_GROUP = 0xA0
+_EBML_BLOCK = 0xA1
+
+_EBML_CONTAINERS = {_EBML_SEGMENT, _EBML_INFO, _EBML_TRACKS, _EBML_TRACK_ENTRY, _EBML_AUDIO, _EBML_CLUSTER, _EBML_BLOCK_GROUP}
+
+
+def _read_vint(data: bytes, pos: int, keep_marker: bool) -> Tuple[int, int]:
+    """Read an EBML variable-length integer. Returns (value, length); -1 = unknown size."""
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML vint")
+
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = value == mask - 1
+    for i in range(1, length):
+        byte = data[pos + i]
+        value = (value << 8) | byte
+        all_ones = all_ones and byte == 0xFF
+
+    if not keep_marker and all_ones:
+        return -1, length
+    return value, length
+
+
+def _read_uint(data: bytes, pos: int, size: int) -> int:
+    return int.from_bytes(data[pos:pos + size], 'big')
+
+
+def _read_float(data: bytes, pos: int, size: int) -> float:
+    return struct.unpack_from('>f' if size == 4 else '>d', data, pos)[0]
+
+
+def _probe_webm(data: bytes) -> Optional[AudioInfo]:
+    state = {
+        'timecode_scale': 1_000_000,  # ns per tick (Matroska default)
+        'duration': None,
+        'codec': None,
+        'channels': None,
+        'sample_rate': None,
+        'bit_depth': None,
+        'cluster_time': 0,
+        'last_block': None,
+    }
+    _walk_ebml(data, 0, len(data), state)
+
+    duration = None
+    if state['duration'] is not None:
+        duration = state['duration'] * state['timecode_scale'] / 1e9
+    elif state['last_block'] is not None:
+        # MediaRecorder output has no Duration: use the last block timestamp
+        duration = state['last_block'] * state['timecode_scale'] / 1e9
+
+    codec = state['codec']
+    if codec and codec.startswith('A_'):
+        codec = codec[2:].lower()
+
+    return AudioInfo(
+        format='webm',
+        codec=codec,
+        duration=round(duration, 3) if duration is not None else None,
+        channels=state['channels'],
+        sample_rate=int(state['sample_rate']) if state['sample_rate'] else None,
+        sample_width=state['bit_depth'] // 8 if state['bit_depth'] else None,
+    )
+
+
+def _walk_ebml(data: bytes, pos: int, end: int, state: Dict, parent: Optional[int] = None) -> int:
+    """Walk EBML elements in [pos, end). Returns where the walk stopped."""
+    while pos < end:
+        element_id, id_len = _read_vint(data, pos, keep_marker=True)
+
+        # An unknown-size cluster ends where the next cluster starts
+        if parent == _EBML_CLUSTER and element_id == _EBML_CLUSTER:
+            return pos
+
+        size, size_len = _read_vint(data, pos + id_len, keep_marker=False)
+        body = pos + id_len + size_len
+        body_end = end if size < 0 else min(end, body + size)
+
+        if element_id in _EBML_CONTAINERS:
+            if element_id == _EBML_CLUSTER:
+                state['cluster_time'] = 0
+            stop = _walk_ebml(data, body, body_end, state, element_id)
+            pos = body_end if size >= 0 else stop
+            continue
+        elif element_id == _EBML_TIMECODE_SCALE:
+            state['timecode_scale'] = _read_uint(data, body, size)
+        elif element_id == _EBML_DURATION:
+            state['duration'] = _read_float(data, body, size)
+        elif element_id == _EBML_CODEC_ID:
+            state['codec'] = data[body:body + size].decode('ascii', errors='ignore').rstrip('\x00')
+        elif element_id == _EBML_SAMPLING_FREQUENCY:
+            state['sample_rate'] = _read_float(data, body, size)
+        elif element_id == _EBML_CHANNELS:
+            state['channels'] = _read_uint(data, body, size)
+        elif element_id == _EBML_BIT_DEPTH:
+            state['bit_depth'] = _read_uint(data, body, size)
+        elif element_id == _EBML_CLUSTER_TIMECODE:
+            state['cluster_time'] = _read_uint(data, body, size)
+        elif element_id in (_EBML_SIMPLE_BLOCK, _EBML_BLOCK) and body_end - body >= 4:
+            _, track_len = _read_vint(data, body, keep_marker=False)
+            relative = struct.unpack_from('>h', data, body + track_len)[0]
+            timestamp = state['cluster_time'] + relative
+            if state['last_block'] is None or timestamp > state['last_block']:
+                state['last_block'] = timestamp
+
+        if size < 0:
+            break  # Unknown-size leaf: cannot skip it
+        pos = body_end
+
+    return pos
+
+
+_PARSERS: Dict[Optional[str], Callable[[bytes], Optional[AudioInfo]]] = {
+    'wav': _probe_wav,
+    'mp3': _probe_mp3,
+    'ogg': _probe_ogg,
+    'webm': _probe_webm,
+}
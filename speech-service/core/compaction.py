@@ -0,0 +1,161 @@
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional
+from minio import Minio
+from minio.deleteobjects import DeleteObject
+from loguru import logger
+
+from core.manifest import StorageManifest
+
+# S3 multi-object delete accepts at most 1000 keys per request
+MAX_DELETE_BATCH = 1000
+
+
+class BulkDeleter:
+    """
+    ✅ Batched, rate-limited object deletion
+
+    Names are buffered and removed with one `remove_objects` request per
+    batch instead of one `remove_object` per object. `max_per_second`
+    spaces batches out so a large cleanup does not starve live traffic on
+    the same MinIO. With `dry_run`, nothing is deleted but the counts are
+    reported as if it had been.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        batch_size: int = MAX_DELETE_BATCH,
+        max_per_second: Optional[float] = None,
+        dry_run: bool = False
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.batch_size = max(1, min(batch_size, MAX_DELETE_BATCH))
+        self.max_per_second = max_per_second
+        self.dry_run = dry_run
+        self._pending: Dict[str, int] = {}
+        self._last_batch = 0.0
+        self.deleted: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.bytes_deleted = 0
+
+    def delete(self, object_name: str, size: int = 0) -> None:
+        self._pending[object_name] = size
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+
+        if self.max_per_second:
+            # Space batches so the average stays under the rate limit
+            wait = self._last_batch + len(batch) / self.max_per_second - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        self._last_batch = time.monotonic()
+
+        failed = {}
+        if not self.dry_run:
+            # remove_objects is lazy: the request runs while errors are iterated
+            errors = self.client.remove_objects(self.bucket, [DeleteObject(name) for name in batch])
+            failed = {error.name: error.message or error.code for error in errors}
+
+        for name, size in batch.items():
+            if name in failed:
+                continue
+            self.deleted.append(name)
+            self.bytes_deleted += size
+
+        if failed:
+            self.failed.update(failed)
+            logger.warning(f"⚠️ {len(failed)} of {len(batch)} deletes failed, e.g. {next(iter(failed.items()))}")
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of compacting one prefix"""
+    prefix: str
+    objects: int = 0
+    expired: int = 0
+    kept: int = 0
+    deleted: int = 0
+    failed: int = 0
+    bytes_reclaimed: int = 0
+    bytes_remaining: int = 0
+    dry_run: bool = False
+    seconds: float = 0.0
+    # Names actually deleted (empty on a dry run), e.g. to drop them from caches
+    deleted_objects: List[str] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        del data['deleted_objects']
+        return data
+
+
+def compact(
+    manifest: StorageManifest,
+    deleter: BulkDeleter,
+    older_than_days: float,
+    keep: Optional[Callable[[str], bool]] = None,
+    full: bool = False
+) -> CompactionReport:
+    """
+    ✅ Delete objects older than `older_than_days` from a manifest'd prefix
+
+    Replays the journal into the manifest (or rebuilds it with a listing
+    when `full` is set or no manifest exists), deletes expired objects in
+    rate-limited batches, then saves the manifest and drops the journal
+    objects it absorbed.
+
+    Args:
+        keep: optional check; expired objects for which it returns True stay
+    """
+    started = time.monotonic()
+    report = CompactionReport(prefix=manifest.prefix, dry_run=deleter.dry_run)
+
+    loaded = manifest.load()
+    if not loaded or full or manifest.needs_reconcile():
+        logger.info(f"📋 Listing {manifest.prefix} to rebuild its manifest...")
+        manifest.reconcile()
+    journal = manifest.apply_journal()
+    report.objects = len(manifest.entries)
+
+    cutoff = time.time() - older_than_days * 86400
+    for name, entry in list(manifest.entries.items()):
+        if entry.get('created', cutoff) >= cutoff:
+            continue
+        report.expired += 1
+        if keep and keep(name):
+            report.kept += 1
+            continue
+        deleter.delete(name, int(entry.get('size') or 0))
+    deleter.flush()
+
+    report.deleted = len(deleter.deleted)
+    report.failed = len(deleter.failed)
+    report.bytes_reclaimed = deleter.bytes_deleted
+
+    if not deleter.dry_run:
+        report.deleted_objects = list(deleter.deleted)
+        for name in deleter.deleted:
+            manifest.entries.pop(name, None)
+        # Save before dropping the journal: a crash in between only replays it again
+        manifest.save()
+        cleanup = BulkDeleter(manifest.client, manifest.bucket)
+        for name in journal:
+            cleanup.delete(name)
+        cleanup.flush()
+
+    report.bytes_remaining = manifest.total_size()
+    report.seconds = round(time.monotonic() - started, 2)
+    logger.info(
+        f"🧹 {manifest.prefix}: {report.deleted}/{report.expired} expired objects deleted "
+        f"({report.bytes_reclaimed / 1024 / 1024:.1f} MiB reclaimed, {report.kept} kept, "
+        f"{report.failed} failed) in {report.seconds}s"
+    )
+    return report
@@ -0,0 +1,197 @@
+import os
+import asyncio
+import threading
+import multiprocessing
+from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+
+from core import profiling
+from core.metrics import WORKER_POOL_JOBS, WORKER_POOL_WORKERS
+
+
+class _PoolStats:
+    """
+    Bookkeeping for one executor.
+
+    `submitted` counts jobs handed to the pool that have not finished yet.
+    Jobs beyond the worker count are waiting in the executor queue.
+    """
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        WORKER_POOL_WORKERS.labels(name).set(workers)
+
+    def begin(self) -> None:
+        with self._lock:
+            self.submitted += 1
+        WORKER_POOL_JOBS.labels(self.name).inc()
+
+    def end(self, failed: bool) -> None:
+        WORKER_POOL_JOBS.labels(self.name).dec()
+        with self._lock:
+            self.submitted -= 1
+            self.completed += 1
+            if failed:
+                self.failed += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            in_flight = self.submitted
+            busy = min(in_flight, self.workers)
+            return {
+                'workers': self.workers,
+                'in_flight': in_flight,
+                'busy': busy,
+                'queue_depth': max(0, in_flight - self.workers),
+                'utilization': round(busy / self.workers, 3) if self.workers else 0.0,
+                'completed': self.completed,
+                'failed': self.failed,
+            }
+
+
+def _noop() -> None:
+    pass
+
+
+class WorkerPools:
+    """
+    ✅ Execution layer for blocking speech work
+
+    - CPU-bound work (Vosk decoding) goes to a process pool
+    - I/O-bound work (gTTS, MinIO) goes to a thread pool
+    - Both are sized from env vars and report queue depth / utilization
+
+    Setting STT_PROCESS_WORKERS=0 runs CPU jobs on the thread pool instead
+    (Kaldi releases the GIL while decoding, so threads still scale).
+    """
+
+    def __init__(self):
+        cpu_count = os.cpu_count() or 1
+        self.process_workers = max(0, int(os.getenv('STT_PROCESS_WORKERS', min(4, cpu_count))))
+        self.thread_workers = max(1, int(os.getenv('IO_THREAD_WORKERS', 16)))
+        self.start_method = os.getenv('STT_MP_START_METHOD', 'fork' if os.name == 'posix' else 'spawn')
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_initializer: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+        self.cpu_stats = _PoolStats('cpu', self.process_workers or self.thread_workers)
+        self.io_stats = _PoolStats('io', self.thread_workers)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔧 LIFECYCLE
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def set_cpu_initializer(self, initializer: Callable) -> None:
+        """Register a function run once in every CPU worker process."""
+        self._cpu_initializer = initializer
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            with self._lock:
+                if self._thread_pool is None:
+                    self._thread_pool = ThreadPoolExecutor(
+                        max_workers=self.thread_workers,
+                        thread_name_prefix='speech-io'
+                    )
+                    logger.info(f"🧵 Started I/O thread pool ({self.thread_workers} threads)")
+        return self._thread_pool
+
+    def _get_cpu_pool(self) -> Executor:
+        if self.process_workers == 0:
+            return self._get_thread_pool()
+
+        if self._process_pool is None:
+            with self._lock:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.process_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=self._cpu_initializer
+                    )
+                    logger.info(
+                        f"⚙️ Started CPU process pool "
+                        f"({self.process_workers} workers, start={self.start_method})"
+                    )
+        return self._process_pool
+
+    def start_cpu_pool(self) -> None:
+        """
+        Create the CPU pool and wait until its workers are up (blocking).
+
+        Call after the models are loaded: forked workers copy the parent
+        as it is then, so a pool first created by an early request would
+        start without them.
+        """
+        pool = self._get_cpu_pool()
+        if isinstance(pool, ProcessPoolExecutor):
+            # The first job makes the executor fork all of its workers
+            pool.submit(_noop).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop both pools. Safe to call more than once."""
+        with self._lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=wait, cancel_futures=not wait)
+                self._process_pool = None
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=wait, cancel_futures=not wait)
+                self._thread_pool = None
+        logger.info("🛑 Worker pools shut down")
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🚀 SUBMISSION
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    async def _run(self, executor: Executor, stats: _PoolStats, fn: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ThreadPoolExecutor):
+            # Threads see the request's profile; process jobs report their own
+            fn = profiling.bind(fn)
+        stats.begin()
+        failed = False
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            stats.end(failed)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound function off the event loop.
+
+        `fn` and its arguments must be picklable when the process pool is on.
+        """
+        if kwargs:
+            fn = partial(fn, **kwargs)
+        return await self._run(self._get_cpu_pool(), self.cpu_stats, fn, *args)
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking I/O function on the thread pool."""
+        if kwargs:
+            fn = partial(fn, **kwargs)
+        return await self._run(self._get_thread_pool(), self.io_stats, fn, *args)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def stats(self) -> Dict:
+        """Queue depth and utilization of both pools."""
+        return {
+            'cpu': {
+                **self.cpu_stats.snapshot(),
+                'mode': 'process' if self.process_workers else 'thread',
+            },
+            'io': self.io_stats.snapshot(),
+        }
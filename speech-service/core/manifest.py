@@ -0,0 +1,302 @@
+import io
+import os
+import json
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+from minio import Minio
+from minio.error import S3Error
+from loguru import logger
+
+# User recordings (uploaded by the recording upload queue)
+RECORDINGS_PREFIX = "recordings/"
+RECORDINGS_MANIFEST = "recordings/manifest.json"
+RECORDINGS_JOURNAL_PREFIX = "recordings/journal/"
+
+
+def _read_json(client: Minio, bucket: str, object_name: str) -> Dict:
+    response = client.get_object(bucket, object_name)
+    try:
+        return json.loads(response.read())
+    finally:
+        response.close()
+        response.release_conn()
+
+
+class ManifestJournal:
+    """
+    ✅ Append-only journal of object uploads and deletions
+
+    Services record what they write and delete (and, for shared objects,
+    which holders reference them); records are buffered and
+    written as small, time-ordered JSON objects under `prefix` every
+    STORAGE_JOURNAL_BATCH records or STORAGE_JOURNAL_INTERVAL seconds
+    (checked when a record is added, and on `flush`). The compaction job
+    folds them into the manifest, so neither side needs a bucket listing.
+
+    Records still buffered when a process dies are lost; the manifest's
+    `reconcile` (a full listing) repairs that.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        prefix: str,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.batch_size = batch_size or int(os.getenv('STORAGE_JOURNAL_BATCH', 100))
+        self.interval = interval or float(os.getenv('STORAGE_JOURNAL_INTERVAL', 60))
+        self._records: List[Dict] = []
+        self._oldest = 0.0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def added(self, object_name: str, size: int, **fields) -> None:
+        self._append({'op': 'put', 'object_name': object_name, 'size': size, 'created': time.time(), **fields})
+
+    def removed(self, object_name: str) -> None:
+        self._append({'op': 'delete', 'object_name': object_name})
+
+    def referenced(self, target: str, holder: str) -> None:
+        self._append({'op': 'ref', 'target': target, 'holder': holder})
+
+    def unreferenced(self, target: str, holder: str) -> None:
+        self._append({'op': 'unref', 'target': target, 'holder': holder})
+
+    def _append(self, record: Dict) -> None:
+        with self._lock:
+            if not self._records:
+                self._oldest = time.monotonic()
+            self._records.append(record)
+            due = (
+                len(self._records) >= self.batch_size
+                or time.monotonic() - self._oldest >= self.interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered records as one journal object. Returns records written."""
+        with self._lock:
+            records, self._records = self._records, []
+            self._seq += 1
+            name = f"{self.prefix}{time.time_ns():020d}-{os.getpid()}-{self._seq}.json"
+        if not records:
+            return 0
+
+        body = json.dumps({'records': records}).encode()
+        try:
+            self.client.put_object(
+                self.bucket, name, io.BytesIO(body), length=len(body), content_type="application/json"
+            )
+            return len(records)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write storage journal ({len(records)} records): {str(e)}")
+            with self._lock:
+                # Keep them for the next flush, but never grow without bound
+                self._records = (records + self._records)[-10 * self.batch_size:]
+            return 0
+
+
+class JournalReader:
+    """
+    ✅ Follows a journal written by `ManifestJournal` from a point in time
+
+    `poll` returns the records of journal objects that appeared since the
+    last call, oldest first. Objects are named by the time their writer
+    flushed them and a slow writer can land one after a later-named
+    object, so each listing starts `margin` seconds behind the newest name
+    seen and skips the objects already returned.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        prefix: str,
+        since: Optional[float] = None,
+        margin: float = 30
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.margin = margin
+        self._cursor = int((since if since is not None else time.time()) * 1e9)
+        self._seen: Set[str] = set()
+
+    def poll(self) -> List[Dict]:
+        start_after = f"{self.prefix}{max(0, self._cursor - int(self.margin * 1e9)):020d}"
+        names = sorted(
+            obj.object_name
+            for obj in self.client.list_objects(
+                self.bucket, prefix=self.prefix, recursive=True, start_after=start_after
+            )
+            if not obj.is_dir
+        )
+
+        records = []
+        for name in names:
+            if name in self._seen:
+                continue
+            try:
+                records.extend(_read_json(self.client, self.bucket, name).get('records', []))
+            except S3Error:
+                continue  # Folded into the manifest and removed meanwhile
+            except ValueError:
+                logger.warning(f"⚠️ Skipping unreadable journal object {name}")
+
+        # Names outside the window can never be listed again
+        self._seen = set(names)
+        for name in names:
+            stamp = name[len(self.prefix):].split('-', 1)[0]
+            if stamp.isdigit():
+                self._cursor = max(self._cursor, int(stamp))
+        return records
+
+
+class StorageManifest:
+    """
+    ✅ Snapshot of the objects under a prefix
+
+    Stored as one JSON object: {"version": 1, "entries": {object_name:
+    {"object_name", "size", "created", ...}}}. Kept current by replaying
+    the journal written by `ManifestJournal`; `reconcile` rebuilds it from
+    a full listing when journals were lost or the manifest is new.
+
+    With `refs_prefix`, zero-byte markers `{refs_prefix}{target}/{holder}`
+    are tracked as well, under "refs": {target: [holder, ...]}, so callers
+    can tell whether a shared object is still used without a listing.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        manifest_object: str,
+        journal_prefix: str,
+        prefix: str,
+        exclude: Iterable[str] = (),
+        refs_prefix: Optional[str] = None
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.manifest_object = manifest_object
+        self.journal_prefix = journal_prefix
+        self.prefix = prefix
+        self.exclude = tuple(exclude) + (journal_prefix,)
+        self.refs_prefix = refs_prefix
+        self.entries: Dict[str, Dict] = {}
+        self.refs: Dict[str, Set[str]] = {}
+        self._has_refs = False
+
+    def _read_json(self, object_name: str) -> Dict:
+        return _read_json(self.client, self.bucket, object_name)
+
+    def load(self) -> bool:
+        """Read the manifest. Returns False if it does not exist yet."""
+        try:
+            manifest = self._read_json(self.manifest_object)
+        except S3Error:
+            self.entries = {}
+            self.refs = {}
+            return False
+        self.entries = manifest.get('entries', {})
+        self.refs = {target: set(holders) for target, holders in manifest.get('refs', {}).items()}
+        self._has_refs = 'refs' in manifest
+        return True
+
+    def needs_reconcile(self) -> bool:
+        """Whether a loaded manifest predates fields it should carry (ages, refs)"""
+        # Manifests written before journaling carry no ages: rebuild those once
+        if any('created' not in entry for entry in self.entries.values()):
+            return True
+        return bool(self.refs_prefix) and not self._has_refs
+
+    def referenced(self, target: str) -> bool:
+        """Whether any holder references `target` (as of the last load / journal replay)"""
+        return bool(self.refs.get(target))
+
+    def apply_journal(self) -> List[str]:
+        """
+        Fold pending journal objects into `entries` (oldest first)
+
+        Returns:
+            Names of the journal objects applied, for `remove_journal`
+        """
+        names = sorted(
+            obj.object_name
+            for obj in self.client.list_objects(self.bucket, prefix=self.journal_prefix, recursive=True)
+            if not obj.is_dir
+        )
+        applied = []
+        for name in names:
+            try:
+                records = self._read_json(name).get('records', [])
+            except S3Error:
+                continue  # Removed by a concurrent compaction
+            except ValueError:
+                logger.warning(f"⚠️ Skipping unreadable journal object {name}")
+                applied.append(name)
+                continue
+
+            for record in records:
+                op = record.pop('op')
+                if op == 'ref':
+                    self.refs.setdefault(record['target'], set()).add(record['holder'])
+                elif op == 'unref':
+                    holders = self.refs.get(record['target'], set())
+                    holders.discard(record['holder'])
+                    if not holders:
+                        self.refs.pop(record['target'], None)
+                elif op == 'delete':
+                    self.entries.pop(record['object_name'], None)
+                else:
+                    object_name = record.pop('object_name')
+                    self.entries[object_name] = {'object_name': object_name, **record}
+            applied.append(name)
+        return applied
+
+    def reconcile(self) -> int:
+        """Rebuild `entries` (and `refs`) from a full listing of the prefix (keeps known extra fields)"""
+        entries = {}
+        refs: Dict[str, Set[str]] = {}
+        for obj in self.client.list_objects(self.bucket, prefix=self.prefix, recursive=True):
+            name = obj.object_name
+            if obj.is_dir or name == self.manifest_object:
+                continue
+            if self.refs_prefix and name.startswith(self.refs_prefix):
+                target, _, holder = name[len(self.refs_prefix):].partition('/')
+                refs.setdefault(target, set()).add(holder)
+                continue
+            if name.startswith(self.exclude):
+                continue
+            entry = dict(self.entries.get(name) or {})
+            entry.update({
+                'object_name': name,
+                'size': obj.size or 0,
+                'created': obj.last_modified.timestamp() if obj.last_modified else time.time(),
+            })
+            entries[name] = entry
+        self.entries = entries
+        if self.refs_prefix:
+            self.refs = refs
+            self._has_refs = True
+        return len(entries)
+
+    def save(self) -> None:
+        manifest = {'version': 1, 'updated': time.time(), 'entries': self.entries}
+        if self.refs_prefix:
+            manifest['refs'] = {target: sorted(holders) for target, holders in self.refs.items()}
+        body = json.dumps(manifest).encode()
+        self.client.put_object(
+            self.bucket, self.manifest_object, io.BytesIO(body), length=len(body), content_type="application/json"
+        )
+        logger.info(f"📇 Wrote manifest {self.manifest_object} with {len(self.entries)} entries")
+
+    def total_size(self) -> int:
+        return sum(int(entry.get('size') or 0) for entry in self.entries.values())
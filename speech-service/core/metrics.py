@@ -0,0 +1,188 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+from core import profiling
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📊 METRIC DEFINITIONS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so every worker writes its
+# samples to a shared directory and /metrics aggregates all of them.
+# Gauges use `livesum` so values of exited workers drop out.
+
+# Stage latencies span ~1ms (scoring) to tens of seconds (gTTS, long decodes)
+_STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = Histogram(
+    'speech_stage_duration_seconds',
+    'Time spent in each processing stage',
+    ['service', 'stage'],
+    buckets=_STAGE_BUCKETS,
+)
+
+REQUEST_SECONDS = Histogram(
+    'speech_request_duration_seconds',
+    'HTTP request latency by route',
+    ['method', 'route', 'status'],
+    buckets=_STAGE_BUCKETS,
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    'speech_requests_in_flight',
+    'HTTP requests currently being handled',
+    multiprocess_mode='livesum',
+)
+
+TTS_CACHE_REQUESTS = Counter(
+    'speech_tts_cache_requests_total',
+    'TTS cache lookups by result (hit, miss, coalesced)',
+    ['result'],
+)
+
+AUDIO_CACHE_REQUESTS = Counter(
+    'speech_audio_cache_requests_total',
+    'Audio served by /audio by source tier (memory, disk, storage)',
+    ['tier'],
+)
+
+RECOGNIZER_POOL_RECOGNIZERS = Gauge(
+    'speech_recognizer_pool_recognizers',
+    'Pooled Kaldi recognizers by model and state (idle, in_use)',
+    ['model', 'state'],
+    multiprocess_mode='livesum',
+)
+
+RECOGNIZER_POOL_CHECKOUTS = Counter(
+    'speech_recognizer_pool_checkouts_total',
+    'Recognizer checkouts by model and source (reused, built)',
+    ['model', 'source'],
+)
+
+UPLOAD_BACKLOG = Gauge(
+    'speech_upload_queue_backlog',
+    'Objects queued for background upload, per queue (recording, tts_ref)',
+    ['queue'],
+    multiprocess_mode='livesum',
+)
+
+UPLOADS = Counter(
+    'speech_recording_uploads_total',
+    'Background uploads per queue by result (ok, retried, failed, rejected)',
+    ['queue', 'result'],
+)
+
+WORKER_POOL_JOBS = Gauge(
+    'speech_worker_pool_jobs',
+    'Jobs submitted to the worker pools and not finished yet',
+    ['pool'],
+    multiprocess_mode='livesum',
+)
+
+WORKER_POOL_WORKERS = Gauge(
+    'speech_worker_pool_workers',
+    'Configured workers per pool',
+    ['pool'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    'speech_admission_queue_wait_seconds',
+    'Time admitted requests waited for a slot, per endpoint class (autoscaling signal)',
+    ['endpoint_class'],
+    buckets=_STAGE_BUCKETS,
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    'speech_admission_queue_depth',
+    'Requests waiting for an admission slot',
+    ['endpoint_class'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    'speech_admission_in_flight',
+    'Admitted requests holding a slot',
+    ['endpoint_class'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_REJECTED = Counter(
+    'speech_admission_rejected_total',
+    'Requests refused by admission control by reason (queue_full, user_limit, timeout)',
+    ['endpoint_class', 'reason'],
+)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ⏱️ STAGE TIMING
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@contextmanager
+def time_stage(service: str, stage: str) -> Iterator[None]:
+    """Observe the duration of the wrapped block in the stage histogram."""
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(service, stage).observe(elapsed)
+        profiling.record_stage(stage, elapsed, time.thread_time() - cpu_start)
+
+
+@contextmanager
+def record_stage(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """
+    Record the duration of the wrapped block into `timings` only.
+
+    Used by code that may run inside a CPU pool process: the timings travel
+    back with the result and are observed by the serving process through
+    `observe_timings`, so nothing is lost when worker processes exit.
+    """
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+        profiling.record_stage(stage, elapsed, time.thread_time() - cpu_start)
+
+
+def observe_timings(service: str, timings: Optional[Dict[str, float]]) -> None:
+    """Feed stage timings collected by `record_stage` into the histogram."""
+    for stage, seconds in (timings or {}).items():
+        STAGE_SECONDS.labels(service, stage).observe(seconds)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📤 EXPOSITION
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def render() -> Tuple[bytes, str]:
+    """Prometheus text exposition of all metrics (aggregated across workers)."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited worker (gunicorn `child_exit` hook)."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,160 @@
+import io
+from typing import NamedTuple, Optional
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📐 MPEG AUDIO FRAME TABLES
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Bitrates in kbps, indexed by [MPEG1?][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    False: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates indexed by version bits (0 = MPEG2.5, 2 = MPEG2, 3 = MPEG1)
+_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+_LAYERS = {1: 3, 2: 2, 3: 1}  # layer bits -> layer number
+
+
+class Mp3FrameHeader(NamedTuple):
+    mpeg1: bool
+    layer: int
+    bitrate: int        # bits per second
+    sample_rate: int
+    channels: int
+    samples: int        # samples per channel in this frame
+    frame_length: int   # bytes, including the 4-byte header
+
+
+def parse_frame_header(header: bytes) -> Optional[Mp3FrameHeader]:
+    """Parse a 4-byte MPEG audio frame header. Returns None if invalid."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = (header[2] >> 4) & 0x0F
+    sample_rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    channel_mode = (header[3] >> 6) & 0x03
+
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = _LAYERS[layer_bits]
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    return Mp3FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        channels=1 if channel_mode == 3 else 2,
+        samples=samples,
+        frame_length=frame_length,
+    )
+
+
+def id3v2_size(data: bytes) -> Optional[int]:
+    """Total size of an ID3v2 tag at the start of `data` (needs 10 bytes)."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return None
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ⏱️ STREAMING DURATION
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class Mp3DurationMeter:
+    """
+    ✅ Incremental MP3 duration counter
+
+    Walks frame headers as bytes are fed in, skipping frame payloads
+    without decoding them. Works on arbitrary chunk boundaries.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.samples = 0
+        self.sample_rate = 0
+        self._pending = b''
+        self._skip = 0
+        self._seen_audio = False
+
+    def feed(self, data: bytes) -> None:
+        data = self._pending + bytes(data)
+        i = 0
+        end = len(data)
+
+        while i < end:
+            if self._skip:
+                step = min(self._skip, end - i)
+                i += step
+                self._skip -= step
+                continue
+
+            if not self._seen_audio and data[i:i + 3] == b'ID3':
+                if end - i < 10:
+                    break
+                self._skip = id3v2_size(data[i:i + 10])
+                continue
+
+            if end - i < 4:
+                break
+
+            header = parse_frame_header(data[i:i + 4])
+            if header is None:
+                i += 1  # Resync on garbage
+                continue
+
+            self._seen_audio = True
+            self.frames += 1
+            self.samples += header.samples
+            self.sample_rate = header.sample_rate
+            self._skip = header.frame_length
+
+        self._pending = data[i:]
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, or None if no frames were seen."""
+        if not self.frames or not self.sample_rate:
+            return None
+        return round(self.samples / self.sample_rate, 2)
+
+
+class MeteredBuffer(io.BytesIO):
+    """In-memory buffer that measures MP3 duration while it is written to."""
+
+    def __init__(self):
+        super().__init__()
+        self.meter = Mp3DurationMeter()
+
+    def write(self, data) -> int:
+        self.meter.feed(data)
+        return super().write(data)
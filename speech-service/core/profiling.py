@@ -0,0 +1,276 @@
+import os
+import sys
+import json
+import time
+import random
+import functools
+import ipaddress
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from loguru import logger
+
+# Request header asking for a profile of that request
+PROFILE_HEADER = 'X-Profile'
+
+
+# Settings are read on use, not at import: this module is imported before
+# main.py loads .env
+
+def profile_dir() -> str:
+    """Where folded-stack profiles (`frame;frame;frame count` lines) land;
+    render them with flamegraph.pl, speedscope or inferno"""
+    return os.getenv('PROFILE_DIR', 'tmp/speech-profiles')
+
+
+def sample_interval() -> float:
+    """Seconds between stack samples"""
+    return float(os.getenv('PROFILE_INTERVAL_MS', 5)) / 1000
+
+
+def sample_rate() -> float:
+    """Fraction of `sampled` calls profiled in the background (0 = off)"""
+    return float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+
+
+def allowlist() -> List[str]:
+    """Clients (IPs / CIDRs, or *) allowed to send PROFILE_HEADER; empty = nobody"""
+    return [entry.strip() for entry in os.getenv('PROFILE_ALLOWLIST', '').split(',') if entry.strip()]
+
+
+_current: contextvars.ContextVar[Optional['Profile']] = contextvars.ContextVar('speech_profile', default=None)
+
+
+class Profile:
+    """
+    ✅ Stage timings and sampled stacks of one request (or one call)
+
+    While running, a sampler thread snapshots the Python stacks of the
+    threads working for the profile every PROFILE_INTERVAL_MS: worker
+    threads while they run a call made through `bind`, plus the thread
+    that entered `running` unless that is a shared event loop. Stages
+    timed with `core.metrics.time_stage` / `record_stage` in its context
+    report their wall and CPU time here as well.
+    """
+
+    def __init__(self, name: str, interval: Optional[float] = None):
+        self.name = name
+        self.interval = interval or sample_interval()
+        self.stages: Dict[str, List[float]] = {}  # stage -> [wall, cpu, count]
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.wall = 0.0
+
+        self._threads: Counter = Counter()  # thread ident -> nesting depth
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔄 LIFECYCLE
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @contextmanager
+    def running(self, include_caller: bool = True) -> Iterator['Profile']:
+        """
+        Make this the current profile until exit
+
+        With `include_caller`, the calling thread is sampled too. Pass False
+        on the event loop: it runs every other request as well, so its
+        stacks would not belong to this one
+        """
+        token = _current.set(self)
+        self._sampler = threading.Thread(target=self._sample, name='speech-profiler', daemon=True)
+        started = time.perf_counter()
+        self._sampler.start()
+        try:
+            with self.on_thread() if include_caller else nullcontext():
+                yield self
+        finally:
+            self._stop.set()
+            self._sampler.join()
+            self.wall = time.perf_counter() - started
+            _current.reset(token)
+
+    @contextmanager
+    def on_thread(self) -> Iterator[None]:
+        """Sample the calling thread as part of this profile while inside"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            with self._lock:
+                idents = list(self._threads)
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_fold(frame, names.get(ident, str(ident)))] += 1
+                    self.samples += 1
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 RESULTS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def add_stage(self, stage: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += 1
+
+    def export(self) -> Dict:
+        """Picklable snapshot, e.g. to send back from a CPU pool process"""
+        return {'stages': self.stages, 'stacks': dict(self.stacks), 'samples': self.samples}
+
+    def merge(self, data: Dict) -> None:
+        """Add a profile exported by another process"""
+        for stage, (wall, cpu, count) in data.get('stages', {}).items():
+            with self._lock:
+                totals = self.stages.setdefault(stage, [0.0, 0.0, 0])
+                totals[0] += wall
+                totals[1] += cpu
+                totals[2] += count
+        self.stacks.update(data.get('stacks', {}))
+        self.samples += data.get('samples', 0)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: wall and CPU milliseconds per stage"""
+        entries = []
+        for stage, (wall, cpu, _) in self.stages.items():
+            entries.append(f'{stage};dur={wall * 1000:.1f};desc="wall"')
+            entries.append(f'{stage}-cpu;dur={cpu * 1000:.1f};desc="cpu"')
+        entries.append(f'total;dur={self.wall * 1000:.1f}')
+        return ', '.join(entries)
+
+    def write(self, directory: Optional[str] = None) -> str:
+        """
+        Write `<name>.folded` (flame graph input) and `<name>.json` (stage
+        timings) to PROFILE_DIR. Returns the folded file's path
+        """
+        directory = directory or profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        safe_name = ''.join(c if c.isalnum() else '_' for c in self.name).strip('_')
+        base = os.path.join(
+            directory,
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_name}_{os.getpid()}_{random.getrandbits(24):06x}"
+        )
+
+        with open(base + '.folded', 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'name': self.name,
+                'wall_seconds': round(self.wall, 6),
+                'samples': self.samples,
+                'interval_seconds': self.interval,
+                'stages': {
+                    stage: {'wall_seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6), 'count': count}
+                    for stage, (wall, cpu, count) in self.stages.items()
+                },
+            }, f, indent=2)
+
+        logger.info(f"🔬 Profile written: {base}.folded ({self.samples} samples, {self.wall * 1000:.0f} ms)")
+        return base + '.folded'
+
+
+def _fold(frame, thread_name: str) -> str:
+    """`thread;outermost;...;innermost` with frames as `function (file:line)`"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ';'.join(reversed(names)).replace(' ', '_')
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔗 CONTEXT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def current() -> Optional[Profile]:
+    return _current.get()
+
+
+def record_stage(stage: str, wall: float, cpu: float) -> None:
+    """Report a timed stage to the current profile, if any"""
+    profile = _current.get()
+    if profile is not None:
+        profile.add_stage(stage, wall, cpu)
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    Carry the current profile into a worker thread: the call runs in a
+    copy of this context and its thread is sampled. No-op without a profile
+    """
+    profile = _current.get()
+    if profile is None:
+        return fn
+    context = contextvars.copy_context()
+
+    def call(*args, **kwargs):
+        with profile.on_thread():
+            return fn(*args, **kwargs)
+
+    return functools.partial(context.run, call)
+
+
+def client_allowed(host: Optional[str]) -> bool:
+    """Whether a client address is in PROFILE_ALLOWLIST"""
+    entries = allowlist()
+    if not entries or host is None:
+        return False
+    if '*' in entries:
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    for entry in entries:
+        try:
+            if address in ipaddress.ip_network(entry, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def sampled(name: str) -> Callable:
+    """
+    Profile a fraction (PROFILE_SAMPLE_RATE) of calls of the decorated
+    function in the background and write each one to PROFILE_DIR. Calls
+    made while a profile is already active are not profiled again
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> Any:
+            rate = sample_rate()
+            if rate <= 0 or _current.get() is not None or random.random() >= rate:
+                return fn(*args, **kwargs)
+
+            profile = Profile(name)
+            try:
+                with profile.running():
+                    return fn(*args, **kwargs)
+            finally:
+                try:
+                    profile.write()
+                except OSError as e:
+                    logger.warning(f"⚠️ Failed to write profile for {name}: {str(e)}")
+        return wrapper
+    return decorator
@@ -0,0 +1,146 @@
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+
+# Runs a blocking function off the event loop (e.g. WorkerPools.run_io)
+RunBlocking = Callable[[Callable], Awaitable[Any]]
+
+
+class Readiness:
+    """
+    ✅ Startup tasks and cached dependency checks behind /health/ready
+
+    Startup tasks (model loading, bucket setup, ...) run once, concurrently,
+    while the server is already accepting connections; a failed task is
+    retried on every check pass. Checks run in the background every
+    HEALTH_CHECK_INTERVAL seconds, so probes only read cached results and
+    never wait on MinIO.
+    """
+
+    def __init__(self, interval: Optional[float] = None, timeout: Optional[float] = None):
+        self.interval = interval or float(os.getenv('HEALTH_CHECK_INTERVAL', 10))
+        self.timeout = timeout or float(os.getenv('HEALTH_CHECK_TIMEOUT', 5))
+        self.started_at = time.time()
+
+        self._startup: Dict[str, Callable[[], Any]] = {}
+        self._checks: Dict[str, Callable[[], bool]] = {}
+        self._startup_status: Dict[str, Dict] = {}
+        self._check_status: Dict[str, Dict] = {}
+        self._ready: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._run: Optional[RunBlocking] = None
+
+    def add_startup(self, name: str, fn: Callable[[], Any]) -> None:
+        """Register a blocking task that must succeed once before the service is ready"""
+        self._startup[name] = fn
+        self._startup_status[name] = {'state': 'pending'}
+
+    def add_check(self, name: str, fn: Callable[[], bool]) -> None:
+        """Register a blocking check that must keep returning True"""
+        self._checks[name] = fn
+        self._check_status[name] = {'ok': None}
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🚀 LIFECYCLE
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def start(self, run_blocking: RunBlocking) -> None:
+        """Launch startup tasks and the check loop without waiting for them"""
+        self._run = run_blocking
+        self._ready = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run_startup()),
+            asyncio.create_task(self._check_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until ready. Returns False on timeout"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run_startup(self) -> None:
+        await asyncio.gather(*(self._run_task(name) for name in self._startup))
+        await self.run_checks()
+
+    async def _run_task(self, name: str) -> None:
+        self._startup_status[name] = {'state': 'running'}
+        started = time.monotonic()
+        try:
+            await self._run(self._startup[name])
+            elapsed = round(time.monotonic() - started, 3)
+            self._startup_status[name] = {'state': 'ok', 'seconds': elapsed}
+            logger.success(f"✅ Startup task {name} finished in {elapsed:.1f}s")
+
+        except Exception as e:
+            self._startup_status[name] = {
+                'state': 'failed',
+                'seconds': round(time.monotonic() - started, 3),
+                'error': str(e)
+            }
+            logger.error(f"❌ Startup task {name} failed: {str(e)}")
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            failed = [name for name, status in self._startup_status.items() if status['state'] == 'failed']
+            if failed:
+                await asyncio.gather(*(self._run_task(name) for name in failed))
+            await self.run_checks()
+
+    async def run_checks(self) -> None:
+        """Run every check now and cache the results"""
+        names = list(self._checks)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._run(self._checks[name]), self.timeout) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            status = {'ok': result is True, 'checked_at': round(time.time(), 3)}
+            if isinstance(result, asyncio.TimeoutError):
+                status['error'] = f"timed out after {self.timeout}s"
+            elif isinstance(result, Exception):
+                status['error'] = str(result)
+            if self._check_status[name].get('ok') and not status['ok']:
+                logger.warning(f"⚠️ Health check {name} failing: {status.get('error', 'returned False')}")
+            self._check_status[name] = status
+
+        if self.is_ready():
+            self._ready.set()
+        else:
+            self._ready.clear()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATUS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def started(self, name: str) -> bool:
+        """Whether the startup task `name` has finished successfully"""
+        return self._startup_status.get(name, {}).get('state') == 'ok'
+
+    def check_ok(self, name: str) -> bool:
+        return bool(self._check_status.get(name, {}).get('ok'))
+
+    def is_ready(self) -> bool:
+        return (
+            all(status['state'] == 'ok' for status in self._startup_status.values())
+            and all(status['ok'] for status in self._check_status.values())
+        )
+
+    def status(self) -> Dict:
+        return {
+            'ready': self.is_ready(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'startup': dict(self._startup_status),
+            'checks': dict(self._check_status),
+        }
@@ -0,0 +1,298 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# A recognized word counts as correctly pronounced at or above this accuracy
+WORD_MATCH_ACCURACY = 100.0
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📏 EDIT DISTANCE
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance restricted to a diagonal band of width `max_distance`
+
+    Stops as soon as every cell in a row exceeds the bound and then returns
+    `max_distance + 1`, so callers only pay for distances they care about.
+    """
+    if s1 == s2:
+        return 0
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    # Common prefix / suffix never change the distance
+    start = 0
+    while start < len(s2) and s1[start] == s2[start]:
+        start += 1
+    end1, end2 = len(s1), len(s2)
+    while end2 > start and s1[end1 - 1] == s2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    s1, s2 = s1[start:end1], s2[start:end2]
+
+    n, m = len(s1), len(s2)
+    if max_distance is None:
+        max_distance = n
+    over = max_distance + 1
+
+    if n - m > max_distance:
+        return over
+    if m == 0:
+        return n if n <= max_distance else over
+
+    previous_row = [j if j <= max_distance else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        current_row = [over] * (m + 1)
+        current_row[0] = i if i <= max_distance else over
+        row_min = current_row[0]
+        c1 = s1[i - 1]
+
+        for j in range(max(1, i - max_distance), min(m, i + max_distance) + 1):
+            value = min(
+                previous_row[j - 1] + (c1 != s2[j - 1]),  # substitution
+                current_row[j - 1] + 1,                   # insertion
+                previous_row[j] + 1,                      # deletion
+            )
+            current_row[j] = value if value < over else over
+            if value < row_min:
+                row_min = value
+
+        if row_min > max_distance:
+            return over
+        previous_row = current_row
+
+    return previous_row[m]
+
+
+def batch_levenshtein(
+    pairs: Sequence[Tuple[str, str]],
+    max_distance: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Levenshtein distance for many pairs at once
+
+    Runs one DP row per character of the longest first string, vectorized
+    across the whole batch. The left-to-right dependency inside a row is
+    resolved with a running minimum, so no per-cell Python loop remains.
+
+    With a per-pair `max_distance`, a pair whose whole row exceeds its
+    bound is reported as `max_distance + 1` and stops holding the batch
+    open; the loop ends once every pair is finished or over its bound.
+    """
+    count = len(pairs)
+    if count == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    len1 = np.array([len(a) for a, _ in pairs], dtype=np.int32)
+    len2 = np.array([len(b) for _, b in pairs], dtype=np.int32)
+    n, m = int(len1.max()), int(len2.max())
+
+    # Code points, padded with values that never match each other
+    codes1 = np.full((count, max(n, 1)), -1, dtype=np.int32)
+    codes2 = np.full((count, max(m, 1)), -2, dtype=np.int32)
+    for k, (a, b) in enumerate(pairs):
+        if a:
+            codes1[k, :len(a)] = np.frombuffer(a.encode('utf-32-le'), dtype=np.int32)
+        if b:
+            codes2[k, :len(b)] = np.frombuffer(b.encode('utf-32-le'), dtype=np.int32)
+
+    rows = np.arange(count)
+    offsets = np.arange(m + 1, dtype=np.int32)
+    previous = np.tile(offsets, (count, 1))
+    distances = np.where(len1 == 0, len2, 0).astype(np.int32)
+
+    if max_distance is not None:
+        max_distance = np.asarray(max_distance, dtype=np.int32)
+        over = max_distance + 1
+        # Columns past each pair's second string are padding, not part of its row
+        padding = offsets[None, :] > len2[:, None]
+        pending = len1 > 0
+        distances = np.where(distances > max_distance, over, distances)
+
+    for i in range(1, n + 1):
+        substitution = previous[:, :-1] + (codes1[:, i - 1:i] != codes2[:, :m])
+        deletion = previous[:, 1:] + 1
+        best = np.minimum(substitution, deletion)
+
+        # current[j] = min(best[j], current[j - 1] + 1) with current[0] = i
+        shifted = np.empty_like(previous)
+        shifted[:, 0] = i
+        shifted[:, 1:] = best - offsets[1:]
+        current = np.minimum.accumulate(shifted, axis=1) + offsets
+
+        done = len1 == i
+        if done.any():
+            distances[done] = current[rows[done], len2[done]]
+        previous = current
+
+        if max_distance is not None:
+            # Every path to the last cell crosses this row, so its minimum bounds the distance
+            row_min = np.where(padding, np.iinfo(np.int32).max, current).min(axis=1)
+            exceeded = pending & (row_min > max_distance)
+            distances[exceeded] = over[exceeded]
+            pending &= ~exceeded & (len1 > i)
+            if not pending.any():
+                break
+
+    if max_distance is not None:
+        distances = np.where(distances > max_distance, over, distances)
+    return distances
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎯 ACCURACY
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def char_accuracy(recognized: str, target: str, min_accuracy: float = 0.0) -> float:
+    """
+    Character-level accuracy (0-100) from Levenshtein distance
+
+    Anything below `min_accuracy` is reported as 0, which lets the
+    distance computation stop early.
+    """
+    if recognized == target:
+        return 100.0
+
+    max_len = max(len(recognized), len(target))
+    if max_len == 0:
+        return 0.0
+
+    cutoff = int(max_len * (1 - min_accuracy / 100))
+    distance = bounded_levenshtein(recognized, target, cutoff)
+    if distance > cutoff:
+        return 0.0
+
+    return round(max(0, 100 * (1 - distance / max_len)), 2)
+
+
+def score_batch(pairs: Sequence[Tuple[str, str]], min_accuracy: float = 0.0) -> List[float]:
+    """
+    Character-level accuracy for a list of (recognized, target) pairs in one call
+
+    Like `char_accuracy`, pairs below `min_accuracy` score 0 and are
+    dropped from the distance computation early.
+    """
+    if not pairs:
+        return []
+
+    max_len = np.array([max(len(a), len(b)) for a, b in pairs], dtype=np.float64)
+    equal = np.array([a == b for a, b in pairs])
+    cutoff = (max_len * (1 - min_accuracy / 100)).astype(np.int32)
+    distances = batch_levenshtein(pairs, cutoff if min_accuracy > 0 else None)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = np.maximum(0.0, 100 * (1 - distances / max_len))
+    accuracy = np.where(distances > cutoff, 0.0, accuracy)
+    accuracy = np.where(max_len == 0, 0.0, accuracy)
+    accuracy = np.where(equal, 100.0, accuracy)
+
+    return [round(float(a), 2) for a in accuracy]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔤 WORD ALIGNMENT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def align_words(words: List[Dict], target: str, min_accuracy: float = 0.0) -> List[Dict]:
+    """
+    Align Vosk word results against the words of a multi-word target
+
+    Uses a word-level edit distance where substituting one word for
+    another costs its character-level error rate. Returns one entry per
+    target word (status `correct`, `mispronounced` or `missing`) plus
+    `extra` entries for inserted words, in spoken order. Word pairs below
+    `min_accuracy` count as a full substitution.
+    """
+    target_words = target.split()
+    spoken = [w.get('word', '').lower() for w in words]
+    rows, cols = len(target_words), len(spoken)
+
+    similarity = [[char_accuracy(spoken[j], target_words[i], min_accuracy) for j in range(cols)] for i in range(rows)]
+
+    cost = np.zeros((rows + 1, cols + 1))
+    cost[:, 0] = np.arange(rows + 1)
+    cost[0, :] = np.arange(cols + 1)
+    for i in range(1, rows + 1):
+        for j in range(1, cols + 1):
+            cost[i, j] = min(
+                cost[i - 1, j - 1] + (1 - similarity[i - 1][j - 1] / 100),
+                cost[i - 1, j] + 1,
+                cost[i, j - 1] + 1,
+            )
+
+    aligned = []
+    i, j = rows, cols
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and np.isclose(cost[i, j], cost[i - 1, j - 1] + (1 - similarity[i - 1][j - 1] / 100)):
+            accuracy = similarity[i - 1][j - 1]
+            status = 'correct' if accuracy >= WORD_MATCH_ACCURACY else 'mispronounced'
+            aligned.append(_word_entry(target_words[i - 1], words[j - 1], accuracy, status))
+            i, j = i - 1, j - 1
+        elif i > 0 and np.isclose(cost[i, j], cost[i - 1, j] + 1):
+            aligned.append(_word_entry(target_words[i - 1], None, 0.0, 'missing'))
+            i -= 1
+        else:
+            aligned.append(_word_entry(None, words[j - 1], 0.0, 'extra'))
+            j -= 1
+
+    aligned.reverse()
+    return aligned
+
+
+def _word_entry(target: Optional[str], word: Optional[Dict], accuracy: float, status: str) -> Dict:
+    return {
+        'target': target,
+        'recognized': word.get('word') if word else None,
+        'status': status,
+        'accuracy': accuracy,
+        'confidence': word.get('conf') if word else None,
+        'start': word.get('start') if word else None,
+        'end': word.get('end') if word else None,
+    }
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📊 PRONUNCIATION SCORE
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def score_pronunciation(
+    recognized: str,
+    target: str,
+    confidence: float,
+    words: Optional[List[Dict]] = None,
+    accuracy: Optional[float] = None,
+    min_accuracy: float = 0.0
+) -> Dict:
+    """
+    ✅ Score a recognition against its target
+
+    Args:
+        recognized / target: normalized (lowercase, stripped) text
+        confidence: average Vosk word confidence (0-1)
+        words: Vosk word results, used for multi-word targets
+        accuracy: precomputed character accuracy (e.g. from `score_batch`)
+        min_accuracy: scoring floor; character accuracy below it is 0
+
+    Returns:
+        Dict with accuracy, fluency, completeness and (multi-word only)
+        per-word alignment under `words`
+    """
+    if accuracy is None:
+        accuracy = char_accuracy(recognized, target, min_accuracy)
+
+    alignment = None
+    if len(target.split()) > 1 and words:
+        alignment = align_words(words, target, min_accuracy)
+        expected = [w for w in alignment if w['target'] is not None]
+        matched = sum(1 for w in expected if w['status'] == 'correct')
+        completeness = round(100 * matched / len(expected), 2)
+    else:
+        completeness = 100.0 if recognized == target else accuracy
+
+    return {
+        'accuracy': accuracy,
+        'fluency': confidence * 100,
+        'completeness': completeness,
+        'words': alignment,
+    }
@@ -0,0 +1,250 @@
+import io
+import os
+import time
+import queue
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+import certifi
+import urllib3
+from minio import Minio
+from loguru import logger
+
+from core.manifest import ManifestJournal
+from core.metrics import UPLOAD_BACKLOG, UPLOADS, time_stage
+
+
+class _UploadJob(NamedTuple):
+    object_name: str
+    data: bytes
+    content_type: str
+    on_done: Optional[Callable[[bool], None]] = None
+
+
+class UploadQueue:
+    """
+    ✅ Background uploads to MinIO
+
+    Requests enqueue the bytes and get the final object URL back at once;
+    a few worker threads upload in the background with their own MinIO
+    client (connection pool sized to the workers, short timeouts) and
+    retry failures with exponential backoff.
+
+    The backlog is bounded by RECORDING_UPLOAD_BACKLOG: when it is full,
+    `submit` refuses the job instead of blocking the request. `close`
+    flushes what is queued (call it on shutdown).
+
+    Workers and the client are created lazily in the process that first
+    submits, so a gunicorn master can create the queue before forking.
+
+    With `journal_prefix`, finished uploads are recorded in a storage
+    journal so the compaction job can expire them without listing.
+
+    `name` labels the queue's metrics and threads; `service` and `stage`
+    label its upload timings (the defaults are the recordings queue).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        workers: Optional[int] = None,
+        max_backlog: Optional[int] = None,
+        retries: Optional[int] = None,
+        journal_prefix: Optional[str] = None,
+        name: str = 'recording',
+        service: str = 'stt',
+        stage: str = 'upload'
+    ):
+        self.bucket = bucket
+        self.name = name
+        self.service = service
+        self.stage = stage
+        self.journal_prefix = journal_prefix
+        self.endpoint = os.getenv("MINIO_ENDPOINT", "localhost:9000")
+        self.secure = os.getenv("MINIO_SECURE", "false").lower() == "true"
+        self.workers = workers or int(os.getenv('RECORDING_UPLOAD_WORKERS', 4))
+        self.max_backlog = max_backlog or int(os.getenv('RECORDING_UPLOAD_BACKLOG', 500))
+        self.retries = retries if retries is not None else int(os.getenv('RECORDING_UPLOAD_RETRIES', 3))
+
+        self.client: Optional[Minio] = None
+        self.journal: Optional[ManifestJournal] = None
+        self._queue: 'queue.Queue[Optional[_UploadJob]]' = queue.Queue(maxsize=self.max_backlog)
+        self._threads = []
+        self._pid = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self.uploaded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔧 LIFECYCLE
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _build_client(self) -> Minio:
+        http_client = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=self.workers,  # One connection per upload worker
+            block=True,
+            timeout=urllib3.Timeout(connect=5, read=30),
+            retries=urllib3.Retry(total=0),  # _upload owns the retry policy
+            cert_reqs='CERT_REQUIRED',
+            ca_certs=certifi.where()
+        )
+        return Minio(
+            self.endpoint,
+            access_key=os.getenv("MINIO_ACCESS_KEY", "minioadmin"),
+            secret_key=os.getenv("MINIO_SECRET_KEY", "minioadmin"),
+            secure=self.secure,
+            http_client=http_client
+        )
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            # Fresh state in a forked child: the parent's threads do not exist here
+            self._queue = queue.Queue(maxsize=self.max_backlog)
+            self.client = self._build_client()
+            if self.journal_prefix:
+                self.journal = ManifestJournal(self.client, self.bucket, self.journal_prefix)
+            self._threads = [
+                threading.Thread(target=self._worker, name=f'{self.name}-upload-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+            logger.info(f"📤 Started {self.name} upload queue ({self.workers} workers, backlog {self.max_backlog})")
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs and wait for queued uploads to finish.
+
+        Returns:
+            True if everything queued was uploaded (or failed) before `timeout`
+        """
+        timeout = timeout if timeout is not None else float(os.getenv('RECORDING_UPLOAD_FLUSH_TIMEOUT', 30))
+        self._closed = True
+        if self._pid != os.getpid():
+            return True
+
+        pending = self._queue.qsize()
+        if pending:
+            logger.info(f"📤 Flushing {pending} pending {self.name} uploads...")
+
+        deadline = time.monotonic() + timeout
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        flushed = not any(thread.is_alive() for thread in self._threads)
+        if self.journal:
+            self.journal.flush()
+        if not flushed:
+            logger.warning(f"⚠️ Upload flush timed out, {self._queue.qsize()} {self.name} uploads not done")
+        return flushed
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📤 UPLOADS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def submit(
+        self,
+        object_name: str,
+        data: bytes,
+        content_type: str = 'application/octet-stream',
+        on_done: Optional[Callable[[bool], None]] = None
+    ) -> Optional[str]:
+        """
+        Queue an upload without blocking.
+
+        `on_done(ok)` is called from the worker once the upload succeeded
+        or gave up retrying (not for a job that was refused).
+
+        Returns:
+            The URL the object will have, or None if the queue is closed or full
+        """
+        if self._closed:
+            logger.warning(f"⚠️ Upload queue closed, dropping {object_name}")
+            return None
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(_UploadJob(object_name, data, content_type, on_done))
+        except queue.Full:
+            self.rejected += 1
+            UPLOADS.labels(self.name, 'rejected').inc()
+            logger.warning(f"⚠️ Upload backlog full ({self.max_backlog}), not saving {object_name}")
+            return None
+
+        UPLOAD_BACKLOG.labels(self.name).inc()
+        return self.object_url(object_name)
+
+    def object_url(self, object_name: str) -> str:
+        scheme = "https" if self.secure else "http"
+        return f"{scheme}://{self.endpoint}/{self.bucket}/{object_name}"
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                ok = self._upload(job)
+            finally:
+                UPLOAD_BACKLOG.labels(self.name).dec()
+            if job.on_done is not None:
+                try:
+                    job.on_done(ok)
+                except Exception as e:
+                    logger.warning(f"⚠️ Upload callback for {job.object_name} failed: {str(e)}")
+
+    def _upload(self, job: _UploadJob) -> bool:
+        for attempt in range(self.retries + 1):
+            try:
+                with time_stage(self.service, self.stage):
+                    self.client.put_object(
+                        self.bucket,
+                        job.object_name,
+                        io.BytesIO(job.data),
+                        length=len(job.data),
+                        content_type=job.content_type
+                    )
+                self.uploaded += 1
+                if self.journal:
+                    self.journal.added(job.object_name, len(job.data))
+                UPLOADS.labels(self.name, 'retried' if attempt else 'ok').inc()
+                return True
+
+            except Exception as e:
+                if attempt == self.retries:
+                    self.failed += 1
+                    UPLOADS.labels(self.name, 'failed').inc()
+                    logger.error(f"❌ Upload of {job.object_name} failed after {attempt + 1} attempts: {str(e)}")
+                    return False
+
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"⚠️ Upload of {job.object_name} failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'backlog': self._queue.qsize(),
+            'max_backlog': self.max_backlog,
+            'uploaded': self.uploaded,
+            'failed': self.failed,
+            'rejected': self.rejected,
+        }
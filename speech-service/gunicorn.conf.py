@@ -0,0 +1,60 @@
+"""
+🚀 Production launch config
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master process and the startup Vosk
+models are loaded there, then N uvicorn workers are forked from it. Model
+pages are shared copy-on-write, so memory does not grow linearly with the
+worker count. Storage setup runs in each worker's lifespan.
+"""
+import gc
+import os
+import shutil
+import sys
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv('SPEECH_WORKERS', os.cpu_count() or 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+timeout = int(os.getenv('SPEECH_WORKER_TIMEOUT', 120))
+graceful_timeout = 30
+loglevel = 'info'
+
+# ✅ Load the model once in the master before forking workers
+preload_app = True
+
+# Each forked worker already is a separate process, so decoding runs on the
+# worker's threads instead of spawning a nested process pool per worker.
+os.environ.setdefault('STT_PROCESS_WORKERS', '0')
+
+# Workers share metrics through PROMETHEUS_MULTIPROC_DIR; start from an empty
+# directory so samples of a previous run are not aggregated into this one.
+# Runs before the app is preloaded, i.e. before any metric is written.
+_metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+if _metrics_dir:
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # Importing the app no longer loads models; do it here, before forking,
+    # so the workers' startup finds them loaded and shares their pages.
+    app_module = sys.modules.get('main')
+    if app_module:
+        app_module.vosk_service.preload()
+
+    # Move everything allocated during preload into a permanent generation so
+    # the GC never touches (and un-shares) those pages in the workers.
+    gc.freeze()
+    server.log.info("✅ Model preloaded, forking workers")
+
+
+def post_fork(server, worker):
+    app_module = sys.modules.get('main')
+    if app_module:
+        app_module.vosk_service.warm()
+
+
+def child_exit(server, worker):
+    from core.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,142 @@
+"""
+🧹 Storage compaction job
+
+Expires old TTS clips and user recordings from MinIO. Object ages come
+from the manifests (kept current by the journal the service writes), so
+a run needs no bucket listing; deletes go out in batches of up to 1000
+keys, rate limited so live traffic on the same MinIO is not starved.
+
+Usage (from speech-service/):
+    python -m jobs.compact_storage
+    python -m jobs.compact_storage --tts-days 60 --recordings-days 30 --rate 100
+    python -m jobs.compact_storage --dry-run --output report.json
+
+Schedule it with cron, e.g. nightly:
+    0 3 * * * cd /srv/speech-service && python -m jobs.compact_storage
+
+TTS clips still referenced by a vocab item are kept unless
+--include-referenced is given; the manifest records the references too,
+so only clips it shows as unreferenced are checked against the bucket. --full rebuilds the manifests from a
+listing first (after journals were lost, e.g. a worker crashed).
+"""
+import os
+import sys
+import json
+import argparse
+from typing import List
+from dotenv import load_dotenv
+from loguru import logger
+
+load_dotenv()
+
+from core.audio_cache import AudioCache
+from core.compaction import BulkDeleter, CompactionReport, compact
+from core.manifest import RECORDINGS_JOURNAL_PREFIX, RECORDINGS_MANIFEST, RECORDINGS_PREFIX, StorageManifest
+from speech_synthesis.tts_service import TTSService
+
+TARGETS = ('tts', 'recordings')
+
+
+def run(args: argparse.Namespace) -> int:
+    # The job only needs the client and TTS helpers, not a warm cache index
+    os.environ['TTS_CACHE_ENABLED'] = 'false'
+    tts_service = TTSService()
+    tts_service.start()
+
+    def deleter() -> BulkDeleter:
+        return BulkDeleter(
+            tts_service.minio_client,
+            tts_service.bucket,
+            batch_size=args.batch_size,
+            max_per_second=args.rate or None,
+            dry_run=args.dry_run
+        )
+
+    reports: List[CompactionReport] = []
+    try:
+        if 'tts' in args.only:
+            reports.append(tts_service.compact(
+                args.tts_days,
+                deleter(),
+                include_referenced=args.include_referenced,
+                full=args.full
+            ))
+
+        if 'recordings' in args.only:
+            manifest = StorageManifest(
+                tts_service.minio_client,
+                tts_service.bucket,
+                RECORDINGS_MANIFEST,
+                RECORDINGS_JOURNAL_PREFIX,
+                RECORDINGS_PREFIX
+            )
+            reports.append(compact(manifest, deleter(), args.recordings_days, full=args.full))
+
+    except KeyboardInterrupt:
+        # Deleted objects stay journaled; the next run reconciles them
+        logger.warning("⚠️ Interrupted - rerun to finish compaction")
+        return 130
+
+    # Drop deleted objects from this host's shared /audio disk cache, so
+    # workers stop serving them once their memory tier lets go
+    deleted_objects = [name for report in reports for name in report.deleted_objects]
+    if deleted_objects:
+        audio_cache = AudioCache(tts_service.minio_client, tts_service.bucket)
+        for object_name in deleted_objects:
+            audio_cache.invalidate(object_name)
+
+    reclaimed = sum(report.bytes_reclaimed for report in reports)
+    deleted = sum(report.deleted for report in reports)
+    failed = sum(report.failed for report in reports)
+    verb = "Would reclaim" if args.dry_run else "Reclaimed"
+    logger.success(f"✅ {verb} {reclaimed / 1024 / 1024:.1f} MiB from {deleted} objects ({failed} failed)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'reports': [report.to_dict() for report in reports],
+                'bytes_reclaimed': reclaimed,
+                'deleted': deleted,
+                'failed': failed,
+            }, f, indent=2)
+        logger.info(f"📝 Report written to {args.output}")
+
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expire old TTS clips and recordings from MinIO")
+    parser.add_argument(
+        '--only', type=lambda value: [v for v in value.split(',') if v], default=list(TARGETS),
+        help=f"Comma-separated subset of {','.join(TARGETS)}"
+    )
+    parser.add_argument(
+        '--tts-days', type=float,
+        default=float(os.getenv('TTS_RETENTION_DAYS', 30)),
+        help="Delete TTS clips older than this (default: TTS_RETENTION_DAYS or 30)"
+    )
+    parser.add_argument(
+        '--recordings-days', type=float,
+        default=float(os.getenv('RECORDING_RETENTION_DAYS', 90)),
+        help="Delete recordings older than this (default: RECORDING_RETENTION_DAYS or 90)"
+    )
+    parser.add_argument(
+        '--rate', type=float,
+        default=float(os.getenv('STORAGE_COMPACT_RATE', 500)),
+        help="Max deletes per second, 0 for unlimited (default: STORAGE_COMPACT_RATE or 500)"
+    )
+    parser.add_argument('--batch-size', type=int, default=1000, help="Keys per delete request (max 1000)")
+    parser.add_argument('--include-referenced', action='store_true', help="Also delete TTS clips vocab items use")
+    parser.add_argument('--full', action='store_true', help="Rebuild the manifests from a bucket listing first")
+    parser.add_argument('--dry-run', action='store_true', help="Report what would be deleted")
+    parser.add_argument('--output', metavar='FILE', help="Write the JSON report to FILE")
+    args = parser.parse_args()
+
+    unknown = set(args.only) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+🔥 TTS cache warm-up job
+
+Pre-generates TTS audio for a whole vocabulary export so request-time
+synthesis is always a cache hit.
+
+Usage (from speech-service/):
+    python -m jobs.warm_tts_cache vocab.json
+    python -m jobs.warm_tts_cache vocab.csv --concurrency 8
+
+The export is a JSON list (or {"vocabularies": [...]}) or a CSV with a
+header row. Each item needs `vocab_id`, `text` (or `word`) and optionally
+`lang` (defaults to --lang).
+
+Progress is checkpointed to `<export>.progress`, so an interrupted run
+picks up where it stopped.
+"""
+import os
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set
+from dotenv import load_dotenv
+from loguru import logger
+
+load_dotenv()
+
+from speech_synthesis.tts_service import TTSService
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📥 INPUT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def load_export(path: str, default_lang: str) -> List[Dict]:
+    """Read a JSON/CSV vocabulary export into a list of {vocab_id, text, lang}"""
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get('vocabularies') or rows.get('items') or []
+
+    items = []
+    for row in rows:
+        text = (row.get('text') or row.get('word') or '').strip()
+        if not text:
+            continue
+        items.append({
+            'vocab_id': int(row.get('vocab_id') or row.get('id') or 0),
+            'text': text,
+            'lang': (row.get('lang') or row.get('language') or default_lang).strip(),
+        })
+    return items
+
+
+def item_key(item: Dict, slow: bool, engine: Optional[str] = None) -> str:
+    """Stable checkpoint key for an item"""
+    source = f"{item['text']}_{item['lang']}_{slow}" + (f"_{engine}" if engine else "")
+    digest = hashlib.md5(source.encode()).hexdigest()
+    return f"{item['vocab_id']}:{item['lang']}:{digest}"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📌 CHECKPOINT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class Checkpoint:
+    """Append-only record of finished items, one key per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.done = {line.strip() for line in f if line.strip()}
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def mark(self, key: str) -> None:
+        with self._lock:
+            self._file.write(key + '\n')
+            self._file.flush()
+            self.done.add(key)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🚀 RUN
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def warm_item(tts_service: TTSService, item: Dict, slow: bool, engine: Optional[str]) -> str:
+    """
+    Generate one clip unless it already exists. Returns 'generated' or 'skipped'
+    A hit still records the vocab -> clip reference
+    """
+    result = tts_service.synthesize(
+        text=item['text'],
+        lang=item['lang'],
+        vocab_id=item['vocab_id'],
+        slow=slow,
+        engine=engine
+    )
+    return 'skipped' if result.get('cached') else 'generated'
+
+
+def run(args: argparse.Namespace) -> int:
+    items = load_export(args.export, args.lang)
+    checkpoint = Checkpoint(args.state or f"{args.export}.progress")
+
+    pending = [item for item in items if item_key(item, args.slow, args.engine) not in checkpoint.done]
+    logger.info(
+        f"📋 {len(items)} items in export, {len(items) - len(pending)} already done, "
+        f"{len(pending)} to process (concurrency={args.concurrency})"
+    )
+
+    tts_service = TTSService()
+    tts_service.start()
+    counts = {'generated': 0, 'skipped': 0, 'failed': 0}
+    started = time.monotonic()
+    last_report = started
+
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+    try:
+        futures = {
+            executor.submit(warm_item, tts_service, item, args.slow, args.engine): item
+            for item in pending
+        }
+
+        for processed, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            try:
+                counts[future.result()] += 1
+                checkpoint.mark(item_key(item, args.slow, args.engine))
+            except Exception as e:
+                counts['failed'] += 1
+                logger.error(f"❌ vocab {item['vocab_id']} '{item['text']}': {str(e)}")
+
+            now = time.monotonic()
+            if now - last_report >= args.report_every or processed == len(pending):
+                last_report = now
+                elapsed = now - started
+                rate = processed / elapsed if elapsed else 0.0
+                eta = (len(pending) - processed) / rate if rate else 0.0
+                logger.info(
+                    f"⏳ {processed}/{len(pending)} "
+                    f"(generated {counts['generated']}, skipped {counts['skipped']}, "
+                    f"failed {counts['failed']}) - {rate:.1f} items/s, ETA {eta:.0f}s"
+                )
+
+    except KeyboardInterrupt:
+        # Drop queued items; clips already uploaded are skipped on the next run
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("⚠️ Interrupted - rerun the same command to resume")
+        return 130
+
+    finally:
+        executor.shutdown(wait=True)
+        checkpoint.close()
+        tts_service.close()
+
+    # Let service instances warm their cache index from one object
+    if counts['generated']:
+        try:
+            tts_service.write_manifest()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write TTS manifest: {str(e)}")
+
+    elapsed = time.monotonic() - started
+    logger.success(
+        f"✅ Warm-up finished in {elapsed:.1f}s: generated {counts['generated']}, "
+        f"skipped {counts['skipped']}, failed {counts['failed']} "
+        f"({counts['generated'] / elapsed if elapsed else 0.0:.1f} clips/s)"
+    )
+    return 1 if counts['failed'] else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate TTS audio for a vocabulary export")
+    parser.add_argument('export', help="Path to JSON or CSV export (vocab_id, text, lang)")
+    parser.add_argument('--lang', default='en', help="Language for rows without one (default: en)")
+    parser.add_argument('--slow', action='store_true', help="Generate slow-speed audio")
+    parser.add_argument('--engine', help="TTS engine (default: TTS_ENGINE)")
+    parser.add_argument(
+        '--concurrency', type=int,
+        default=int(os.getenv('TTS_WARMUP_CONCURRENCY', 4)),
+        help="Parallel synthesis jobs (default: TTS_WARMUP_CONCURRENCY or 4)"
+    )
+    parser.add_argument('--state', help="Checkpoint file (default: <export>.progress)")
+    parser.add_argument('--report-every', type=float, default=5.0, help="Seconds between progress lines")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,54 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ValidationError, field_validator
+from typing import List, Optional, Tuple
+from urllib.parse import unquote
+from contextlib import asynccontextmanager, nullcontext
 import os
-import tempfile
+import json
+import asyncio
 import uuid
 import base64
+import time
 from loguru import logger
 from dotenv import load_dotenv
 
+from core.executor import WorkerPools
+from core.upload_queue import UploadQueue
+from core.manifest import RECORDINGS_JOURNAL_PREFIX, RECORDINGS_PREFIX
+from core.audio_cache import AudioCache, RangeNotSatisfiable, etag_matches, parse_range
+from core.readiness import Readiness
+from core.admission import AdmissionController, AdmissionRejected
+from core import metrics, profiling, scoring
 from speech_recognition.vosk_service import VoskService
+from speech_recognition.model_registry import UnsupportedLanguageError
+from speech_recognition import recognition_worker
+from speech_recognition.audio_decoder import StreamTranscoder
+from speech_recognition.stream_session import StreamingSession
 from speech_synthesis.tts_service import TTSService
 
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup work (model loading, bucket setup) runs in the background, so
+    the server accepts connections and answers /health/live at once;
+    /health/ready turns green when it is done
+    """
+    readiness.start(worker_pools.run_io)
+    yield
+    await readiness.stop()
+    worker_pools.shutdown()
+    upload_queue.close()
+    tts_service.close()
+
 app = FastAPI(
     title="English Learning Speech API",
     description="Speech Recognition & Text-to-Speech Service",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -30,9 +60,116 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """Count in-flight requests and observe latency per route template"""
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get('route')
+        metrics.REQUEST_SECONDS.labels(
+            request.method,
+            route.path if route else 'unmatched',
+            str(status)
+        ).observe(time.perf_counter() - start)
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """
+    Profile a request sent with `X-Profile: 1` by a client in PROFILE_ALLOWLIST:
+    per-stage wall/CPU times go into Server-Timing, sampled stacks into a
+    folded file under PROFILE_DIR (named by X-Profile-File)
+
+    Only the pool threads and processes doing this request's work are
+    sampled; the event loop is shared with every other request, so time
+    spent there shows up in the stage timings but not in the stacks
+    """
+    client = request.client.host if request.client else None
+    if request.headers.get(profiling.PROFILE_HEADER, '').lower() not in ('1', 'true') \
+            or not profiling.client_allowed(client):
+        return await call_next(request)
+
+    profile = profiling.Profile(f"{request.method} {request.url.path}")
+    with profile.running(include_caller=False):
+        response = await call_next(request)
+
+    response.headers['Server-Timing'] = profile.server_timing()
+    try:
+        path = await worker_pools.run_io(profile.write)
+        response.headers['X-Profile-File'] = os.path.basename(path)
+    except OSError as e:
+        logger.warning(f"⚠️ Failed to write request profile: {str(e)}")
+    return response
+
+# Initialize services (no model loading or network I/O at import time)
 vosk_service = VoskService()
 tts_service = TTSService()
+recognition_worker.bind_service(vosk_service)
+
+# Longest audio accepted on a single /stt/stream connection
+STREAM_MAX_SECONDS = int(os.getenv("STT_STREAM_MAX_SECONDS", 30))
+
+# Most clips accepted by /stt/recognize-batch in one request
+BATCH_MAX_ITEMS = int(os.getenv("STT_BATCH_MAX_ITEMS", 50))
+
+# Opt-in scoring floor: character accuracy below this is reported as 0,
+# which lets the edit distance stop early (0 = exact scores)
+MIN_CHAR_ACCURACY = float(os.getenv("STT_MIN_CHAR_ACCURACY", 0))
+
+# Largest raw body accepted by /stt/recognize-binary
+BINARY_MAX_BYTES = int(float(os.getenv("STT_BINARY_MAX_MB", 10)) * 1024 * 1024)
+
+# Body types accepted by /stt/recognize-binary, with the extension a saved recording gets
+BINARY_AUDIO_TYPES = {
+    "application/octet-stream": "wav",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+    "audio/wave": "wav",
+    "audio/webm": "webm",
+    "audio/ogg": "ogg",
+    "audio/opus": "opus",
+    "audio/mpeg": "mp3",
+    "audio/mp4": "m4a",
+    "audio/aac": "aac",
+}
+
+# Blocking work runs in worker pools so the event loop stays responsive
+worker_pools = WorkerPools()
+worker_pools.set_cpu_initializer(recognition_worker.init_worker)
+
+# User recordings are uploaded in the background, off the scoring path
+upload_queue = UploadQueue(tts_service.bucket, journal_prefix=RECORDINGS_JOURNAL_PREFIX)
+
+# Hot audio is served from local memory/disk instead of MinIO (GET /audio/...)
+audio_cache = AudioCache(tts_service.minio_client, tts_service.bucket)
+AUDIO_SERVE_PREFIXES = tuple(p for p in os.getenv("AUDIO_SERVE_PREFIXES", "tts/audio/").split(",") if p)
+AUDIO_CACHE_MAX_AGE = int(os.getenv("AUDIO_CACHE_MAX_AGE", 86400))
+
+# Bounded queues in front of decoding / synthesis; overflow fails fast
+# with 429/503 + Retry-After instead of piling up until clients time out
+stt_admission = AdmissionController('stt')
+tts_admission = AdmissionController('tts')
+# Streams hold a recognizer for their whole length (up to STT_STREAM_MAX_SECONDS),
+# so they get their own slots instead of starving short recognitions
+stream_admission = AdmissionController('stream')
+
+def load_speech_models():
+    """Load the models, then start the CPU pool so its workers inherit them"""
+    vosk_service.preload()
+    worker_pools.start_cpu_pool()
+
+# Ready once the startup models are loaded and the bucket is usable;
+# probes read cached results instead of calling MinIO
+readiness = Readiness()
+readiness.add_startup('speech_models', load_speech_models)
+readiness.add_startup('storage', tts_service.start)
+readiness.add_check('minio', tts_service.check_minio_connection)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ✅ REQUEST/RESPONSE MODELS
@@ -43,6 +180,7 @@ class TTSGenerateRequest(BaseModel):
     lang: str = "en"
     vocab_id: int
     slow: bool = False
+    engine: Optional[str] = None  # TTS backend (default: TTS_ENGINE), see /tts/voices
 
 class STTRecognizeBase64Request(BaseModel):
     audio_base64: str
@@ -50,11 +188,24 @@ class STTRecognizeBase64Request(BaseModel):
     user_id: int
     vocab_id: int
     save_recording: bool = False
+    use_grammar: bool = False  # Constrain decoding to target word + distractors
+    distractors: Optional[List[str]] = None
+    lang: Optional[str] = None  # Speech model language (default: STT_DEFAULT_LANG)
+
+class WordScore(BaseModel):
+    target: Optional[str] = None      # None for extra (inserted) words
+    recognized: Optional[str] = None  # None for missing words
+    status: str                       # correct | mispronounced | missing | extra
+    accuracy: float
+    confidence: Optional[float] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
 
 class PronunciationScore(BaseModel):
     accuracy: float
     fluency: float
     completeness: float
+    words: Optional[List[WordScore]] = None  # Word alignment for multi-word targets
 
 class STTRecognizeResponse(BaseModel):
     recognized_text: str
@@ -62,12 +213,55 @@ class STTRecognizeResponse(BaseModel):
     is_correct: bool
     confidence: float
     accuracy: float
+    speech_duration: Optional[float] = None  # Seconds of detected speech (VAD)
+    model: Optional[str] = None  # Speech model used, e.g. "en:small"
     pronunciation_score: Optional[PronunciationScore] = None
     audio_url: Optional[str] = None
 
+class STTBatchItem(BaseModel):
+    audio_base64: str
+    target_word: str
+    vocab_id: int
+    use_grammar: bool = False
+    distractors: Optional[List[str]] = None
+    lang: Optional[str] = None
+
+class STTRecognizeBinaryParams(BaseModel):
+    """Fields of /stt/recognize-binary, from the query string or X- headers"""
+    target_word: str
+    user_id: int
+    vocab_id: int
+    save_recording: bool = False
+    use_grammar: bool = False
+    distractors: Optional[List[str]] = None  # Comma-separated in the query / header
+    lang: Optional[str] = None
+
+    @field_validator('distractors', mode='before')
+    @classmethod
+    def split_distractors(cls, value):
+        if isinstance(value, str):
+            return [word.strip() for word in value.split(',') if word.strip()]
+        return value
+
+class STTRecognizeBatchRequest(BaseModel):
+    user_id: int
+    items: List[STTBatchItem]
+    save_recording: bool = False
+
+class STTBatchItemResult(BaseModel):
+    index: int
+    vocab_id: int
+    success: bool
+    result: Optional[STTRecognizeResponse] = None
+    error: Optional[str] = None
+
+class STTRecognizeBatchResponse(BaseModel):
+    results: List[STTBatchItemResult]
+
 class TTSGenerateResponse(BaseModel):
     audio_url: str
     duration: Optional[float] = None
+    size: Optional[int] = None
     cached: bool = False
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -81,19 +275,61 @@ def root():
         "endpoints": {
             "tts": "POST /tts/generate - Generate TTS audio",
             "stt": "POST /stt/recognize-base64 - Recognize speech from base64",
-            "health": "GET /health - Health check"
+            "stt_binary": "POST /stt/recognize-binary - Recognize speech from a raw audio body",
+            "stt_stream": "WS /stt/stream - Streaming recognition with partial results",
+            "stt_batch": "POST /stt/recognize-batch - Recognize many clips in one request",
+            "audio": "GET /audio/{object} - Cached audio with ETag and Range support",
+            "health": "GET /health - Health check",
+            "live": "GET /health/live - Liveness probe",
+            "ready": "GET /health/ready - Readiness probe (503 until started)",
+            "metrics": "GET /metrics - Prometheus metrics"
         }
     }
 
 @app.get("/health")
 def health_check():
     return {
-        "status": "healthy",
+        "status": "healthy" if readiness.is_ready() else "not_ready",
         "vosk_model_loaded": vosk_service.is_ready(),
+        "speech_models": vosk_service.registry.stats(),
         "tts_service": "ready",
-        "minio_connected": tts_service.check_minio_connection()
+        "minio_connected": readiness.check_ok('minio'),
+        "readiness": readiness.status(),
+        "worker_pools": worker_pools.stats(),
+        "upload_queue": upload_queue.stats(),
+        "audio_cache": audio_cache.stats(),
+        "admission": {
+            "stt": stt_admission.stats(),
+            "tts": tts_admission.stats(),
+            "stream": stream_admission.stats()
+        }
     }
 
+@app.get("/health/live")
+def liveness():
+    """
+    ✅ Liveness probe: the process serves requests
+    Does not depend on models or MinIO, so slow startup never restarts the container
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness_probe():
+    """
+    ✅ Readiness probe: 200 once startup finished and MinIO answers, 503 otherwise
+    Reads cached status (refreshed every HEALTH_CHECK_INTERVAL seconds)
+    """
+    status = readiness.status()
+    return JSONResponse(status_code=200 if status['ready'] else 503, content=status)
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """
+    ✅ Prometheus metrics (stage latencies, TTS cache, pools, in-flight)
+    """
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ✅ TTS ENDPOINTS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -110,38 +346,46 @@ async def generate_tts(request: TTSGenerateRequest):
 
         logger.info(f"🔊 Generating TTS for vocab {request.vocab_id}: '{request.text}'")
 
-        result = tts_service.synthesize(
-            text=request.text,
-            lang=request.lang,
-            vocab_id=request.vocab_id,
-            slow=request.slow
-        )
+        # Cache hits are cheap and skip the admission queue
+        cached = tts_service.is_cached(request.text, request.lang, request.slow, request.engine)
+        async with nullcontext() if cached else tts_admission.admit():
+            result = await worker_pools.run_io(
+                tts_service.synthesize,
+                request.text,
+                request.lang,
+                request.vocab_id,
+                request.slow,
+                request.engine
+            )
 
         return TTSGenerateResponse(
             audio_url=result['audio_url'],
             duration=result.get('duration'),
+            size=result.get('size'),
             cached=result.get('cached', False)
         )
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Unknown engine or no voice for the language
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ TTS generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
 
 @app.get("/tts/voices")
-async def get_voices(language: Optional[str] = None):
+async def get_voices(language: Optional[str] = None, engine: Optional[str] = None):
     """
-    ✅ Get available TTS voices
+    ✅ Get available TTS voices from the active engines
+    Pass a voice's `code` as `lang` and its `engine` as `engine` to /tts/generate
     """
-    # For gTTS, voices are language-based
-    voices = [
-        {"code": "en", "name": "English (US)", "language": "en"},
-        {"code": "vi", "name": "Vietnamese", "language": "vi"},
-    ]
-
-    if language:
-        voices = [v for v in voices if v['language'] == language]
+    try:
+        voices = await worker_pools.run_io(tts_service.list_voices, language, engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"voices": voices}
+    return {"voices": voices, "default_engine": tts_service.default_engine}
 
 @app.delete("/tts/audio/{vocab_id}")
 async def delete_audio(vocab_id: int, language: str = "en"):
@@ -149,12 +393,74 @@ async def delete_audio(vocab_id: int, language: str = "en"):
     ✅ Delete audio file from MinIO
     """
     try:
-        result = tts_service.delete_audio(vocab_id, language)
-        return {"message": "Audio deleted successfully", "deleted": result}
+        deleted = await worker_pools.run_io(tts_service.delete_audio, vocab_id, language)
+        # Stop serving deleted clips from the /audio cache tiers
+        for object_name in deleted:
+            await worker_pools.run_io(audio_cache.invalidate, object_name)
+        return {"message": "Audio deleted successfully", "deleted": bool(deleted)}
     except Exception as e:
         logger.warning(f"⚠️ Delete audio failed: {str(e)}")
         return {"message": "Audio deletion failed", "error": str(e)}
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ✅ AUDIO SERVING
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@app.api_route("/audio/{object_name:path}", methods=["GET", "HEAD"])
+async def serve_audio(object_name: str, request: Request):
+    """
+    ✅ Serve audio from MinIO through a local read-through cache
+    - Strong ETag + If-None-Match → 304
+    - Range requests → 206 (or 416 when out of bounds)
+    - TTS clips are content-addressed, so they are cached as immutable
+    """
+    if ".." in object_name.split("/") or not object_name.startswith(AUDIO_SERVE_PREFIXES):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    audio = audio_cache.get_memory(object_name)
+    if audio is None:
+        try:
+            audio = await worker_pools.run_io(audio_cache.get, object_name)
+        except Exception as e:
+            logger.error(f"❌ Audio fetch failed for {object_name}: {str(e)}")
+            raise HTTPException(status_code=502, detail="Audio storage unavailable")
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    if object_name.startswith("tts/audio/"):
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = f"public, max-age={AUDIO_CACHE_MAX_AGE}"
+    headers = {
+        "ETag": audio.etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), audio.etag):
+        return Response(status_code=304, headers=headers)
+
+    # If-Range: only honour the range if the client's copy is still current
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == audio.etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), audio.size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{audio.size}"
+            return Response(status_code=416, headers=headers)
+
+    status_code, body = 200, audio.data
+    if byte_range is not None:
+        start, end = byte_range
+        status_code, body = 206, audio.data[start:end + 1]
+        headers["Content-Range"] = f"bytes {start}-{end}/{audio.size}"
+
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(content=body, status_code=status_code, headers=headers, media_type=audio.content_type)
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ✅ STT ENDPOINTS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -168,160 +474,512 @@ async def recognize_speech_base64(request: STTRecognizeBase64Request):
     try:
         logger.info(f"🎤 Recognizing speech for vocab {request.vocab_id}, target: '{request.target_word}'")
 
-        # Decode base64 to file
-        audio_data = base64.b64decode(request.audio_base64)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-            tmp_file.write(audio_data)
-            tmp_path = tmp_file.name
-
-        # Recognize speech
-        result = vosk_service.recognize(tmp_path)
-        recognized_text = result['text'].strip().lower()
-        target_word = request.target_word.strip().lower()
-
-        # Compare with target word
-        is_correct = recognized_text == target_word
-        confidence = result.get('confidence', 0.0)
-
-        # Calculate pronunciation score
-        accuracy = calculate_pronunciation_accuracy(recognized_text, target_word)
-        pronunciation_score = PronunciationScore(
-            accuracy=accuracy,
-            fluency=confidence * 100,
-            completeness=100 if is_correct else accuracy
+        # Decode base64 (audio stays in memory end to end)
+        with metrics.time_stage('stt', 'base64_decode'):
+            audio_data = base64.b64decode(request.audio_base64)
+
+        # Recognize speech (optionally constrained to the target word)
+        result = await recognize_audio(
+            audio_data,
+            use_grammar=request.use_grammar,
+            target_word=request.target_word,
+            vocab_id=request.vocab_id,
+            distractors=request.distractors,
+            lang=request.lang,
+            user_id=request.user_id
         )
 
         # Optionally save recording
         audio_url = None
         if request.save_recording:
-            audio_url = save_user_recording(
-                tmp_path,
-                request.user_id,
-                request.vocab_id
-            )
+            audio_url = save_user_recording(audio_data, request.user_id, request.vocab_id)
+
+        return build_recognize_response(result, request.target_word, audio_url)
+
+    except HTTPException:
+        raise
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"❌ Speech recognition failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"STT failed: {str(e)}")
 
-        # Cleanup
+@app.post("/stt/recognize-batch", response_model=STTRecognizeBatchResponse)
+async def recognize_speech_batch(request: STTRecognizeBatchRequest):
+    """
+    ✅ Recognize many clips in one request
+    Items are decoded in parallel; results keep the request order and a
+    failing item does not fail the others
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch cannot be empty")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {BATCH_MAX_ITEMS})"
+        )
+
+    logger.info(f"🎤 Recognizing batch of {len(request.items)} clips for user {request.user_id}")
+
+    # Keep the batch within the per-user queue cap of the STT admission queue
+    batch_slots = asyncio.Semaphore(stt_admission.per_user or len(request.items))
+
+    async def recognize_item(index: int, item: STTBatchItem) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Decode one clip. Returns (result, audio_url, error)"""
         try:
-            os.unlink(tmp_path)
-        except:
-            pass
+            with metrics.time_stage('stt', 'base64_decode'):
+                audio_data = base64.b64decode(item.audio_base64)
+
+            async with batch_slots:
+                result = await recognize_audio(
+                    audio_data,
+                    use_grammar=item.use_grammar,
+                    target_word=item.target_word,
+                    vocab_id=item.vocab_id,
+                    distractors=item.distractors,
+                    lang=item.lang,
+                    user_id=request.user_id
+                )
+
+            if result.get('error'):
+                raise RuntimeError(result['error'])
+
+            audio_url = None
+            if request.save_recording:
+                audio_url = save_user_recording(audio_data, request.user_id, item.vocab_id)
+
+            return result, audio_url, None
+
+        except Exception as e:
+            logger.warning(f"⚠️ Batch item {index} (vocab {item.vocab_id}) failed: {str(e)}")
+            return None, None, str(e)
+
+    recognized = await asyncio.gather(
+        *(recognize_item(index, item) for index, item in enumerate(request.items))
+    )
+
+    # Score every successful item in one vectorized pass
+    scored = [
+        index for index, (result, _, _) in enumerate(recognized) if result is not None
+    ]
+    with metrics.time_stage('stt', 'score'):
+        accuracies = scoring.score_batch([
+            (
+                recognized[index][0]['text'].strip().lower(),
+                request.items[index].target_word.strip().lower()
+            )
+            for index in scored
+        ], min_accuracy=MIN_CHAR_ACCURACY)
+    accuracy_by_index = dict(zip(scored, accuracies))
+
+    results = []
+    for index, (item, (result, audio_url, error)) in enumerate(zip(request.items, recognized)):
+        if result is None:
+            results.append(STTBatchItemResult(
+                index=index,
+                vocab_id=item.vocab_id,
+                success=False,
+                error=error
+            ))
+            continue
+
+        results.append(STTBatchItemResult(
+            index=index,
+            vocab_id=item.vocab_id,
+            success=True,
+            result=build_recognize_response(
+                result,
+                item.target_word,
+                audio_url,
+                accuracy=accuracy_by_index[index]
+            )
+        ))
 
-        logger.info(f"✅ Recognized: '{recognized_text}' (correct: {is_correct}, confidence: {confidence:.2f})")
+    return STTRecognizeBatchResponse(results=list(results))
 
-        return STTRecognizeResponse(
-            recognized_text=recognized_text,
-            target_word=target_word,
-            is_correct=is_correct,
-            confidence=confidence,
-            accuracy=accuracy,
-            pronunciation_score=pronunciation_score,
-            audio_url=audio_url
+@app.post("/stt/recognize-binary", response_model=STTRecognizeResponse)
+async def recognize_speech_binary(request: Request):
+    """
+    ✅ Recognize speech from a raw audio body (no base64, no JSON)
+    Body: the clip as recorded (WAV, WebM/Opus, OGG, MP3, ...) with
+          Content-Type application/octet-stream or audio/*
+    Fields: target_word, user_id, vocab_id, save_recording, use_grammar,
+            distractors (comma-separated), lang - as query parameters or
+            X- headers (X-Target-Word, X-User-Id, ...; percent-encode
+            non-ASCII header values)
+    The body is read as it arrives and refused with 413 past STT_BINARY_MAX_MB
+    """
+    content_type = request.headers.get('content-type', 'application/octet-stream').split(';')[0].strip().lower()
+    if content_type not in BINARY_AUDIO_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported Content-Type '{content_type}' (use application/octet-stream or audio/*)"
         )
 
+    try:
+        params = STTRecognizeBinaryParams(**binary_request_fields(request, STTRecognizeBinaryParams.model_fields))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json(include_url=False)))
+
+    audio_data = await read_body_capped(request, BINARY_MAX_BYTES)
+    if not audio_data:
+        raise HTTPException(status_code=400, detail="Audio body cannot be empty")
+
+    try:
+        logger.info(
+            f"🎤 Recognizing {len(audio_data)} bytes of {content_type} for vocab {params.vocab_id}, "
+            f"target: '{params.target_word}'"
+        )
+
+        result = await recognize_audio(
+            audio_data,
+            use_grammar=params.use_grammar,
+            target_word=params.target_word,
+            vocab_id=params.vocab_id,
+            distractors=params.distractors,
+            lang=params.lang,
+            user_id=params.user_id
+        )
+
+        audio_url = None
+        if params.save_recording:
+            audio_url = save_user_recording(
+                audio_data,
+                params.user_id,
+                params.vocab_id,
+                extension=BINARY_AUDIO_TYPES[content_type],
+                content_type="audio/wav" if content_type == "application/octet-stream" else content_type
+            )
+
+        return build_recognize_response(result, params.target_word, audio_url)
+
+    except HTTPException:
+        raise
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         logger.error(f"❌ Speech recognition failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"STT failed: {str(e)}")
 
 @app.post("/stt/recognize")
-async def recognize_speech_file(file: UploadFile = File(...)):
+async def recognize_speech_file(file: UploadFile = File(...), lang: Optional[str] = None):
     """
     ✅ Recognize speech from uploaded audio file
+    Free speech (no target word) is decoded with the language's large model
     """
     try:
-        suffix = os.path.splitext(file.filename)[1] or '.wav'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-
-        result = vosk_service.recognize(tmp_path)
+        content = await file.read()
 
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+        result = await recognize_audio(content, lang=lang)
 
         return {
             "recognized_text": result['text'],
             "confidence": result.get('confidence'),
+            "speech_duration": result.get('speech_duration'),
+            "model": result.get('model'),
             "success": True
         }
 
+    except HTTPException:
+        raise
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         logger.error(f"❌ STT Error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"STT failed: {str(e)}")
 
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# ✅ HELPER FUNCTIONS
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-def calculate_pronunciation_accuracy(recognized: str, target: str) -> float:
+@app.websocket("/stt/stream")
+async def recognize_speech_stream(
+    websocket: WebSocket,
+    target_word: str,
+    user_id: int,
+    vocab_id: int,
+    format: str = "pcm",
+    sample_rate: int = 16000,
+    use_grammar: bool = False,
+    lang: Optional[str] = None
+):
     """
-    Calculate pronunciation accuracy using Levenshtein distance
+    ✅ Streaming speech recognition over WebSocket
+
+    Query: target_word, user_id, vocab_id, format (pcm | webm | ogg),
+           sample_rate (for pcm), use_grammar, lang
+    Client → server: binary audio frames as captured, then {"event": "end"}
+    Server → client: {"type": "partial" | "result", "text": ...} while decoding,
+                     then {"type": "final", "result": <STTRecognizeResponse>}
     """
-    if recognized == target:
-        return 100.0
+    await websocket.accept()
 
-    # Simple character-level comparison
-    max_len = max(len(recognized), len(target))
-    if max_len == 0:
-        return 0.0
+    # A stream holds a recognizer and decodes for its whole length, so it
+    # takes a slot of the separate stream class for that long
+    try:
+        async with stream_admission.admit(user_id):
+            logger.info(f"🎙️ Stream opened for vocab {vocab_id}, target: '{target_word}' ({format})")
+            await stream_recognition(
+                websocket, target_word, vocab_id, format, sample_rate, use_grammar, lang
+            )
+    except AdmissionRejected as e:
+        # 1013 = try again later; the reason carries the Retry-After hint
+        try:
+            await websocket.send_json({"type": "error", "detail": e.detail, "retry_after": e.retry_after})
+            await websocket.close(code=1013, reason=f"retry after {e.retry_after}s")
+        except Exception:
+            pass
 
-    # Calculate Levenshtein distance
-    distance = levenshtein_distance(recognized, target)
-    accuracy = max(0, 100 * (1 - distance / max_len))
+async def stream_recognition(
+    websocket: WebSocket,
+    target_word: str,
+    vocab_id: int,
+    format: str,
+    sample_rate: int,
+    use_grammar: bool,
+    lang: Optional[str]
+):
+    """Decode one accepted /stt/stream connection until the client ends it"""
+    session = None
+    transcoder = None
+    tasks = []
+    disconnected = False
+    pcm_queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+    max_bytes = STREAM_MAX_SECONDS * 2 * vosk_service.sample_rate
+
+    async def receive_audio():
+        nonlocal disconnected
+        try:
+            while True:
+                message = await websocket.receive()
+                if message['type'] == 'websocket.disconnect':
+                    disconnected = True
+                    break
+                if message.get('bytes'):
+                    if transcoder:
+                        await transcoder.write(message['bytes'])
+                    else:
+                        await pcm_queue.put(message['bytes'])
+                elif message.get('text'):
+                    if json.loads(message['text']).get('event') == 'end':
+                        break
+        finally:
+            if transcoder:
+                await transcoder.end_input()
+            else:
+                await pcm_queue.put(None)
+
+    async def pump_transcoder():
+        while True:
+            chunk = await transcoder.read()
+            if not chunk:
+                break
+            await pcm_queue.put(chunk)
+        await pcm_queue.put(None)
 
-    return round(accuracy, 2)
+    try:
+        # May load the routed model on first use, so it runs off the event loop
+        session = await worker_pools.run_io(
+            StreamingSession,
+            vosk_service,
+            lang=lang,
+            target_word=target_word,
+            use_grammar=use_grammar,
+            vocab_id=vocab_id
+        )
 
-def levenshtein_distance(s1: str, s2: str) -> int:
-    """
-    Calculate Levenshtein distance between two strings
-    """
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+        # Raw PCM at the model rate goes straight to the recognizer
+        if format != 'pcm' or sample_rate != vosk_service.sample_rate:
+            transcoder = StreamTranscoder(format, vosk_service.sample_rate, sample_rate)
+            await transcoder.start()
+            tasks.append(asyncio.create_task(pump_transcoder()))
+        tasks.append(asyncio.create_task(receive_audio()))
+
+        while True:
+            chunk = await pcm_queue.get()
+            if chunk is None:
+                break
+            if session.bytes_received + len(chunk) > max_bytes:
+                raise ValueError(f"Stream exceeds {STREAM_MAX_SECONDS}s limit")
+
+            with metrics.time_stage('stt', 'stream_decode'):
+                update = await worker_pools.run_io(session.accept, chunk)
+            if update:
+                await websocket.send_json(update)
+
+        if disconnected:
+            logger.info(f"🔌 Stream closed by client for vocab {vocab_id}")
+            return
+
+        result = await worker_pools.run_io(session.finish)
+        response = build_recognize_response(result, target_word)
+        await websocket.send_json({"type": "final", "result": response.model_dump()})
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info(f"🔌 Stream disconnected for vocab {vocab_id}")
 
-    if len(s2) == 0:
-        return len(s1)
+    except Exception as e:
+        logger.error(f"❌ Streaming STT failed: {str(e)}")
+        if session:
+            session.close(reusable=False)
+        try:
+            await websocket.send_json({"type": "error", "detail": f"STT failed: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
 
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+    finally:
+        for task in tasks:
+            task.cancel()
+        if transcoder:
+            await transcoder.close()
+        if session:
+            session.close()
 
-    return previous_row[-1]
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ✅ HELPER FUNCTIONS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def save_user_recording(file_path: str, user_id: int, vocab_id: int) -> str:
+async def recognize_audio(
+    audio_data: bytes,
+    use_grammar: bool = False,
+    target_word: Optional[str] = None,
+    vocab_id: int = 0,
+    distractors: Optional[List[str]] = None,
+    lang: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> dict:
     """
-    Save user recording to MinIO
+    Decode a clip on the CPU pool (optionally constrained to the target word)
+    and record the worker's stage timings. The target word and language
+    pick the speech model; an unknown language raises UnsupportedLanguageError.
+    Waits for an STT admission slot first (AdmissionRejected when overloaded,
+    or before the models and CPU pool are up)
     """
-    try:
-        object_name = f"recordings/user_{user_id}/vocab_{vocab_id}_{uuid.uuid4().hex}.wav"
-        tts_service.minio_client.fput_object(
-            tts_service.bucket,
-            object_name,
-            file_path,
-            content_type="audio/wav"
+    vosk_service.check_language(lang)
+    if not readiness.started('speech_models'):
+        raise AdmissionRejected(503, "Speech models are still loading", retry_after=5)
+    request_profile = profiling.current()
+
+    async with stt_admission.admit(user_id):
+        result = await worker_pools.run_cpu(
+            recognition_worker.recognize_bytes,
+            audio_data,
+            target_word=target_word,
+            vocab_id=vocab_id,
+            distractors=distractors,
+            use_grammar=use_grammar,
+            lang=lang,
+            # Pool processes can't see this request's profile; they send theirs back
+            profile=request_profile is not None and worker_pools.process_workers > 0
         )
 
-        scheme = "https" if os.getenv("MINIO_SECURE", "false").lower() == "true" else "http"
-        endpoint = os.getenv("MINIO_ENDPOINT", "localhost:9000")
-        return f"{scheme}://{endpoint}/{tts_service.bucket}/{object_name}"
+    worker_profile = result.pop('profile', None)
+    if worker_profile:
+        request_profile.merge(worker_profile)
+    metrics.observe_timings('stt', result.pop('timings', None))
+    return result
+
+def build_recognize_response(
+    result: dict,
+    target_word: str,
+    audio_url: Optional[str] = None,
+    accuracy: Optional[float] = None
+) -> STTRecognizeResponse:
+    """
+    Score a recognition result against the target word
+    (`accuracy` may be precomputed, e.g. by scoring.score_batch)
+    """
+    recognized_text = result['text'].strip().lower()
+    target_word = target_word.strip().lower()
+
+    # Compare with target word
+    is_correct = recognized_text == target_word
+    confidence = result.get('confidence', 0.0)
+
+    # Calculate pronunciation score
+    with metrics.time_stage('stt', 'score'):
+        score = scoring.score_pronunciation(
+            recognized_text,
+            target_word,
+            confidence,
+            words=result.get('words'),
+            accuracy=accuracy,
+            min_accuracy=MIN_CHAR_ACCURACY
+        )
+    accuracy = score['accuracy']
+    pronunciation_score = PronunciationScore(**score)
+
+    logger.info(f"✅ Recognized: '{recognized_text}' (correct: {is_correct}, confidence: {confidence:.2f})")
+
+    return STTRecognizeResponse(
+        recognized_text=recognized_text,
+        target_word=target_word,
+        is_correct=is_correct,
+        confidence=confidence,
+        accuracy=accuracy,
+        speech_duration=result.get('speech_duration'),
+        model=result.get('model'),
+        pronunciation_score=pronunciation_score,
+        audio_url=audio_url
+    )
+
+def save_user_recording(
+    audio_data: bytes,
+    user_id: int,
+    vocab_id: int,
+    extension: str = "wav",
+    content_type: str = "audio/wav"
+) -> Optional[str]:
+    """
+    Queue a user recording for background upload to MinIO
+    Returns the final object URL right away (None if the upload backlog is full)
+    """
+    object_name = f"{RECORDINGS_PREFIX}user_{user_id}/vocab_{vocab_id}_{uuid.uuid4().hex}.{extension}"
+    return upload_queue.submit(object_name, audio_data, content_type=content_type)
 
-    except Exception as e:
-        logger.error(f"Failed to save recording: {str(e)}")
-        return None
+def binary_request_fields(request: Request, names) -> dict:
+    """
+    Collect fields from the query string, falling back to X- headers
+    (target_word -> X-Target-Word). Header values may be percent-encoded
+    """
+    fields = {}
+    for name in names:
+        value = request.query_params.get(name)
+        if value is None:
+            header = request.headers.get('x-' + name.replace('_', '-'))
+            value = unquote(header) if header is not None else None
+        if value is not None:
+            fields[name] = value
+    return fields
+
+async def read_body_capped(request: Request, max_bytes: int) -> bytearray:
+    """
+    Read the request body as it streams in, without a second full copy
+    Raises 413 as soon as the declared or received size exceeds `max_bytes`
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Audio too large (max {max_bytes / (1024 * 1024):g} MB)"
+    )
+    declared = request.headers.get('content-length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        if len(body) + len(chunk) > max_bytes:
+            raise too_large
+        body += chunk
+    return body
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ✅ RUN SERVER
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 if __name__ == "__main__":
+    # Development server. For production use:
+    #   gunicorn -c gunicorn.conf.py main:app
     import uvicorn
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(
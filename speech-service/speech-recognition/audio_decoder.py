@@ -0,0 +1,143 @@
+import io
+import asyncio
+import subprocess
+from typing import List, Optional
+from loguru import logger
+
+
+class AudioDecodeError(Exception):
+    """Raised when audio bytes cannot be decoded to PCM."""
+
+
+def decode_to_pcm(data: bytes, sample_rate: int = 16000) -> bytes:
+    """
+    ✅ Decode any audio container to raw 16-bit mono PCM in memory.
+
+    The encoded bytes are piped into ffmpeg's stdin and raw PCM is read back
+    from its stdout, so no temporary files touch the disk.
+
+    Args:
+        data: Encoded audio (WAV, MP3, OGG, WebM, FLAC, ...)
+        sample_rate: Target sample rate in Hz
+
+    Returns:
+        Little-endian signed 16-bit mono PCM bytes
+    """
+    if not data:
+        raise AudioDecodeError("Empty audio payload")
+
+    try:
+        proc = subprocess.run(
+            [
+                'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                '-i', 'pipe:0',
+                '-f', 's16le', '-acodec', 'pcm_s16le',
+                '-ac', '1', '-ar', str(sample_rate),
+                'pipe:1',
+            ],
+            input=data,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+    except FileNotFoundError as e:
+        raise AudioDecodeError("ffmpeg is not installed") from e
+
+    if proc.returncode == 0 and proc.stdout:
+        return proc.stdout
+
+    # Some containers (e.g. M4A with a trailing moov atom) need a seekable
+    # input and cannot be read from a pipe. pydub handles those for us.
+    stderr = proc.stderr.decode(errors='ignore').strip()
+    logger.warning(f"⚠️ ffmpeg pipe decode failed, falling back to pydub: {stderr}")
+    return _decode_with_pydub(data, sample_rate)
+
+
+def _decode_with_pydub(data: bytes, sample_rate: int) -> bytes:
+    """Fallback decoder for containers ffmpeg cannot read from a pipe."""
+    from pydub import AudioSegment
+
+    try:
+        audio = AudioSegment.from_file(io.BytesIO(data))
+    except Exception as e:
+        raise AudioDecodeError(f"Unsupported or corrupt audio: {str(e)}") from e
+
+    audio = audio.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    return audio.raw_data
+
+
+class StreamTranscoder:
+    """
+    ✅ Incremental decoder for live audio streams
+
+    Runs one ffmpeg process per stream: encoded chunks are written to its
+    stdin as they arrive and PCM is read from stdout as soon as ffmpeg
+    produces it.
+
+    Supported input formats:
+    - pcm:  raw 16-bit mono PCM at `input_rate` (resampled if needed)
+    - webm: WebM/Opus, as produced by the browser MediaRecorder
+    - ogg:  Ogg/Opus
+    """
+
+    INPUT_ARGS = {
+        'webm': ['-f', 'webm'],
+        'ogg': ['-f', 'ogg'],
+    }
+
+    def __init__(self, input_format: str, sample_rate: int = 16000, input_rate: Optional[int] = None):
+        if input_format != 'pcm' and input_format not in self.INPUT_ARGS:
+            raise AudioDecodeError(f"Unsupported stream format: {input_format}")
+
+        self.input_format = input_format
+        self.sample_rate = sample_rate
+        self.input_rate = input_rate or sample_rate
+        self._proc: Optional[asyncio.subprocess.Process] = None
+
+    def _input_args(self) -> List[str]:
+        if self.input_format == 'pcm':
+            return ['-f', 's16le', '-ar', str(self.input_rate), '-ac', '1']
+        return self.INPUT_ARGS[self.input_format]
+
+    async def start(self) -> None:
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                *self._input_args(), '-i', 'pipe:0',
+                '-f', 's16le', '-acodec', 'pcm_s16le',
+                '-ac', '1', '-ar', str(self.sample_rate),
+                '-flush_packets', '1',
+                'pipe:1',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError as e:
+            raise AudioDecodeError("ffmpeg is not installed") from e
+
+    async def write(self, data: bytes) -> None:
+        """Push an encoded chunk into the decoder."""
+        self._proc.stdin.write(data)
+        await self._proc.stdin.drain()
+
+    async def end_input(self) -> None:
+        """Signal end of stream; remaining PCM can still be read."""
+        if self._proc and self._proc.stdin and not self._proc.stdin.is_closing():
+            self._proc.stdin.close()
+
+    async def read(self, size: int = 8000) -> bytes:
+        """Read the next PCM chunk. Returns b'' at end of stream."""
+        return await self._proc.stdout.read(size)
+
+    async def close(self) -> None:
+        """Stop ffmpeg. Safe to call more than once."""
+        if self._proc is None:
+            return
+        await self.end_input()
+        if self._proc.returncode is None:
+            try:
+                await asyncio.wait_for(self._proc.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                self._proc.kill()
+                await self._proc.wait()
+        self._proc = None
@@ -0,0 +1,89 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple
+
+UNKNOWN_TOKEN = '[unk]'
+
+# Simple inflections that learners commonly produce instead of the target
+_SUFFIXES = ('s', 'es', 'ed', 'd', 'ing', 'er', 'ly')
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase and collapse whitespace the same way scoring does."""
+    return ' '.join(text.strip().lower().split())
+
+
+def generate_distractors(target: str) -> List[str]:
+    """
+    Build close distractors for a single-word target.
+
+    Returns inflected / stemmed variants of the word. Multi-word targets get
+    no generated distractors; the full phrase plus `[unk]` is enough there.
+    """
+    if ' ' in target or not target.isalpha():
+        return []
+
+    candidates = [target + suffix for suffix in _SUFFIXES]
+    for suffix in _SUFFIXES:
+        if target.endswith(suffix) and len(target) - len(suffix) >= 3:
+            candidates.append(target[:-len(suffix)])
+    if target.endswith('e'):
+        candidates.append(target[:-1] + 'ing')
+
+    return [c for c in candidates if c != target]
+
+
+class GrammarCache:
+    """
+    ✅ LRU cache of compiled Vosk grammars per vocabulary item
+
+    A grammar is the JSON phrase list passed to `KaldiRecognizer`:
+    the target word, its distractors and `[unk]`. Words unknown to the
+    model are dropped, since Vosk would ignore them with a warning anyway.
+    """
+
+    def __init__(self, word_filter: Optional[Callable[[str], bool]] = None, max_size: Optional[int] = None):
+        self.word_filter = word_filter
+        self.max_size = max_size or int(os.getenv('STT_GRAMMAR_CACHE_SIZE', 2048))
+        self._cache: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, vocab_id: int, target_word: str, distractors: Optional[Iterable[str]] = None) -> str:
+        """Return the grammar JSON for a vocab item, compiling it on a miss."""
+        target = normalize_phrase(target_word)
+        extra = tuple(sorted({normalize_phrase(d) for d in (distractors or []) if d.strip()}))
+        key = (vocab_id, target, extra)
+
+        with self._lock:
+            grammar = self._cache.get(key)
+            if grammar is not None:
+                self._cache.move_to_end(key)
+                return grammar
+
+        grammar = self._compile(target, extra)
+
+        with self._lock:
+            self._cache[key] = grammar
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+        return grammar
+
+    def _compile(self, target: str, distractors: Tuple[str, ...]) -> str:
+        phrases = [target]
+        for phrase in (*distractors, *generate_distractors(target)):
+            if phrase not in phrases and self._is_known(phrase):
+                phrases.append(phrase)
+        phrases.append(UNKNOWN_TOKEN)
+        return json.dumps(phrases)
+
+    def _is_known(self, phrase: str) -> bool:
+        if self.word_filter is None:
+            return True
+        return all(self.word_filter(word) for word in phrase.split())
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,275 @@
+import os
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional
+from loguru import logger
+
+from speech_recognition.grammar import GrammarCache
+from speech_recognition.recognizer_pool import RecognizerPool
+
+if TYPE_CHECKING:
+    # vosk is imported on first load to keep service startup fast
+    from vosk import Model
+
+# Model tiers: fast single-word checks vs. accurate sentence decoding
+SMALL = 'small'
+LARGE = 'large'
+TIERS = (SMALL, LARGE)
+
+DEFAULT_MODEL_PATH = 'speech-recognition/models/vosk-model-small-en-us-0.15'
+
+
+class ModelKey(NamedTuple):
+    lang: str
+    tier: str
+
+    def __str__(self) -> str:
+        return f"{self.lang}:{self.tier}"
+
+
+class UnsupportedLanguageError(ValueError):
+    """No model is configured for the requested language"""
+
+
+def parse_model_specs(specs: Optional[str], default_path: str) -> Dict[ModelKey, str]:
+    """
+    Parse VOSK_MODELS ("en:small=/models/a,en:large=/models/b,vi:small=...")
+
+    Without it, VOSK_MODEL_PATH is registered as the small English model
+    (tier overridable with VOSK_MODEL_TIER).
+    """
+    if not specs:
+        return {ModelKey('en', os.getenv('VOSK_MODEL_TIER', SMALL)): default_path}
+
+    paths = {}
+    for spec in (s.strip() for s in specs.split(',')):
+        if not spec:
+            continue
+        key, _, path = spec.partition('=')
+        lang, _, tier = key.strip().partition(':')
+        tier = tier or SMALL
+        if not path or tier not in TIERS:
+            raise ValueError(f"Invalid VOSK_MODELS entry '{spec}' (expected lang:{'|'.join(TIERS)}=path)")
+        paths[ModelKey(lang.strip(), tier)] = path.strip()
+    return paths
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class LoadedModel:
+    """A loaded Vosk model with its own recognizer pool and grammar cache"""
+
+    def __init__(self, key: ModelKey, path: str, model: 'Model', sample_rate: int, size: int):
+        self.key = key
+        self.path = path
+        self.model = model
+        self.size = size
+        self.recognizer_pool = RecognizerPool(model, sample_rate, name=str(key))
+        # Grammars only keep words this model knows
+        self.grammar_cache = GrammarCache(word_filter=self.knows_word)
+        self.leases = 0
+        self.loaded_at = time.time()
+
+    def knows_word(self, word: str) -> bool:
+        return self.model.vosk_model_find_word(word) != -1
+
+
+class ModelRegistry:
+    """
+    ✅ Vosk models keyed by (language, tier)
+
+    Paths come from VOSK_MODELS. Models load on first use and stay
+    resident while they fit STT_MODEL_MEMORY_MB (estimated from their size
+    on disk); beyond that the least recently used model that no request is
+    decoding with is unloaded.
+
+    The budget is per process: models preloaded before a fork are shared
+    copy-on-write, models loaded lazily in a worker belong to that worker.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        paths: Optional[Dict[ModelKey, str]] = None,
+        budget_bytes: Optional[int] = None
+    ):
+        self.sample_rate = sample_rate
+        self.paths = paths or parse_model_specs(
+            os.getenv('VOSK_MODELS'),
+            os.getenv('VOSK_MODEL_PATH', DEFAULT_MODEL_PATH)
+        )
+        self.budget_bytes = budget_bytes or int(os.getenv('STT_MODEL_MEMORY_MB', 4096)) * 1024 * 1024
+
+        self._loaded: 'OrderedDict[ModelKey, LoadedModel]' = OrderedDict()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        for loaded in self._loaded.values():
+            loaded.leases = 0
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🧭 LOOKUP
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def languages(self) -> List[str]:
+        return sorted({key.lang for key in self.paths})
+
+    def has(self, lang: str, tier: str) -> bool:
+        return ModelKey(lang, tier) in self.paths
+
+    def resolve(self, lang: str, tier: str) -> ModelKey:
+        """Configured model for (lang, tier), falling back to the language's other tier"""
+        for candidate in (tier,) + tuple(t for t in TIERS if t != tier):
+            key = ModelKey(lang, candidate)
+            if key in self.paths:
+                return key
+        raise UnsupportedLanguageError(
+            f"No speech model for language '{lang}' (available: {', '.join(self.languages())})"
+        )
+
+    def is_loaded(self, key: ModelKey) -> bool:
+        return key in self._loaded
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔄 LOADING
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @contextmanager
+    def lease(self, key: ModelKey) -> Iterator[LoadedModel]:
+        """Use a model (loading it if needed); it is not evicted while leased."""
+        loaded = self.acquire(key)
+        try:
+            yield loaded
+        finally:
+            self.release(loaded)
+
+    def acquire(self, key: ModelKey) -> LoadedModel:
+        """Like `lease`, for holders that outlive one call. Pair with `release`."""
+        with self._lock:
+            loaded = self._loaded.get(key)
+            if loaded is not None:
+                loaded.leases += 1
+                self._loaded.move_to_end(key)
+                return loaded
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One thread loads a given model; others wait for it
+        with load_lock:
+            with self._lock:
+                loaded = self._loaded.get(key)
+                if loaded is not None:
+                    loaded.leases += 1
+                    self._loaded.move_to_end(key)
+                    return loaded
+
+            loaded = self._load(key)
+
+            with self._lock:
+                loaded.leases += 1
+                self._loaded[key] = loaded
+                evicted = self._evict_locked()
+
+        for model in evicted:
+            model.recognizer_pool.close()
+            logger.info(f"♻️ Unloaded speech model {model.key} ({model.size / 1024 / 1024:.0f} MiB)")
+        return loaded
+
+    def release(self, loaded: LoadedModel) -> None:
+        with self._lock:
+            loaded.leases -= 1
+
+    def load(self, key: ModelKey) -> LoadedModel:
+        """Load a model ahead of its first request (e.g. before forking)"""
+        with self.lease(key) as loaded:
+            return loaded
+
+    def _load(self, key: ModelKey) -> LoadedModel:
+        from vosk import Model
+
+        path = self.paths[key]
+        if not os.path.exists(path):
+            logger.error(f"❌ Vosk model not found at {path}")
+            logger.info("📥 Download model from: https://alphacephei.com/vosk/models")
+            raise FileNotFoundError(f"Model not found at {path}")
+
+        # ✅ Verify model structure
+        for dir_name in ('am', 'conf', 'graph'):
+            if not os.path.exists(os.path.join(path, dir_name)):
+                raise FileNotFoundError(f"Invalid model structure: missing '{dir_name}' directory")
+
+        logger.info(f"🔄 Loading Vosk model {key} from {path}...")
+        started = time.monotonic()
+        model = Model(path)
+        loaded = LoadedModel(key, path, model, self.sample_rate, _directory_size(path))
+        self.loads += 1
+        logger.success(f"✅ Vosk model {key} loaded in {time.monotonic() - started:.1f}s")
+        return loaded
+
+    def _evict_locked(self) -> List[LoadedModel]:
+        """Unload idle models, least recently used first, until within budget"""
+        evicted = []
+        used = sum(model.size for model in self._loaded.values())
+        for key in list(self._loaded):
+            if used <= self.budget_bytes:
+                break
+            model = self._loaded[key]
+            if model.leases:
+                continue
+            del self._loaded[key]
+            used -= model.size
+            evicted.append(model)
+            self.evictions += 1
+
+        if used > self.budget_bytes:
+            logger.warning(
+                f"⚠️ Speech models use {used / 1024 / 1024:.0f} MiB, over the "
+                f"{self.budget_bytes / 1024 / 1024:.0f} MiB budget (all in use)"
+            )
+        return evicted
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def loaded(self) -> List[LoadedModel]:
+        with self._lock:
+            return list(self._loaded.values())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'budget_mb': round(self.budget_bytes / 1024 / 1024),
+                'used_mb': round(sum(m.size for m in self._loaded.values()) / 1024 / 1024),
+                'configured': sorted(str(key) for key in self.paths),
+                'loaded': [
+                    {
+                        'model': str(m.key),
+                        'size_mb': round(m.size / 1024 / 1024),
+                        'in_use': m.leases,
+                        'recognizer_pool': m.recognizer_pool.stats(),
+                    }
+                    for m in self._loaded.values()
+                ],
+                'loads': self.loads,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+from loguru import logger
+
+from core.profiling import Profile
+from speech_recognition.vosk_service import VoskService
+
+# Service used by the current process. With the default `fork` start method
+# the CPU pool workers inherit the parent's preloaded models, so the
+# initializer only has to load them when running under `spawn`.
+_service: Optional[VoskService] = None
+
+
+def bind_service(service: VoskService) -> None:
+    """Use an already-initialized VoskService in this process."""
+    global _service
+    _service = service
+
+
+def init_worker() -> None:
+    """Process pool initializer: make sure a model is available and warm."""
+    global _service
+    if _service is None:
+        logger.info("🔄 Loading Vosk model in worker process...")
+        _service = VoskService()
+        _service.preload()
+
+    _service.warm()
+
+
+def recognize_bytes(
+    data: bytes,
+    target_word: Optional[str] = None,
+    vocab_id: int = 0,
+    distractors: Optional[List[str]] = None,
+    use_grammar: bool = False,
+    lang: Optional[str] = None,
+    profile: bool = False
+) -> Dict:
+    """
+    Run in-memory recognition in the current worker. Entry point for the CPU pool.
+
+    `target_word` picks the model tier; with `use_grammar` decoding is also
+    constrained to a grammar built from it. Models and grammars are cached
+    per worker process.
+
+    With `profile`, the call is profiled in this process and the samples
+    are returned under `profile` for the request's profile to merge.
+    """
+    if _service is None:
+        init_worker()
+
+    if not profile:
+        return _service.recognize_bytes(
+            data,
+            target_word=target_word,
+            use_grammar=use_grammar,
+            vocab_id=vocab_id,
+            distractors=distractors,
+            lang=lang
+        )
+
+    worker_profile = Profile('recognize')
+    with worker_profile.running():
+        result = _service.recognize_bytes(
+            data,
+            target_word=target_word,
+            use_grammar=use_grammar,
+            vocab_id=vocab_id,
+            distractors=distractors,
+            lang=lang
+        )
+    result['profile'] = worker_profile.export()
+    return result
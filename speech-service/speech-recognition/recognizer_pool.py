@@ -0,0 +1,160 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional
+from loguru import logger
+
+from core.metrics import RECOGNIZER_POOL_CHECKOUTS, RECOGNIZER_POOL_RECOGNIZERS
+
+if TYPE_CHECKING:
+    # vosk is imported on first use to keep service startup fast
+    from vosk import KaldiRecognizer, Model
+
+
+class RecognizerPool:
+    """
+    ✅ Pool of pre-built KaldiRecognizer instances
+
+    Building a recognizer allocates decoder state for the model graph, which
+    is wasted work when done per request. Recognizers are checked out,
+    `Reset()` after use and handed to the next request instead.
+
+    Idle recognizers are grouped by grammar (None = open vocabulary) so hot
+    grammar-constrained words are reused too. The total number of idle
+    recognizers is bounded by STT_RECOGNIZER_POOL_SIZE.
+    """
+
+    def __init__(self, model: 'Model', sample_rate: int, size: Optional[int] = None, name: str = 'default'):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.name = name
+        self.size = size or int(os.getenv('STT_RECOGNIZER_POOL_SIZE', 4))
+
+        self._idle: 'OrderedDict[Optional[str], List[KaldiRecognizer]]' = OrderedDict()
+        self._idle_count = 0
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+        # A forked child must not inherit the parent's lock state or share
+        # recognizers that a parent thread may have been using mid-decode.
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()
+        self._idle_count = 0
+        self._in_use = 0
+        self._publish()
+
+    def _build(self, grammar: Optional[str]) -> 'KaldiRecognizer':
+        from vosk import KaldiRecognizer
+
+        if grammar:
+            rec = KaldiRecognizer(self.model, self.sample_rate, grammar)
+        else:
+            rec = KaldiRecognizer(self.model, self.sample_rate)
+        rec.SetWords(True)  # Enable word-level timestamps
+        return rec
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔄 CHECKOUT
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """Pre-build open-vocabulary recognizers up to the pool size."""
+        count = self.size if count is None else min(count, self.size)
+        built = [self._build(None) for _ in range(max(0, count - self._idle_count))]
+        for rec in built:
+            self._put(None, rec)
+        self._publish()
+        logger.info(f"🔥 Pre-warmed {len(built)} recognizers (pid {os.getpid()})")
+
+    def checkout(self, grammar: Optional[str] = None) -> 'KaldiRecognizer':
+        """Take a clean recognizer for `grammar`. Must be paired with `checkin`."""
+        rec = self._take(grammar)
+        RECOGNIZER_POOL_CHECKOUTS.labels(self.name, 'built' if rec is None else 'reused').inc()
+        if rec is None:
+            rec = self._build(grammar)
+
+        with self._lock:
+            self._in_use += 1
+        self._publish()
+        return rec
+
+    def checkin(self, grammar: Optional[str], rec: 'KaldiRecognizer', reusable: bool = True) -> None:
+        """Return a recognizer. One that failed mid-decode is dropped, not reused."""
+        with self._lock:
+            self._in_use -= 1
+        if reusable:
+            rec.Reset()
+            self._put(grammar, rec)
+        self._publish()
+
+    @contextmanager
+    def acquire(self, grammar: Optional[str] = None) -> Iterator['KaldiRecognizer']:
+        """Check out a clean recognizer for `grammar` and return it afterwards."""
+        rec = self.checkout(grammar)
+        ok = False
+        try:
+            yield rec
+            ok = True
+        finally:
+            self.checkin(grammar, rec, reusable=ok)
+
+    def _take(self, grammar: Optional[str]) -> Optional['KaldiRecognizer']:
+        with self._lock:
+            idle = self._idle.get(grammar)
+            if not idle:
+                return None
+            rec = idle.pop()
+            self._idle_count -= 1
+            if not idle:
+                del self._idle[grammar]
+            return rec
+
+    def _put(self, grammar: Optional[str], rec: 'KaldiRecognizer') -> None:
+        with self._lock:
+            # Evict from the least recently returned grammar when full
+            while self._idle_count >= self.size and self._idle:
+                oldest_key = next(iter(self._idle))
+                oldest = self._idle[oldest_key]
+                oldest.pop(0)
+                self._idle_count -= 1
+                if not oldest:
+                    del self._idle[oldest_key]
+
+            if self.size <= 0:
+                return
+
+            self._idle.setdefault(grammar, []).append(rec)
+            self._idle.move_to_end(grammar)
+            self._idle_count += 1
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📊 STATS
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _publish(self) -> None:
+        """Mirror idle / in-use counts into the Prometheus gauges."""
+        RECOGNIZER_POOL_RECOGNIZERS.labels(self.name, 'idle').set(self._idle_count)
+        RECOGNIZER_POOL_RECOGNIZERS.labels(self.name, 'in_use').set(self._in_use)
+
+    def close(self) -> None:
+        """Drop idle recognizers (the model is being unloaded)."""
+        with self._lock:
+            self._idle = OrderedDict()
+            self._idle_count = 0
+            self.size = 0  # Recognizers still checked out are not pooled again
+        self._publish()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': self._idle_count,
+                'in_use': self._in_use,
+                'grammars': sum(1 for key in self._idle if key is not None),
+            }
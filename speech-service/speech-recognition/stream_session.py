@@ -0,0 +1,92 @@
+import json
+from typing import Dict, List, Optional
+from loguru import logger
+
+from speech_recognition.vosk_service import VoskService
+
+
+class StreamingSession:
+    """
+    ✅ Live recognition over a stream of PCM chunks
+
+    Holds one model lease and one recognizer from that model's pool for
+    the lifetime of a WebSocket connection. Chunks must be 16-bit mono PCM
+    at the service sample rate.
+    Methods are blocking and meant to run on a worker thread, one call at
+    a time per session.
+    """
+
+    def __init__(
+        self,
+        service: VoskService,
+        lang: Optional[str] = None,
+        target_word: Optional[str] = None,
+        use_grammar: bool = False,
+        vocab_id: int = 0
+    ):
+        self.service = service
+        self.loaded = service.registry.acquire(service.select_model(lang, target_word))
+        try:
+            self.grammar = (
+                service.build_grammar(self.loaded, vocab_id, target_word)
+                if use_grammar and target_word else None
+            )
+            self.rec = self.loaded.recognizer_pool.checkout(self.grammar)
+        except Exception:
+            service.registry.release(self.loaded)
+            raise
+        self.results: List[Dict] = []
+        self.bytes_received = 0
+        self._last_partial = ''
+        self._closed = False
+
+    def accept(self, pcm: bytes) -> Optional[Dict]:
+        """
+        Feed a chunk of PCM to the recognizer.
+
+        Returns:
+            - {'type': 'result', 'text': ...} when a segment is finalized
+            - {'type': 'partial', 'text': ...} when the hypothesis changed
+            - None when there is nothing new to report
+        """
+        self.bytes_received += len(pcm)
+
+        if self.rec.AcceptWaveform(pcm):
+            result = json.loads(self.rec.Result())
+            if result.get('text'):
+                self.results.append(result)
+                self._last_partial = ''
+                # A segment of only `[unk]` is kept for `finish` but not reported
+                text = self.service.clean_text(result['text'])
+                if text:
+                    return {'type': 'result', 'text': text}
+            return None
+
+        partial = self.service.clean_text(json.loads(self.rec.PartialResult()).get('partial', ''))
+        if partial and partial != self._last_partial:
+            self._last_partial = partial
+            return {'type': 'partial', 'text': partial}
+        return None
+
+    def finish(self) -> Dict:
+        """Flush the recognizer and return the aggregated result."""
+        final_result = json.loads(self.rec.FinalResult())
+        if final_result.get('text'):
+            self.results.append(final_result)
+
+        result = self.service._aggregate_results(self.results)
+        result['model'] = str(self.loaded.key)
+        result['duration'] = round(self.bytes_received / (2 * self.service.sample_rate), 2)
+        return result
+
+    def close(self, reusable: bool = True) -> None:
+        """Give the recognizer and model back. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.loaded.recognizer_pool.checkin(self.grammar, self.rec, reusable=reusable)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to release stream recognizer: {e}")
+        finally:
+            self.service.registry.release(self.loaded)
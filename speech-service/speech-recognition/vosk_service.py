@@ -1,12 +1,23 @@
 import os
-import wave
 import json
-import tempfile
 from typing import Dict, List, Optional
-from vosk import Model, KaldiRecognizer
-from pydub import AudioSegment
 from loguru import logger
 
+from core.audio_probe import AudioInfo, probe, probe_or_decode
+from core.metrics import record_stage
+from core.profiling import sampled
+from speech_recognition.audio_decoder import decode_to_pcm
+from speech_recognition.grammar import UNKNOWN_TOKEN
+from speech_recognition.model_registry import (
+    LARGE,
+    SMALL,
+    LoadedModel,
+    ModelKey,
+    ModelRegistry,
+    UnsupportedLanguageError,
+)
+from speech_recognition.vad import VoiceActivityDetector
+
 
 class VoskService:
     """
@@ -14,233 +25,413 @@ class VoskService:
     
     Supports:
     - Multiple audio formats (WAV, MP3, OGG, M4A, WebM)
-    - Automatic audio conversion to 16kHz mono WAV
+    - In-memory audio conversion to 16kHz mono PCM (no temp files)
     - Word-level timestamps and confidence scores
+    - Grammar-constrained decoding for known target words
+    - Silence trimming / no-speech rejection before decoding (VAD)
+    - Several models per language / tier, routed per request:
+      single words go to the small model, sentences and low-confidence
+      small-model results to the large one
     - Error handling and logging
     """
     
     def __init__(self):
-        self.model_path = os.getenv(
-            'VOSK_MODEL_PATH',
-            'speech-recognition/models/vosk-model-small-en-us-0.15'
-        )
         self.sample_rate = int(os.getenv("VOSK_SAMPLE_RATE", 16000))
-        self.model: Optional[Model] = None
-        self._load_model()
+        self.default_lang = os.getenv('STT_DEFAULT_LANG', 'en')
+        # Targets up to this many words use the small model
+        self.small_max_words = int(os.getenv('STT_SMALL_MODEL_MAX_WORDS', 1))
+        # Small-model results below this confidence are decoded again with the large model
+        self.retry_confidence = float(os.getenv('STT_RETRY_CONFIDENCE', 0.5))
+        self.registry = ModelRegistry(self.sample_rate)
+        self.vad = (
+            VoiceActivityDetector(self.sample_rate)
+            if os.getenv('STT_VAD_ENABLED', 'true').lower() == 'true'
+            else None
+        )
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 🔧 INITIALIZATION
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-    def _load_model(self) -> None:
-        """Load Vosk model into memory."""
+    def preload(self) -> None:
+        """
+        Load STT_PRELOAD_MODELS (default: the default language's small
+        model); others load on first use. Blocking: called by the app's
+        startup, or by the gunicorn master so forked workers share them.
+        """
+        specs = os.getenv('STT_PRELOAD_MODELS', f"{self.default_lang}:{SMALL}")
         try:
-            if not os.path.exists(self.model_path):
-                logger.error(f"❌ Vosk model not found at {self.model_path}")
-                logger.info("📥 Download model from: https://alphacephei.com/vosk/models")
-                logger.info("Recommended: vosk-model-small-en-us-0.15 (370MB)")
-                raise FileNotFoundError(f"Model not found at {self.model_path}")
-
-            # ✅ Verify model structure
-            required_dirs = ['am', 'conf', 'graph']
-            for dir_name in required_dirs:
-                dir_path = os.path.join(self.model_path, dir_name)
-                if not os.path.exists(dir_path):
-                    raise FileNotFoundError(
-                        f"Invalid model structure: missing '{dir_name}' directory"
-                    )
-
-            logger.info(f"🔄 Loading Vosk model from {self.model_path}...")
-            self.model = Model(self.model_path)
-            logger.success("✅ Vosk model loaded successfully")
+            for spec in (s.strip() for s in specs.split(',')):
+                if spec:
+                    lang, _, tier = spec.partition(':')
+                    self.registry.load(self.registry.resolve(lang, tier or SMALL))
 
         except Exception as e:
             logger.error(f"❌ Failed to load Vosk model: {str(e)}")
             raise
 
     def is_ready(self) -> bool:
-        """Check if model is loaded and ready."""
-        return self.model is not None
+        """Check if a model is loaded and ready."""
+        return bool(self.registry.loaded())
+
+    def warm(self) -> None:
+        """Pre-build recognizers for every loaded model (after a fork)."""
+        for loaded in self.registry.loaded():
+            loaded.recognizer_pool.warm()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🧭 MODEL ROUTING
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def check_language(self, lang: Optional[str]) -> str:
+        """Resolve the request language. Raises UnsupportedLanguageError."""
+        lang = lang or self.default_lang
+        if lang not in self.registry.languages():
+            raise UnsupportedLanguageError(
+                f"No speech model for language '{lang}' "
+                f"(available: {', '.join(self.registry.languages())})"
+            )
+        return lang
+
+    def select_model(self, lang: Optional[str] = None, target_word: Optional[str] = None) -> ModelKey:
+        """
+        Pick the model for a request: the small tier for short targets
+        (single-word checks), the large tier for sentences or when no
+        target is known. Falls back to whichever tier the language has.
+        """
+        lang = self.check_language(lang)
+        short = target_word is not None and len(target_word.split()) <= self.small_max_words
+        return self.registry.resolve(lang, SMALL if short else LARGE)
+
+    def build_grammar(
+        self,
+        loaded: LoadedModel,
+        vocab_id: int,
+        target_word: str,
+        distractors: Optional[List[str]] = None
+    ) -> str:
+        """
+        Get the (cached) grammar for a single-target pronunciation check.
+
+        Note: grammars need a model with a dynamic graph (e.g. the small
+        models or `-lgraph` variants). Static-graph models ignore them.
+        """
+        return loaded.grammar_cache.get(vocab_id, target_word, distractors)
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 🎵 AUDIO CONVERSION
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-    def _convert_to_wav(self, file_path: str) -> str:
+    @sampled('stt.convert_to_pcm')
+    def _convert_to_pcm(self, data: bytes) -> bytes:
         """
-        Convert audio file to mono WAV at target sample rate.
-        
+        Convert encoded audio bytes to mono 16-bit PCM at target sample rate.
+
+        WAV input that already is 16-bit mono PCM at the target rate is
+        passed through as a zero-copy view of its data chunk; everything
+        else is decoded.
+
         Supports: MP3, WAV, OGG, M4A, WebM, FLAC
-        Returns: Path to converted WAV file
+        Returns: Raw PCM bytes (or a view of them, no WAV header), in memory
         """
         try:
-            logger.info(f"🔄 Converting audio: {file_path}")
-            
-            # Load audio file (pydub auto-detects format)
-            audio = AudioSegment.from_file(file_path)
-            
-            # Convert to mono 16kHz 16-bit PCM WAV
-            audio = audio.set_channels(1)  # Mono
-            audio = audio.set_frame_rate(self.sample_rate)  # 16kHz
-            audio = audio.set_sample_width(2)  # 16-bit
-            
-            # Create temporary WAV file
-            wav_path = tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix='.wav',
-                prefix='vosk_'
-            ).name
-            
-            # Export as WAV
-            audio.export(wav_path, format='wav')
-            
-            duration = len(audio) / 1000.0  # seconds
-            logger.success(
-                f"✅ Converted to WAV: {wav_path} "
+            # ✅ Fast path: already in the recognizer's format
+            info = probe(data)
+            if self._is_recognizer_format(info):
+                logger.info(
+                    f"⚡ Input already {self.sample_rate}Hz mono PCM, skipping conversion "
+                    f"(duration: {info.duration:.2f}s)"
+                )
+                size = info.data_size & ~1  # Whole 16-bit samples only
+                return memoryview(data)[info.data_offset:info.data_offset + size]
+
+            pcm = decode_to_pcm(data, self.sample_rate)
+
+            duration = len(pcm) / (2 * self.sample_rate)  # seconds
+            logger.info(
+                f"🔄 Converted audio to PCM in memory "
                 f"(duration: {duration:.2f}s, rate: {self.sample_rate}Hz)"
             )
-            
-            return wav_path
-            
+
+            return pcm
+
         except Exception as e:
             logger.error(f"❌ Audio conversion failed: {str(e)}")
             raise
 
+    def _is_recognizer_format(self, info: Optional[AudioInfo]) -> bool:
+        """True if probed audio can be fed to Kaldi without conversion."""
+        return (
+            info is not None
+            and info.format == 'wav'
+            and info.codec == 'pcm'
+            and info.channels == 1
+            and info.sample_width == 2
+            and info.sample_rate == self.sample_rate
+            and info.data_offset is not None
+            and info.duration is not None
+        )
+
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 🎤 SPEECH RECOGNITION
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+    @sampled('stt.recognize')
     def recognize(self, file_path: str) -> Dict:
         """
         Recognize speech from an audio file.
-        
+
         Args:
             file_path: Path to audio file (any format)
-            
+
+        Returns:
+            Same result dict as `recognize_bytes`
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            logger.error(f"❌ Recognition error: {str(e)}")
+            return self._error_result(e)
+
+        return self.recognize_bytes(data)
+
+    @sampled('stt.recognize_bytes')
+    def recognize_bytes(
+        self,
+        data: bytes,
+        target_word: Optional[str] = None,
+        use_grammar: bool = False,
+        vocab_id: int = 0,
+        distractors: Optional[List[str]] = None,
+        lang: Optional[str] = None
+    ) -> Dict:
+        """
+        Recognize speech from encoded audio bytes without touching the disk.
+
+        Args:
+            data: Audio bytes (any format supported by ffmpeg)
+            target_word: Expected text; routes the request to a model tier
+            use_grammar: Constrain decoding to the target word (+ distractors)
+            lang: Language of the speech (default: STT_DEFAULT_LANG)
+
         Returns:
             Dict containing:
             - text: str - Recognized text
             - confidence: float - Average confidence score (0-1)
             - words: List[Dict] - Word-level results with timestamps
+            - model: str - Model that produced the result, e.g. "en:small"
+            - timings: Dict[str, float] - Seconds spent per stage
             - error: str - Error message if failed (optional)
         """
-        converted_file = None
-        wav_file = None
-        
+        timings: Dict[str, float] = {}
         try:
-            if not self.model:
-                raise RuntimeError("Vosk model not loaded")
+            # ✅ Convert audio to 16kHz mono PCM
+            with record_stage(timings, 'convert'):
+                pcm = self._convert_to_pcm(data)
 
-            # ✅ Convert audio to proper format
-            wav_path = self._convert_to_wav(file_path)
-            converted_file = wav_path if wav_path != file_path else None
+            result = self.recognize_pcm(
+                pcm,
+                target_word=target_word,
+                use_grammar=use_grammar,
+                vocab_id=vocab_id,
+                distractors=distractors,
+                lang=lang,
+                timings=timings
+            )
 
-            # ✅ Open WAV file
-            wav_file = wave.open(wav_path, "rb")
+        except Exception as e:
+            logger.error(f"❌ Recognition error: {str(e)}")
+            result = self._error_result(e)
 
-            # ✅ Validate audio format
-            if wav_file.getnchannels() != 1:
-                raise ValueError(
-                    f"Audio must be mono, got {wav_file.getnchannels()} channels"
-                )
-            if wav_file.getsampwidth() != 2:
-                raise ValueError(
-                    f"Audio must be 16-bit PCM, got {wav_file.getsampwidth() * 8}-bit"
-                )
+        result['timings'] = timings
+        return result
 
-            # ✅ Create recognizer
-            rec = KaldiRecognizer(self.model, wav_file.getframerate())
-            rec.SetWords(True)  # Enable word-level timestamps
+    def recognize_pcm(
+        self,
+        pcm: bytes,
+        target_word: Optional[str] = None,
+        use_grammar: bool = False,
+        vocab_id: int = 0,
+        distractors: Optional[List[str]] = None,
+        lang: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """
+        Recognize speech from raw 16-bit mono PCM at `self.sample_rate`.
 
-            # ✅ Process audio in chunks
-            results = []
-            chunk_size = 4000  # bytes
-            
-            while True:
-                data = wav_file.readframes(chunk_size)
-                if len(data) == 0:
-                    break
-                    
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    if result.get('text'):
-                        results.append(result)
-
-            # ✅ Get final result
-            final_result = json.loads(rec.FinalResult())
-            if final_result.get('text'):
-                results.append(final_result)
-
-            # ✅ Close WAV file
-            wav_file.close()
-            wav_file = None
-
-            # ✅ Aggregate results
-            recognized_text = ' '.join([r.get('text', '') for r in results]).strip()
-            
-            all_words = []
-            confidences = []
-            
-            for r in results:
-                if 'result' in r:  # Word-level results
-                    for w in r['result']:
-                        all_words.append(w)
-                        confidences.append(w.get('conf', 0))
-
-            # Calculate average confidence
-            avg_confidence = (
-                round(sum(confidences) / len(confidences), 3) 
-                if confidences else 0.0
-            )
+        Leading / trailing silence is trimmed by the VAD first and clips
+        without speech never reach the decoder. The model is chosen by
+        `select_model`; a small-model result below STT_RETRY_CONFIDENCE is
+        decoded again with the language's large model. Stage durations are
+        added to `timings` when given.
+        """
+        key = self.select_model(lang, target_word)
+
+        view = memoryview(pcm)
+        offset_seconds = 0.0
+        speech_duration = None
+
+        # ✅ Skip silence before it costs decoder time
+        if self.vad:
+            with record_stage(timings, 'vad'):
+                segment = self.vad.detect(pcm)
+            if segment is None:
+                logger.info("🔇 No speech detected, skipping decoder")
+                return self._no_speech_result()
 
+            view = view[segment.start:segment.end]
+            offset_seconds = segment.start / 2 / self.sample_rate
+            speech_duration = segment.speech_duration
+
+        grammar_args = (vocab_id, target_word, distractors) if use_grammar and target_word else None
+        aggregated = self._decode(view, key, grammar_args, timings, 'decode')
+
+        # ✅ Low-confidence single-word check: ask the large model
+        if (
+            key.tier == SMALL
+            and aggregated['confidence'] < self.retry_confidence
+            and self.registry.has(key.lang, LARGE)
+        ):
             logger.info(
-                f"🗣️ Recognized: \"{recognized_text}\" "
-                f"(confidence: {avg_confidence:.3f}, words: {len(all_words)})"
+                f"🔁 Low confidence ({aggregated['confidence']:.2f}) from {key}, "
+                f"retrying with {key.lang}:{LARGE}"
             )
+            key = ModelKey(key.lang, LARGE)
+            aggregated = self._decode(view, key, grammar_args, timings, 'decode_retry')
+            aggregated['retried'] = True
 
-            return {
-                'text': recognized_text,
-                'confidence': avg_confidence,
-                'words': all_words,
-                'word_count': len(all_words)
-            }
+        # Keep word timestamps relative to the original clip
+        if offset_seconds:
+            for w in aggregated['words']:
+                for key_name in ('start', 'end'):
+                    if key_name in w:
+                        w[key_name] = round(w[key_name] + offset_seconds, 3)
 
-        except Exception as e:
-            logger.error(f"❌ Recognition error: {str(e)}")
-            return {
-                'error': str(e),
-                'text': '',
-                'confidence': 0.0,
-                'words': [],
-                'word_count': 0
-            }
+        aggregated['speech_duration'] = speech_duration
+        aggregated['model'] = str(key)
+        return aggregated
+
+    def _decode(
+        self,
+        view: memoryview,
+        key: ModelKey,
+        grammar_args: Optional[tuple],
+        timings: Optional[Dict[str, float]],
+        stage: str
+    ) -> Dict:
+        """
+        Decode PCM with one model. The buffer is fed to Kaldi through
+        memoryview slices, so the PCM itself is never copied into
+        intermediate buffers or files.
+        """
+        if self.registry.is_loaded(key):
+            loaded = self.registry.acquire(key)
+        else:
+            with record_stage(timings, 'model_load'):
+                loaded = self.registry.acquire(key)
+
+        try:
+            grammar = self.build_grammar(loaded, *grammar_args) if grammar_args else None
+
+            results = []
+            chunk_size = 4000 * 2  # bytes (4000 frames of 16-bit samples)
+
+            # ✅ Borrow a pre-built recognizer (constrained to a phrase list if given)
+            with record_stage(timings, stage), loaded.recognizer_pool.acquire(grammar) as rec:
+                for offset in range(0, len(view), chunk_size):
+                    # The cffi binding takes bytes, so only the small chunk is copied
+                    chunk = view[offset:offset + chunk_size].tobytes()
+
+                    if rec.AcceptWaveform(chunk):
+                        result = json.loads(rec.Result())
+                        if result.get('text'):
+                            results.append(result)
+
+                # ✅ Get final result
+                final_result = json.loads(rec.FinalResult())
+                if final_result.get('text'):
+                    results.append(final_result)
 
         finally:
-            # ✅ Cleanup resources
-            if wav_file:
-                try:
-                    wav_file.close()
-                except Exception:
-                    pass
-                    
-            if converted_file and os.path.exists(converted_file):
-                try:
-                    os.unlink(converted_file)
-                    logger.debug(f"🗑️ Cleaned up temp file: {converted_file}")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to cleanup temp file: {e}")
+            self.registry.release(loaded)
+
+        return self._aggregate_results(results)
+
+    def _aggregate_results(self, results: List[Dict]) -> Dict:
+        """Merge Kaldi result chunks into a single recognition result."""
+        recognized_text = ' '.join(
+            self.clean_text(r.get('text', '')) for r in results
+        ).strip()
+
+        all_words = []
+        confidences = []
+
+        for r in results:
+            if 'result' in r:  # Word-level results
+                for w in r['result']:
+                    if w.get('word') == UNKNOWN_TOKEN:
+                        continue
+                    all_words.append(w)
+                    confidences.append(w.get('conf', 0))
+
+        # Calculate average confidence
+        avg_confidence = (
+            round(sum(confidences) / len(confidences), 3)
+            if confidences else 0.0
+        )
+
+        logger.info(
+            f"🗣️ Recognized: \"{recognized_text}\" "
+            f"(confidence: {avg_confidence:.3f}, words: {len(all_words)})"
+        )
+
+        return {
+            'text': recognized_text,
+            'confidence': avg_confidence,
+            'words': all_words,
+            'word_count': len(all_words)
+        }
+
+    @staticmethod
+    def clean_text(text: str) -> str:
+        """Kaldi text without `[unk]` and with single spaces"""
+        # `[unk]` only shows up in grammar mode and means "none of the phrases"
+        return ' '.join(word for word in text.split() if word != UNKNOWN_TOKEN)
+
+    @staticmethod
+    def _no_speech_result() -> Dict:
+        return {
+            'text': '',
+            'confidence': 0.0,
+            'words': [],
+            'word_count': 0,
+            'speech_duration': 0.0
+        }
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict:
+        return {
+            'error': str(error),
+            'text': '',
+            'confidence': 0.0,
+            'words': [],
+            'word_count': 0
+        }
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 📊 UTILITY METHODS
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
     def get_model_info(self) -> Dict:
-        """Get information about the loaded model."""
+        """Get information about the configured and loaded models."""
         return {
-            'model_path': self.model_path,
             'sample_rate': self.sample_rate,
+            'default_lang': self.default_lang,
+            'languages': self.registry.languages(),
             'loaded': self.is_ready(),
-            'exists': os.path.exists(self.model_path) if self.model_path else False
+            'models': self.registry.stats(),
+            'vad_enabled': self.vad is not None,
         }
 
     def validate_audio_file(self, file_path: str) -> Dict:
@@ -251,17 +442,33 @@ class VoskService:
             Dict with validation results
         """
         try:
-            audio = AudioSegment.from_file(file_path)
+            with open(file_path, 'rb') as f:
+                return self.validate_audio_bytes(f.read())
+        except Exception as e:
+            return {
+                'valid': False,
+                'error': str(e)
+            }
+
+    def validate_audio_bytes(self, data: bytes) -> Dict:
+        """
+        Validate audio bytes from container headers only.
+
+        Falls back to a full decode only when the container is unknown.
+        """
+        try:
+            info = probe_or_decode(data)
             return {
                 'valid': True,
-                'duration': len(audio) / 1000.0,  # seconds
-                'channels': audio.channels,
-                'sample_rate': audio.frame_rate,
-                'sample_width': audio.sample_width,
-                'format': 'valid'
+                'duration': info.duration,  # seconds
+                'channels': info.channels,
+                'sample_rate': info.sample_rate,
+                'sample_width': info.sample_width,
+                'format': info.format,
+                'codec': info.codec
             }
         except Exception as e:
             return {
                 'valid': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,89 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+
+@dataclass
+class TTSCacheEntry:
+    """Metadata of one cached TTS object in MinIO"""
+    object_name: str
+    duration: Optional[float] = None
+    size: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TTSCacheEntry':
+        return cls(
+            object_name=data['object_name'],
+            duration=data.get('duration'),
+            size=int(data.get('size') or 0),
+        )
+
+
+class TTSCacheIndex:
+    """
+    ✅ In-process LRU index of cached TTS objects
+
+    Maps cache key → object name, duration and size so a cache hit needs
+    no MinIO round-trip. Bounded by TTS_CACHE_INDEX_SIZE entries.
+
+    Each process keeps its own index; deletions made by other processes
+    reach it through the TTS journal (see `TTSService.sync_cache_index`).
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv('TTS_CACHE_INDEX_SIZE', 50000))
+        self._entries: 'OrderedDict[str, TTSCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[TTSCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: TTSCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def load(self, entries: Dict[str, TTSCacheEntry]) -> int:
+        """Bulk-populate the index (e.g. from a manifest). Returns entries kept."""
+        for key, entry in entries.items():
+            self.put(key, entry)
+        return len(self)
+
+    def snapshot(self) -> List[TTSCacheEntry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def is_full(self) -> bool:
+        return len(self) >= self.max_size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,151 @@
+import os
+import shutil
+import struct
+import subprocess
+from typing import BinaryIO, Dict, List, Optional
+from loguru import logger
+
+
+class TTSEngine:
+    """
+    ✅ Interface of a speech synthesis backend
+
+    An engine writes one clip for (text, lang, slow) into a binary file
+    object and lists the voices it offers. Its `name` is part of the TTS
+    cache key, so clips of different engines never collide.
+    """
+
+    name = ""
+    content_type = "audio/mpeg"
+    extension = "mp3"
+
+    def is_available(self) -> bool:
+        return True
+
+    def voices(self) -> List[Dict]:
+        """Voices as {code, name, language}; `code` is what `lang` accepts"""
+        raise NotImplementedError
+
+    def supports(self, lang: str) -> bool:
+        return any(lang in (voice['code'], voice['language']) for voice in self.voices())
+
+    def synthesize(self, text: str, lang: str, slow: bool, fp: BinaryIO) -> None:
+        raise NotImplementedError
+
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS (MP3, needs network access)"""
+
+    name = "gtts"
+
+    def voices(self) -> List[Dict]:
+        from gtts.lang import tts_langs
+        return [
+            {"code": code, "name": name, "language": code.split('-')[0]}
+            for code, name in sorted(tts_langs().items())
+        ]
+
+    def supports(self, lang: str) -> bool:
+        from gtts.lang import tts_langs
+        return lang in tts_langs()
+
+    def synthesize(self, text: str, lang: str, slow: bool, fp: BinaryIO) -> None:
+        # Imported on first use to keep service startup fast
+        from gtts import gTTS
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(fp)
+
+
+class EspeakEngine(TTSEngine):
+    """
+    Local espeak-ng synthesis (WAV, no network round-trip)
+
+    Runs the espeak-ng binary (TTS_ESPEAK_BINARY) per clip and reads the
+    WAV from its stdout. Speed is TTS_ESPEAK_SPEED words per minute, 70%
+    of it for slow speech.
+    """
+
+    name = "espeak"
+    content_type = "audio/wav"
+    extension = "wav"
+
+    def __init__(self):
+        self.binary = shutil.which(os.getenv('TTS_ESPEAK_BINARY', 'espeak-ng')) or shutil.which('espeak')
+        self.speed = int(os.getenv('TTS_ESPEAK_SPEED', 160))
+        self.timeout = float(os.getenv('TTS_ENGINE_TIMEOUT', 30))
+        self._voices: Optional[List[Dict]] = None
+
+    def is_available(self) -> bool:
+        return self.binary is not None
+
+    def voices(self) -> List[Dict]:
+        if self._voices is None:
+            # Columns: Pty Language Age/Gender VoiceName File [Other Languages]
+            output = subprocess.run(
+                [self.binary, '--voices'], capture_output=True, text=True, timeout=self.timeout, check=True
+            ).stdout
+            voices = []
+            for line in output.splitlines()[1:]:
+                parts = line.split()
+                if len(parts) >= 4:
+                    voices.append({
+                        "code": parts[1],
+                        "name": parts[3].replace('_', ' '),
+                        "language": parts[1].split('-')[0],
+                    })
+            self._voices = voices
+        return self._voices
+
+    def synthesize(self, text: str, lang: str, slow: bool, fp: BinaryIO) -> None:
+        speed = int(self.speed * 0.7) if slow else self.speed
+        # Text goes through stdin so it can never be parsed as an option
+        result = subprocess.run(
+            [self.binary, '-b', '1', '-v', lang, '-s', str(speed), '--stdout'],
+            input=text.encode('utf-8'),
+            capture_output=True,
+            timeout=self.timeout
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"espeak-ng failed: {result.stderr.decode(errors='replace').strip()}")
+        fp.write(_fix_wav_sizes(result.stdout))
+
+
+def _fix_wav_sizes(data: bytes) -> bytes:
+    """espeak-ng leaves the RIFF/data sizes unset when writing to a pipe"""
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return data
+    data = bytearray(data)
+    struct.pack_into('<I', data, 4, len(data) - 8)
+
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = bytes(data[pos:pos + 4])
+        if chunk_id == b'data':
+            struct.pack_into('<I', data, pos + 4, len(data) - pos - 8)
+            break
+        pos += 8 + struct.unpack_from('<I', data, pos + 4)[0]
+    return bytes(data)
+
+
+ENGINES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine)}
+
+
+def load_engines(names: Optional[str] = None) -> Dict[str, TTSEngine]:
+    """
+    Instantiate the engines listed in TTS_ENGINES (comma-separated)
+
+    Engines that are unknown or not installed are skipped with a warning.
+    """
+    names = names or os.getenv('TTS_ENGINES', 'gtts,espeak')
+    engines = {}
+    for name in (n.strip() for n in names.split(',')):
+        if not name:
+            continue
+        if name not in ENGINES:
+            logger.warning(f"⚠️ Unknown TTS engine: {name}")
+            continue
+        engine = ENGINES[name]()
+        if not engine.is_available():
+            logger.warning(f"⚠️ TTS engine {name} is not installed, skipping")
+            continue
+        engines[name] = engine
+    return engines
@@ -0,0 +1,48 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    ✅ Coalesce concurrent calls for the same key
+
+    The first caller for a key runs `fn`; callers arriving while it runs
+    wait for and share its result (or exception) instead of repeating the
+    work. Coalescing is per process.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn` once per key at a time.
+
+        Returns:
+            (result, leader) where `leader` is True for the caller that ran `fn`
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), False
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+        return future.result(), True
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -1,13 +1,50 @@
-from gtts import gTTS
+import io
 import os
-import tempfile
-from pydub import AudioSegment
+import json
+import time
+import threading
+from typing import Callable, Dict, List, Optional
 from loguru import logger
 import hashlib
 from minio import Minio
 from minio.error import S3Error
 
+from core.audio_probe import probe_or_decode
+from core.compaction import BulkDeleter, CompactionReport, compact
+from core.manifest import JournalReader, ManifestJournal, StorageManifest
+from core.metrics import TTS_CACHE_REQUESTS, time_stage
+from core.mp3 import MeteredBuffer
+from core.profiling import sampled
+from core.upload_queue import UploadQueue
+from speech_synthesis.cache_index import TTSCacheEntry, TTSCacheIndex
+from speech_synthesis.engines import TTSEngine, load_engines
+from speech_synthesis.single_flight import SingleFlight
+
+TTS_PREFIX = "tts/"
+# Content-addressed clips, shared by every vocab item with the same text
+AUDIO_PREFIX = "tts/audio/"
+# Zero-byte markers linking vocab items and clips in both directions:
+#   tts/refs/vocab/{lang}/{vocab_id}/{digest}
+#   tts/refs/object/{digest}/{lang}_{vocab_id}
+REFS_PREFIX = "tts/refs/"
+# Uploads/deletions since the manifest was last compacted
+JOURNAL_PREFIX = "tts/journal/"
+# How long delete_audio waits for this process's queued ref markers
+REF_FLUSH_TIMEOUT = 10
+
 class TTSService:
+    """
+    ✅ Text-to-speech with a content-addressed clip cache in MinIO
+
+    The constructor does no network I/O; call `start()` (once, off the
+    event loop) to create the bucket and warm the cache index.
+
+    Every process keeps its own cache index. A background thread replays
+    the TTS journal every TTS_CACHE_SYNC_INTERVAL seconds, so clips
+    deleted by another worker or by compaction leave this index too; if
+    that falls behind, hits are checked against MinIO until it catches up.
+    """
+
     def __init__(self):
         self.cache_enabled = os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
 
@@ -17,6 +54,32 @@ class TTSService:
         self.minio_secret_key = os.getenv("MINIO_SECRET_KEY", "minioadmin")
         self.minio_secure = os.getenv("MINIO_SECURE", "false").lower() == "true"
         self.bucket = os.getenv("MINIO_BUCKET", "vocabulary-audio")
+        self.manifest_object = os.getenv("TTS_CACHE_MANIFEST", "tts/manifest.json")
+        # When set, clients fetch audio through this service's /audio route
+        self.audio_base_url = os.getenv("AUDIO_SERVE_BASE_URL", "").rstrip("/")
+
+        # Uploads above the threshold use multipart (MinIO minimum part is 5 MiB)
+        self.upload_part_size = max(5 * 1024 * 1024, int(os.getenv("TTS_UPLOAD_PART_SIZE", 5 * 1024 * 1024)))
+        self.multipart_threshold = int(os.getenv("TTS_MULTIPART_THRESHOLD", self.upload_part_size))
+        self.engines = load_engines()
+        if not self.engines:
+            raise RuntimeError("No TTS engine available (check TTS_ENGINES)")
+        self.default_engine = os.getenv('TTS_ENGINE', 'gtts')
+        if self.default_engine not in self.engines:
+            fallback = next(iter(self.engines))
+            logger.warning(f"⚠️ TTS engine {self.default_engine} unavailable, defaulting to {fallback}")
+            self.default_engine = fallback
+        self.cache_index = TTSCacheIndex()
+        self.sync_interval = float(os.getenv('TTS_CACHE_SYNC_INTERVAL', 2))
+        self._journal_reader: Optional[JournalReader] = None
+        self._last_sync = 0.0
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.single_flight = SingleFlight()
+        # Refs whose markers are confirmed written, and those still being written
+        self._known_refs = set()
+        self._pending_refs: Dict[tuple, List[int]] = {}
+        self._refs_changed = threading.Condition()
 
         self.minio_client = Minio(
             self.minio_endpoint,
@@ -25,13 +88,23 @@ class TTSService:
             secure=self.minio_secure
         )
 
-        # Create bucket if not exists
-        try:
-            if not self.minio_client.bucket_exists(self.bucket):
-                self.minio_client.make_bucket(self.bucket)
-                logger.info(f"✅ Created MinIO bucket: {self.bucket}")
-        except Exception as e:
-            logger.error(f"❌ MinIO bucket creation failed: {str(e)}")
+        self.journal = ManifestJournal(self.minio_client, self.bucket, JOURNAL_PREFIX)
+        # Ref markers are written in the background so cache hits stay free of MinIO calls
+        self.ref_queue = UploadQueue(
+            self.bucket, workers=2, max_backlog=10000, name='tts_ref', service='tts', stage='ref_upload'
+        )
+
+    def start(self) -> None:
+        """Create the bucket if needed and warm the cache index. Raises if MinIO is unreachable."""
+        if not self.minio_client.bucket_exists(self.bucket):
+            self.minio_client.make_bucket(self.bucket)
+            logger.info(f"✅ Created MinIO bucket: {self.bucket}")
+
+        if self.cache_enabled:
+            self.load_cache_index()
+            if self.sync_interval > 0 and self._sync_thread is None:
+                self._sync_thread = threading.Thread(target=self._sync_loop, name='tts-cache-sync', daemon=True)
+                self._sync_thread.start()
 
     def check_minio_connection(self) -> bool:
         """Check if MinIO is accessible"""
@@ -40,137 +113,546 @@ class TTSService:
         except:
             return False
 
-    def _get_cache_object_name(self, text: str, lang: str, vocab_id: int) -> str:
-        """Generate cache object name based on text hash"""
-        cache_key = f"{text}_{lang}"
-        hash_obj = hashlib.md5(cache_key.encode())
-        return f"tts/vocab_{vocab_id}_{hash_obj.hexdigest()}.mp3"
+    def get_engine(self, name: Optional[str] = None) -> TTSEngine:
+        """Resolve an engine by name (default: TTS_ENGINE). Raises ValueError if unknown."""
+        engine = self.engines.get(name or self.default_engine)
+        if engine is None:
+            raise ValueError(f"Unknown TTS engine '{name}' (available: {', '.join(self.engines)})")
+        return engine
+
+    def list_voices(self, language: Optional[str] = None, engine: Optional[str] = None) -> List[Dict]:
+        """Voices of the active engines, optionally filtered"""
+        engines = [self.get_engine(engine)] if engine else self.engines.values()
+        voices = []
+        for item in engines:
+            try:
+                voices.extend({**voice, "engine": item.name} for voice in item.voices())
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to list {item.name} voices: {str(e)}")
+        if language:
+            voices = [v for v in voices if v['language'] == language or v['code'] == language]
+        return voices
+
+    def is_cached(self, text: str, lang: str = "en", slow: bool = False, engine: Optional[str] = None) -> bool:
+        """Whether the clip is in the in-process cache index (no MinIO call)"""
+        tts_engine = self.engines.get(engine or self.default_engine)
+        if not self.cache_enabled or tts_engine is None:
+            return False
+        digest = self._get_cache_key(text, lang, slow, tts_engine.name)
+        return self.cache_index.get(self._get_cache_object_name(digest, tts_engine.extension)) is not None
+
+    def _get_cache_key(self, text: str, lang: str, slow: bool, engine: str) -> str:
+        """
+        Content hash of everything that changes the generated audio
+        (text, language, speed, engine) - not the vocab item
+        """
+        normalized = ' '.join(text.split())
+        cache_key = json.dumps([normalized, lang, bool(slow), engine])
+        return hashlib.sha256(cache_key.encode()).hexdigest()
+
+    def _get_cache_object_name(self, digest: str, extension: str = "mp3") -> str:
+        """Object name of a content-addressed clip"""
+        return f"{AUDIO_PREFIX}{digest}.{extension}"
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 📇 CACHE INDEX
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def load_cache_index(self) -> int:
+        """
+        ✅ Populate the in-process cache index
+        Reads the manifest object (plus pending journal) if present,
+        otherwise lists the bucket
+        """
+        # Follow the journal from here on: whatever it records later is
+        # not in the manifest or listing read below
+        self._journal_reader = JournalReader(self.minio_client, self.bucket, JOURNAL_PREFIX)
+        self._last_sync = time.monotonic()
+
+        try:
+            manifest = self.manifest()
+            if manifest.load():
+                manifest.apply_journal()
+                entries = {
+                    key: TTSCacheEntry.from_dict(value)
+                    for key, value in manifest.entries.items()
+                    if key.startswith(AUDIO_PREFIX)
+                }
+                loaded = self.cache_index.load(entries)
+                logger.info(f"📇 Loaded {loaded} TTS cache entries from manifest")
+                return loaded
+
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to read TTS manifest, listing bucket instead: {str(e)}")
+
+        try:
+            loaded = 0
+            for key, entry in self._list_cache_entries():
+                if self.cache_index.is_full():
+                    break
+                self.cache_index.put(key, entry)
+                loaded += 1
+            logger.info(f"📇 Loaded {loaded} TTS cache entries from bucket listing")
+            return loaded
+
+        except Exception as e:
+            logger.error(f"❌ Failed to load TTS cache index: {str(e)}")
+            return 0
+
+    def sync_cache_index(self) -> int:
+        """
+        ✅ Apply journal records written since the last sync (by any process)
+        Deleted clips leave the index, new clips enter it, and removed
+        refs are forgotten so the next request writes them again.
+        Returns the number of records applied
+        """
+        if self._journal_reader is None:
+            return 0
+        records = self._journal_reader.poll()
+        for record in records:
+            op = record.get('op')
+            if op == 'delete':
+                self.cache_index.remove(record['object_name'])
+            elif op == 'put' and record['object_name'].startswith(AUDIO_PREFIX):
+                self.cache_index.put(record['object_name'], TTSCacheEntry.from_dict(record))
+            elif op == 'unref':
+                lang, _, vocab_id = record['holder'].rpartition('_')
+                with self._refs_changed:
+                    self._known_refs.discard((int(vocab_id), lang, record['target']))
+        self._last_sync = time.monotonic()
+        return len(records)
+
+    def _sync_loop(self) -> None:
+        while not self._sync_stop.wait(self.sync_interval):
+            try:
+                self.sync_cache_index()
+            except Exception as e:
+                logger.warning(f"⚠️ TTS cache index sync failed: {str(e)}")
+
+    def _index_current(self) -> bool:
+        """Whether the index has seen other processes' recent deletions"""
+        if self._sync_thread is None:
+            return True
+        return time.monotonic() - self._last_sync < 3 * self.sync_interval
+
+    def manifest(self) -> StorageManifest:
+        """Manifest of every TTS object (clips and legacy per-vocab files)"""
+        return StorageManifest(
+            self.minio_client,
+            self.bucket,
+            self.manifest_object,
+            JOURNAL_PREFIX,
+            TTS_PREFIX,
+            exclude=(REFS_PREFIX,),
+            # Tracks which vocab items hold each clip digest, for compaction
+            refs_prefix=f"{REFS_PREFIX}object/"
+        )
+
+    def write_manifest(self) -> int:
+        """
+        ✅ Bring the manifest of cached TTS objects up to date in MinIO
+        Lets other processes warm their index without a full listing;
+        only the first run lists the bucket, later runs replay the journal
+        """
+        self.journal.flush()
+        manifest = self.manifest()
+        if not manifest.load() or manifest.needs_reconcile():
+            manifest.reconcile()
+        journal = manifest.apply_journal()
+        manifest.save()
+
+        deleter = BulkDeleter(self.minio_client, self.bucket)
+        for name in journal:
+            deleter.delete(name)
+        deleter.flush()
+        return len(manifest.entries)
+
+    def _list_cache_entries(self):
+        """Yield (cache key, entry) for every TTS object in the bucket"""
+        objects = self.minio_client.list_objects(
+            self.bucket,
+            prefix=AUDIO_PREFIX,
+            recursive=True,
+            include_user_meta=True
+        )
+        for obj in objects:
+            if obj.is_dir:
+                continue
+            yield obj.object_name, TTSCacheEntry(
+                object_name=obj.object_name,
+                duration=self._duration_from_metadata(obj.metadata),
+                size=obj.size or 0
+            )
+
+    @staticmethod
+    def _duration_from_metadata(metadata) -> Optional[float]:
+        """Read the duration we store as user metadata on upload"""
+        if not metadata:
+            return None
+        for key, value in metadata.items():
+            if key.lower() in ('x-amz-meta-duration', 'duration'):
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    def _lookup_cached(self, object_name: str) -> Optional[TTSCacheEntry]:
+        """
+        Find a cached object: index first, MinIO stat on index miss (or
+        while the index sync is behind, so a deleted clip is never served)
+        """
+        entry = self.cache_index.get(object_name)
+        if entry and self._index_current():
+            return entry
+
+        try:
+            with time_stage('tts', 'stat'):
+                stat = self.minio_client.stat_object(self.bucket, object_name)
+        except S3Error:
+            self.cache_index.remove(object_name)
+            return None
+
+        entry = TTSCacheEntry(
+            object_name=object_name,
+            duration=self._duration_from_metadata(stat.metadata),
+            size=stat.size or 0
+        )
+        self.cache_index.put(object_name, entry)
+        return entry
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 🔗 VOCAB REFERENCES
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _vocab_ref_name(self, vocab_id: int, lang: str, digest: str) -> str:
+        return f"{REFS_PREFIX}vocab/{lang}/{vocab_id}/{digest}"
+
+    def _object_ref_name(self, digest: str, lang: str, vocab_id: int) -> str:
+        return f"{REFS_PREFIX}object/{digest}/{self._ref_holder(lang, vocab_id)}"
+
+    @staticmethod
+    def _ref_holder(lang: str, vocab_id: int) -> str:
+        return f"{lang}_{vocab_id}"
+
+    def _ensure_vocab_ref(self, vocab_id: int, lang: str, digest: str, wait: bool = False) -> None:
+        """
+        Record that a vocab item points at a shared clip (once per process)
+
+        With `wait` the markers are written before returning; otherwise
+        they go to the background ref queue (inline only when it refuses
+        them). A ref counts as known once both markers are confirmed, so a
+        dropped or failed write is retried by the next request
+        """
+        if not vocab_id:
+            return
+        ref = (vocab_id, lang, digest)
+        names = (self._vocab_ref_name(vocab_id, lang, digest), self._object_ref_name(digest, lang, vocab_id))
+
+        with self._refs_changed:
+            if ref in self._known_refs or (ref in self._pending_refs and not wait):
+                return
+            if not wait:
+                pending = self._pending_refs[ref] = [len(names)]
+
+        if wait:
+            try:
+                for name in names:
+                    self.minio_client.put_object(self.bucket, name, io.BytesIO(b""), length=0)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to record TTS ref for vocab {vocab_id}: {str(e)}")
+                return
+            with self._refs_changed:
+                self._remember_ref(ref)
+            self.journal.referenced(digest, self._ref_holder(lang, vocab_id))
+            return
+
+        done = lambda ok: self._ref_written(ref, pending, ok)
+        for name in names:
+            if self.ref_queue.submit(name, b"", on_done=done) is None:
+                try:
+                    self.minio_client.put_object(self.bucket, name, io.BytesIO(b""), length=0)
+                    done(True)
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to record TTS ref for vocab {vocab_id}: {str(e)}")
+                    done(False)
+
+    def _ref_written(self, ref: tuple, pending: List[int], ok: bool) -> None:
+        """Ref queue callback: count down a ref's markers, forget it on failure"""
+        with self._refs_changed:
+            if self._pending_refs.get(ref) is not pending:
+                return  # Already failed, or cancelled by delete_audio
+            pending[0] -= 1
+            confirmed = ok and not pending[0]
+            if not ok or confirmed:
+                del self._pending_refs[ref]
+            if confirmed:
+                self._remember_ref(ref)
+            self._refs_changed.notify_all()
+
+        if confirmed:
+            vocab_id, lang, digest = ref
+            self.journal.referenced(digest, self._ref_holder(lang, vocab_id))
+
+    def _remember_ref(self, ref: tuple) -> None:
+        """Mark a ref as written (call holding `_refs_changed`)"""
+        if len(self._known_refs) > 100000:
+            self._known_refs.clear()
+        self._known_refs.add(ref)
 
-    def synthesize(self, text: str, lang: str = "en", vocab_id: int = 0, slow: bool = False) -> dict:
+    def close(self) -> None:
+        """Write queued ref markers and buffered journal records (call on shutdown)"""
+        self._sync_stop.set()
+        self.ref_queue.close()
+        self.journal.flush()
+
+    def _has_object_refs(self, digest: str) -> bool:
+        """Check whether any vocab item still points at a clip"""
+        refs = self.minio_client.list_objects(self.bucket, prefix=f"{REFS_PREFIX}object/{digest}/")
+        return any(True for _ in refs)
+
+    @sampled('tts.synthesize')
+    def synthesize(
+        self,
+        text: str,
+        lang: str = "en",
+        vocab_id: int = 0,
+        slow: bool = False,
+        engine: Optional[str] = None
+    ) -> dict:
         """
         ✅ Generate speech from text and upload to MinIO
+        `engine` picks the TTS backend (default: TTS_ENGINE)
         Returns: dict with audio_url, duration, cached status
         """
+        tts_engine = self.get_engine(engine)
+        if not tts_engine.supports(lang):
+            raise ValueError(f"TTS engine '{tts_engine.name}' has no voice for '{lang}'")
+
         try:
-            object_name = self._get_cache_object_name(text, lang, vocab_id)
+            digest = self._get_cache_key(text, lang, slow, tts_engine.name)
+            object_name = self._get_cache_object_name(digest, tts_engine.extension)
 
-            # Check if audio already exists in MinIO (cache)
+            # Check if audio already exists (in-process index, then MinIO)
             if self.cache_enabled:
-                try:
-                    self.minio_client.stat_object(self.bucket, object_name)
-                    audio_url = self._get_minio_url(object_name)
+                entry = self._lookup_cached(object_name)
+                if entry:
+                    TTS_CACHE_REQUESTS.labels('hit').inc()
                     logger.info(f"✅ Using cached audio: {object_name}")
-                    
+                    self._ensure_vocab_ref(vocab_id, lang, digest)
+
                     return {
-                        'audio_url': audio_url,
-                        'duration': None,  # Duration not calculated for cached
+                        'audio_url': self._get_minio_url(object_name),
+                        'duration': entry.duration,
+                        'size': entry.size,
                         'cached': True
                     }
-                except S3Error:
-                    # Not cached, continue to generate
-                    pass
-
-            # Generate new audio
-            logger.info(f"🔊 Generating TTS for vocab {vocab_id}: '{text}' (lang={lang})")
-
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tmp_path = tmp_file.name
 
-            # Generate TTS
-            tts = gTTS(text=text, lang=lang, slow=slow)
-            tts.save(tmp_path)
-
-            # Get audio duration
-            duration = self._get_audio_duration(tmp_path)
-
-            # Upload to MinIO
-            self.minio_client.fput_object(
-                self.bucket,
+            # Concurrent misses for the same clip share one generation + upload
+            entry, leader = self.single_flight.do(
                 object_name,
-                tmp_path,
-                content_type="audio/mpeg"
+                lambda: self._generate(tts_engine, text, lang, slow, object_name)
             )
+            # A fresh clip has no refs yet: write ours before handing out the URL
+            self._ensure_vocab_ref(vocab_id, lang, digest, wait=True)
 
-            audio_url = self._get_minio_url(object_name)
-
-            # Cleanup temporary file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
-
-            logger.success(f"✅ Generated & uploaded audio: {object_name} ({duration}s)")
+            TTS_CACHE_REQUESTS.labels('miss' if leader else 'coalesced').inc()
+            if not leader:
+                logger.info(f"🤝 Joined in-flight generation: {object_name}")
 
             return {
-                'audio_url': audio_url,
-                'duration': duration,
-                'cached': False
+                'audio_url': self._get_minio_url(object_name),
+                'duration': entry.duration,
+                'size': entry.size,
+                'cached': not leader
             }
 
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {str(e)}")
             raise
 
-    def _get_audio_duration(self, filepath: str) -> float:
-        """Get audio duration in seconds"""
+    def _generate(self, engine: TTSEngine, text: str, lang: str, slow: bool, object_name: str) -> TTSCacheEntry:
+        """
+        Synthesize one clip with `engine` and stream it into MinIO
+        Audio never touches the disk; for MP3 engines the duration is
+        measured from frame headers while the engine writes into the buffer
+        """
+        logger.info(f"🔊 Generating TTS: '{text}' (lang={lang}, slow={slow}, engine={engine.name})")
+
+        # Generate TTS into memory
+        buffer = MeteredBuffer() if engine.content_type == "audio/mpeg" else io.BytesIO()
+        with time_stage('tts', 'synthesize'):
+            engine.synthesize(text, lang, slow, buffer)
+
+        size = buffer.tell()
+        duration = buffer.meter.duration if isinstance(buffer, MeteredBuffer) else None
+        if duration is None:
+            duration = self._get_audio_duration(buffer.getvalue())
+        buffer.seek(0)
+
+        # Upload to MinIO (duration kept as metadata for the cache index)
+        metadata = {'lang': lang, 'slow': str(slow).lower(), 'engine': engine.name}
+        if duration is not None:
+            metadata['duration'] = str(duration)
+
+        with time_stage('tts', 'upload'):
+            if size > self.multipart_threshold:
+                # Long texts (e.g. example sentences) go up in parts
+                self.minio_client.put_object(
+                    self.bucket,
+                    object_name,
+                    buffer,
+                    length=-1,
+                    part_size=self.upload_part_size,
+                    content_type=engine.content_type,
+                    metadata=metadata
+                )
+            else:
+                self.minio_client.put_object(
+                    self.bucket,
+                    object_name,
+                    buffer,
+                    length=size,
+                    content_type=engine.content_type,
+                    metadata=metadata
+                )
+
+        entry = TTSCacheEntry(object_name=object_name, duration=duration, size=size)
+        self.cache_index.put(object_name, entry)
+        self.journal.added(object_name, size, duration=duration)
+
+        logger.success(f"✅ Generated & uploaded audio: {object_name} ({duration}s)")
+        return entry
+
+    def _get_audio_duration(self, data: bytes) -> Optional[float]:
+        """Get audio duration in seconds from headers (decodes only as a last resort)"""
         try:
-            audio = AudioSegment.from_file(filepath)
-            return round(len(audio) / 1000.0, 2)
+            return round(probe_or_decode(data).duration, 2)
         except Exception:
             return None
 
     def _get_minio_url(self, object_name: str) -> str:
-        """Generate MinIO URL for object"""
+        """Generate MinIO URL for object (or the /audio URL when configured)"""
+        if self.audio_base_url:
+            return f"{self.audio_base_url}/{object_name}"
         scheme = "https" if self.minio_secure else "http"
         return f"{scheme}://{self.minio_endpoint}/{self.bucket}/{object_name}"
 
-    def delete_audio(self, vocab_id: int, language: str) -> bool:
+    def delete_audio(self, vocab_id: int, language: str) -> List[str]:
         """
-        ✅ Delete audio file from MinIO
+        ✅ Delete a vocab item's audio from MinIO
+        Removes the item's references; a shared clip is deleted only once
+        no other vocab item points at it. Deletes go out in batches.
+
+        Returns:
+            Names of the deleted objects (references included); empty if
+            the item had no audio or the delete failed
         """
         try:
-            # Generate object name pattern
-            prefix = f"tts/vocab_{vocab_id}_"
-            
-            # List objects with prefix
-            objects = self.minio_client.list_objects(self.bucket, prefix=prefix)
-            
-            deleted = False
-            for obj in objects:
-                self.minio_client.remove_object(self.bucket, obj.object_name)
-                logger.info(f"🗑️ Deleted audio: {obj.object_name}")
-                deleted = True
-
-            return deleted
+            deleter = BulkDeleter(self.minio_client, self.bucket)
+
+            # Let this process's queued markers for the item land first, so
+            # the listing below sees (and deletes) them
+            with self._refs_changed:
+                flushed = self._refs_changed.wait_for(
+                    lambda: not any(ref[:2] == (vocab_id, language) for ref in self._pending_refs),
+                    timeout=REF_FLUSH_TIMEOUT
+                )
+                for ref in [ref for ref in self._pending_refs if ref[:2] == (vocab_id, language)]:
+                    del self._pending_refs[ref]
+            if not flushed:
+                logger.warning(f"⚠️ TTS ref markers for vocab {vocab_id} still queued, deleting anyway")
+
+            refs = self.minio_client.list_objects(
+                self.bucket,
+                prefix=f"{REFS_PREFIX}vocab/{language}/{vocab_id}/"
+            )
+            digests = [ref.object_name.rsplit('/', 1)[-1] for ref in refs]
+            for digest in digests:
+                deleter.delete(self._vocab_ref_name(vocab_id, language, digest))
+                deleter.delete(self._object_ref_name(digest, language, vocab_id))
+                with self._refs_changed:
+                    self._known_refs.discard((vocab_id, language, digest))
+            # Refs go first so the checks below see this item's refs gone
+            deleter.flush()
+            removed_refs = set(deleter.deleted)
+            for digest in digests:
+                if self._object_ref_name(digest, language, vocab_id) in removed_refs:
+                    self.journal.unreferenced(digest, self._ref_holder(language, vocab_id))
+
+            for digest in digests:
+                if not self._has_object_refs(digest):
+                    # One clip per digest; its extension depends on the engine
+                    clips = self.minio_client.list_objects(self.bucket, prefix=f"{AUDIO_PREFIX}{digest}.")
+                    for clip in clips:
+                        deleter.delete(clip.object_name, clip.size or 0)
+
+            # Clips stored before content addressing: tts/vocab_{id}_{md5}.mp3
+            legacy = self.minio_client.list_objects(self.bucket, prefix=f"{TTS_PREFIX}vocab_{vocab_id}_")
+            for obj in legacy:
+                deleter.delete(obj.object_name, obj.size or 0)
+            deleter.flush()
+
+            for object_name in deleter.deleted:
+                if object_name.startswith(REFS_PREFIX):
+                    continue
+                self.cache_index.remove(object_name)
+                self.journal.removed(object_name)
+                logger.info(f"🗑️ Deleted audio: {object_name}")
+            # Other workers drop the clips from their index on their next sync
+            self.journal.flush()
+
+            return list(deleter.deleted)
 
         except Exception as e:
             logger.error(f"❌ Delete audio failed: {str(e)}")
-            return False
+            return []
+
+    def compact(
+        self,
+        days: float = 30,
+        deleter: Optional[BulkDeleter] = None,
+        include_referenced: bool = False,
+        full: bool = False
+    ) -> CompactionReport:
+        """
+        ✅ Delete TTS objects older than `days`
+        Clips still referenced by a vocab item are kept unless
+        `include_referenced` is set (other workers' cache indexes would
+        otherwise hand out URLs of deleted clips). References are read
+        from the manifest; only clips it shows as unreferenced are checked
+        against the bucket, since workers may not have journaled a new
+        reference yet
+        """
+        self.journal.flush()
+        manifest = self.manifest()
+
+        def referenced(name: str) -> bool:
+            if not name.startswith(AUDIO_PREFIX):
+                return False
+            digest = name[len(AUDIO_PREFIX):].rsplit('.', 1)[0]
+            return manifest.referenced(digest) or self._has_object_refs(digest)
+
+        keep: Optional[Callable[[str], bool]] = None if include_referenced else referenced
+        deleter = deleter or BulkDeleter(self.minio_client, self.bucket)
+        report = compact(manifest, deleter, days, keep=keep, full=full)
+        if not report.dry_run:
+            for object_name in deleter.deleted:
+                self.cache_index.remove(object_name)
+                self.journal.removed(object_name)
+            self.journal.flush()
+        return report
 
     def cleanup_old_files(self, days: int = 30):
         """
         ✅ Remove audio files older than specified days
-        (Optional: can be run as cron job)
+        (Optional: can be run as cron job - see jobs/compact_storage.py)
         """
         try:
-            import datetime
-            current_time = datetime.datetime.now()
-            removed_count = 0
-
-            objects = self.minio_client.list_objects(self.bucket, prefix="tts/")
-            
-            for obj in objects:
-                # Check object age
-                if obj.last_modified:
-                    age = current_time - obj.last_modified.replace(tzinfo=None)
-                    if age.days > days:
-                        self.minio_client.remove_object(self.bucket, obj.object_name)
-                        removed_count += 1
-
-            logger.info(f"✅ Cleaned up {removed_count} old audio files")
-            return removed_count
+            report = self.compact(days)
+            logger.info(f"✅ Cleaned up {report.deleted} old audio files")
+            return report.deleted
 
         except Exception as e:
             logger.error(f"❌ Cleanup failed: {str(e)}")
-            return 0
\ No newline at end of file
+            return 0